@@ -0,0 +1,659 @@
+"""Benchmark harness for the FORGE risk engine and MCP server.
+
+Sweeps problem size, deadline and dependency density over synthetic datasets and
+times every stage separately: data preparation, validation, model build versus
+solve per solver, report generation and end-to-end MCP tool latency. Results are
+written as JSON (by default ``forge_*benchmark.json`` in the working directory, which
+git ignores) and can be compared against a stored baseline:
+
+    python forge_benchmark.py run --sizes 15,50,100
+    python forge_benchmark.py compare baseline.json forge_benchmark.json --threshold 0.2
+    python forge_benchmark.py symmetry --sizes 40,80 --duplicate-ratio 0.6
+    python forge_benchmark.py payload --sizes 1000,10000
+    python forge_benchmark.py startup --budget-sec 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+import pandas as pd
+import pydantic_core
+
+from forge_risk_engine import (
+    AnalysisSummary,
+    SolverName,
+    _standardize_risk_frame,
+    analyze_risk_plan,
+    budget_timeline,
+    build_visual_report_markdown,
+    frame_to_columns,
+    generate_risk_data,
+    solve_race,
+    solve_with_cp_sat,
+    solve_with_greedy,
+    solve_with_highs,
+    solve_with_pulp,
+    summarize_durations,
+    summary_to_dict,
+    validate_risk_data,
+)
+
+SOLVERS: dict[str, Callable[..., pd.DataFrame | None]] = {
+    "cp-sat": solve_with_cp_sat,
+    "pulp": solve_with_pulp,
+    "highs": solve_with_highs,
+    "greedy": solve_with_greedy,
+    "race": solve_race,
+}
+
+
+def _parse_list(raw: str, cast: Callable[[str], Any]) -> list[Any]:
+    return [cast(part.strip()) for part in raw.split(",") if part.strip()]
+
+
+def _time_stage(fn: Callable[[], Any], iterations: int) -> tuple[list[float], Any]:
+    durations: list[float] = []
+    result: Any = None
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - t0)
+    return durations, result
+
+
+async def _time_mcp_tool(
+    records: list[dict[str, Any]],
+    *,
+    solver: SolverName,
+    deadline: int,
+    team_capacity: int,
+    target_remaining_ratio: float,
+    iterations: int,
+) -> list[float]:
+    from forge_mcp_server import create_mcp_server
+
+    mcp = create_mcp_server(
+        host="127.0.0.1",
+        port=0,
+        streamable_http_path="/mcp",
+        log_level="warning",
+        solver_workers=1,
+    )
+    arguments = {
+        "risks": records,
+        "solver": solver,
+        "deadline": deadline,
+        "team_capacity": team_capacity,
+        "target_remaining_ratio": target_remaining_ratio,
+    }
+    # Warm-up call starts the solver worker process so it is not counted as tool latency.
+    await mcp.call_tool("forge_optimize_schedule", arguments)
+    durations: list[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await mcp.call_tool("forge_optimize_schedule", arguments)
+        durations.append(time.perf_counter() - t0)
+    return durations
+
+
+def run_scenario(
+    *,
+    num_records: int,
+    deadline: int,
+    dependency_density: float,
+    solvers: list[str],
+    iterations: int,
+    team_capacity: int,
+    target_remaining_ratio: float,
+    seed: int,
+    include_mcp: bool,
+) -> dict[str, Any]:
+    raw = generate_risk_data(num_records, seed=seed, dependency_density=dependency_density)
+    stages: dict[str, list[float]] = {}
+
+    stages["prepare"], df = _time_stage(lambda: _standardize_risk_frame(raw), iterations)
+    stages["validate"], _ = _time_stage(lambda: validate_risk_data(df), iterations)
+
+    target_max = float(df["Score"].sum()) * target_remaining_ratio
+    feasible: dict[str, bool] = {}
+    for name in solvers:
+        fn = SOLVERS[name]
+        for key in ("build", "solve", "readback", "total"):
+            stages[f"{name}.{key}"] = []
+        for _ in range(iterations):
+            solver_stats: dict[str, Any] = {}
+            t0 = time.perf_counter()
+            schedule = fn(df, deadline, team_capacity, target_max, solver_stats)
+            stages[f"{name}.total"].append(time.perf_counter() - t0)
+            stages[f"{name}.build"].append(solver_stats.get("build_sec", 0.0))
+            stages[f"{name}.solve"].append(solver_stats.get("solve_sec", 0.0))
+            stages[f"{name}.readback"].append(solver_stats.get("readback_sec", 0.0))
+            feasible[name] = schedule is not None
+
+    records = df.to_dict(orient="records")
+    summary: AnalysisSummary = analyze_risk_plan(
+        risks=records,
+        solver=solvers[0],
+        deadline=deadline,
+        team_capacity=team_capacity,
+        target_remaining_ratio=target_remaining_ratio,
+    )
+    schedule_df = pd.DataFrame(summary.schedule)
+    if not schedule_df.empty:
+        stages["budget_timeline"], _ = _time_stage(lambda: budget_timeline(schedule_df), iterations)
+    stages["report"], _ = _time_stage(lambda: build_visual_report_markdown(summary), iterations)
+
+    if include_mcp:
+        stages["mcp.forge_optimize_schedule"] = asyncio.run(
+            _time_mcp_tool(
+                records,
+                solver=solvers[0],
+                deadline=deadline,
+                team_capacity=team_capacity,
+                target_remaining_ratio=target_remaining_ratio,
+                iterations=iterations,
+            )
+        )
+
+    return {
+        "params": {
+            "num_records": num_records,
+            "deadline": deadline,
+            "dependency_density": dependency_density,
+            "team_capacity": team_capacity,
+            "target_remaining_ratio": target_remaining_ratio,
+            "seed": seed,
+        },
+        "feasible": feasible,
+        "stages": {name: summarize_durations(values) for name, values in stages.items() if values},
+    }
+
+
+def scenario_key(num_records: int, deadline: int, dependency_density: float) -> str:
+    return f"n={num_records}/deadline={deadline}/density={dependency_density:g}"
+
+
+def run_suite(
+    *,
+    sizes: list[int],
+    deadlines: list[int],
+    densities: list[float],
+    solvers: list[str],
+    iterations: int = 3,
+    team_capacity: int = 4,
+    target_remaining_ratio: float = 0.5,
+    seed: int = 0,
+    include_mcp: bool = True,
+    log: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    unknown = [name for name in solvers if name not in SOLVERS]
+    if unknown:
+        raise ValueError(f"Unsupported solvers: {unknown}")
+    if iterations <= 0:
+        raise ValueError("iterations must be greater than 0.")
+
+    scenarios: dict[str, Any] = {}
+    for num_records in sizes:
+        for deadline in deadlines:
+            for density in densities:
+                key = scenario_key(num_records, deadline, density)
+                if log is not None:
+                    log(f"running {key}")
+                scenarios[key] = run_scenario(
+                    num_records=num_records,
+                    deadline=deadline,
+                    dependency_density=density,
+                    solvers=solvers,
+                    iterations=iterations,
+                    team_capacity=team_capacity,
+                    target_remaining_ratio=target_remaining_ratio,
+                    seed=seed,
+                    include_mcp=include_mcp,
+                )
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "solvers": solvers,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def run_symmetry_benchmark(
+    *,
+    sizes: list[int],
+    duplicate_ratio: float = 0.6,
+    solvers: list[str] | None = None,
+    iterations: int = 3,
+    deadline: int = 60,
+    team_capacity: int = 6,
+    target_remaining_ratio: float = 0.7,
+    seed: int = 0,
+    log: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """Time the exact solvers with and without symmetry breaking on heavily duplicated datasets."""
+    solvers = solvers or ["cp-sat", "pulp"]
+    unknown = [name for name in solvers if name not in ("cp-sat", "pulp")]
+    if unknown:
+        raise ValueError(f"Symmetry breaking only applies to exact solvers, got: {unknown}")
+
+    scenarios: dict[str, Any] = {}
+    for num_records in sizes:
+        key = f"n={num_records}/duplicates={duplicate_ratio:g}"
+        if log is not None:
+            log(f"running {key}")
+        df = _standardize_risk_frame(
+            generate_risk_data(num_records, seed=seed, duplicate_ratio=duplicate_ratio)
+        )
+        target_max = float(df["Score"].sum()) * target_remaining_ratio
+        stages: dict[str, list[float]] = {}
+        costs: dict[str, float | None] = {}
+        classes: dict[str, Any] = {}
+        for name in solvers:
+            for enabled in (True, False):
+                label = f"{name}.{'symmetry' if enabled else 'plain'}"
+                stages[label] = []
+                for _ in range(iterations):
+                    solver_stats: dict[str, Any] = {}
+                    t0 = time.perf_counter()
+                    schedule = SOLVERS[name](
+                        df, deadline, team_capacity, target_max, solver_stats, symmetry_breaking=enabled
+                    )
+                    stages[label].append(time.perf_counter() - t0)
+                costs[label] = None if schedule is None else float(schedule["Cost"].sum())
+                classes.setdefault("equivalence_classes", solver_stats.get("equivalence_classes", 0))
+                classes.setdefault("symmetric_risks", solver_stats.get("symmetric_risks", 0))
+        scenarios[key] = {
+            "params": {
+                "num_records": len(df),
+                "duplicate_ratio": duplicate_ratio,
+                "deadline": deadline,
+                "team_capacity": team_capacity,
+                "target_remaining_ratio": target_remaining_ratio,
+                "seed": seed,
+            },
+            **classes,
+            "costs": costs,
+            "stages": {name: summarize_durations(values) for name, values in stages.items()},
+        }
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "iterations": iterations,
+            "solvers": solvers,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def _payload_stats(build: Callable[[], Any], iterations: int) -> dict[str, Any]:
+    """Bytes and time for compact JSON and for the indented JSON text FastMCP sends for dict results."""
+    compact_sec, payload = _time_stage(lambda: json.dumps(build(), separators=(",", ":")), iterations)
+    mcp_sec, mcp_text = _time_stage(lambda: pydantic_core.to_json(build(), fallback=str, indent=2), iterations)
+    return {
+        "compact_bytes": len(payload),
+        "mcp_text_bytes": len(mcp_text),
+        "compact": summarize_durations(compact_sec),
+        "mcp_text": summarize_durations(mcp_sec),
+    }
+
+
+def run_payload_benchmark(
+    *,
+    sizes: list[int],
+    iterations: int = 5,
+    top_k: int = 100,
+    deadline: int = 365,
+    team_capacity: int = 40,
+    target_remaining_ratio: float = 0.8,
+    seed: int = 0,
+    log: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """Compare response size and serialization time of the records, columnar, summary and top-K formats."""
+    scenarios: dict[str, Any] = {}
+    for num_records in sizes:
+        key = f"n={num_records}"
+        if log is not None:
+            log(f"running {key}")
+        df = _standardize_risk_frame(generate_risk_data(num_records, seed=seed))
+        summary = analyze_risk_plan(
+            prepared=df,
+            solver="greedy",
+            deadline=deadline,
+            team_capacity=team_capacity,
+            target_remaining_ratio=target_remaining_ratio,
+        )
+        scenarios[key] = {
+            "params": {
+                "num_records": num_records,
+                "scheduled": summary.selected_count,
+                "deadline": deadline,
+                "team_capacity": team_capacity,
+                "top_k": top_k,
+                "seed": seed,
+            },
+            "summary": {
+                "records": _payload_stats(lambda: summary_to_dict(summary), iterations),
+                "columnar": _payload_stats(lambda: summary_to_dict(summary, response_format="columnar"), iterations),
+                "summary": _payload_stats(lambda: summary_to_dict(summary, response_format="summary"), iterations),
+                f"records.top_{top_k}": _payload_stats(lambda: summary_to_dict(summary, top_k=top_k), iterations),
+            },
+            "dataset": {
+                "records": _payload_stats(lambda: df.to_dict(orient="records"), iterations),
+                "columnar": _payload_stats(lambda: frame_to_columns(df), iterations),
+            },
+        }
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "iterations": iterations,
+        },
+        "scenarios": scenarios,
+    }
+
+
+# Must not be imported when the MCP server starts; they load on first solver or data call.
+STARTUP_HEAVY_MODULES = ("numpy", "pandas", "pulp", "ortools", "scipy", "openpyxl", "pyarrow")
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "forge_mcp_server.py")
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """Parse ``python -X importtime`` output into (module, depth, self_us, cumulative_us) rows."""
+    rows: list[tuple[str, int, int, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        rows.append((module.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+async def _time_stdio_list_tools(server_path: str) -> tuple[float, int]:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[server_path, "--transport", "stdio", "--log-level", "warning"],
+        cwd=os.path.dirname(server_path),
+    )
+    t0 = time.perf_counter()
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            tools = await session.list_tools()
+            return time.perf_counter() - t0, len(tools.tools)
+
+
+def run_startup_benchmark(
+    *,
+    iterations: int = 5,
+    budget_sec: float | None = None,
+    server_path: str = SERVER_PATH,
+    log: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """Measure stdio server cold start: module import cost and time from launch to the first list_tools reply."""
+    server_dir = os.path.dirname(server_path)
+    module = os.path.splitext(os.path.basename(server_path))[0]
+    import_sec: list[float] = []
+    rows: list[tuple[str, int, int, int]] = []
+    for _ in range(iterations):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=server_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        rows = _parse_importtime(proc.stderr)
+        import_sec.append(next(cum for name, depth, _, cum in rows if name == module and depth == 0) / 1e6)
+    heavy = sorted({name for name, _, _, _ in rows if name.split(".")[0] in STARTUP_HEAVY_MODULES})
+    slowest = sorted((row for row in rows if row[1] <= 1), key=lambda row: -row[3])[:10]
+
+    list_tools_sec: list[float] = []
+    num_tools = 0
+    for i in range(iterations):
+        if log is not None:
+            log(f"cold start {i + 1}/{iterations}")
+        elapsed, num_tools = asyncio.run(_time_stdio_list_tools(server_path))
+        list_tools_sec.append(elapsed)
+
+    cold_start = summarize_durations(list_tools_sec)
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "iterations": iterations,
+            "budget_sec": budget_sec,
+        },
+        "import": summarize_durations(import_sec),
+        "slowest_imports": [{"module": name, "cumulative_sec": cum / 1e6} for name, _, _, cum in slowest],
+        "heavy_modules_at_startup": heavy,
+        "list_tools": cold_start,
+        "num_tools": num_tools,
+        "within_budget": not heavy and (budget_sec is None or cold_start["p50_sec"] <= budget_sec),
+    }
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    threshold: float = 0.2,
+    metric: str = "p50_sec",
+    min_seconds: float = 0.001,
+) -> list[dict[str, Any]]:
+    """Compare two suite results; stages faster than ``min_seconds`` in the baseline are treated as noise."""
+    rows: list[dict[str, Any]] = []
+    for key, scenario in current["scenarios"].items():
+        base_scenario = baseline["scenarios"].get(key)
+        if base_scenario is None:
+            continue
+        for stage, values in scenario["stages"].items():
+            base_values = base_scenario["stages"].get(stage)
+            if base_values is None:
+                continue
+            before = float(base_values[metric])
+            after = float(values[metric])
+            if before > 0:
+                ratio = after / before
+            else:
+                ratio = 1.0 if after == 0 else float("inf")
+            rows.append(
+                {
+                    "scenario": key,
+                    "stage": stage,
+                    "baseline_sec": before,
+                    "current_sec": after,
+                    "ratio": ratio,
+                    "regression": before >= min_seconds and ratio > 1.0 + threshold,
+                }
+            )
+    return rows
+
+
+def _format_comparison(rows: list[dict[str, Any]], metric: str) -> str:
+    lines = [f"{'scenario':<40} {'stage':<32} {'base ' + metric:>14} {'curr ' + metric:>14} {'ratio':>7}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['scenario']:<40} {row['stage']:<32} {row['baseline_sec']:>14.6f} "
+            f"{row['current_sec']:>14.6f} {row['ratio']:>7.2f}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="FORGE benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmark sweep and write results as JSON.")
+    run.add_argument("--sizes", default="15,50,100", help="Comma-separated numbers of risks.")
+    run.add_argument("--deadlines", default="20,40", help="Comma-separated deadlines (days).")
+    run.add_argument("--densities", default="0.3,0.6", help="Comma-separated dependency densities.")
+    run.add_argument("--solvers", default="cp-sat,pulp", help="Comma-separated solvers to time.")
+    run.add_argument("--iterations", type=int, default=3)
+    run.add_argument("--team-capacity", type=int, default=4)
+    run.add_argument("--target-remaining-ratio", type=float, default=0.5)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--no-mcp", action="store_true", help="Skip end-to-end MCP tool latency.")
+    run.add_argument("--output", default="forge_benchmark.json", help="Where to write the results.")
+
+    compare = sub.add_parser("compare", help="Flag regressions of a result file against a baseline.")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown ratio (0.2 = 20%%).")
+    compare.add_argument("--metric", choices=["p50_sec", "p95_sec", "avg_sec"], default="p50_sec")
+    compare.add_argument("--min-seconds", type=float, default=0.001, help="Ignore stages faster than this.")
+
+    symmetry = sub.add_parser("symmetry", help="Compare solves with and without symmetry breaking.")
+    symmetry.add_argument("--sizes", default="40,80", help="Comma-separated numbers of risks.")
+    symmetry.add_argument("--duplicate-ratio", type=float, default=0.6)
+    symmetry.add_argument("--solvers", default="cp-sat,pulp")
+    symmetry.add_argument("--iterations", type=int, default=3)
+    symmetry.add_argument("--deadline", type=int, default=60)
+    symmetry.add_argument("--team-capacity", type=int, default=6)
+    symmetry.add_argument("--target-remaining-ratio", type=float, default=0.7)
+    symmetry.add_argument("--seed", type=int, default=0)
+    symmetry.add_argument("--output", default="forge_symmetry_benchmark.json")
+
+    payload = sub.add_parser("payload", help="Compare response payload size and serialization time per format.")
+    payload.add_argument("--sizes", default="1000,10000", help="Comma-separated numbers of risks.")
+    payload.add_argument("--iterations", type=int, default=5)
+    payload.add_argument("--top-k", type=int, default=100)
+    payload.add_argument("--deadline", type=int, default=365)
+    payload.add_argument("--team-capacity", type=int, default=40)
+    payload.add_argument("--target-remaining-ratio", type=float, default=0.8)
+    payload.add_argument("--seed", type=int, default=0)
+    payload.add_argument("--output", default="forge_payload_benchmark.json")
+
+    startup = sub.add_parser("startup", help="Time stdio server cold start to the first list_tools reply.")
+    startup.add_argument("--iterations", type=int, default=5)
+    startup.add_argument("--budget-sec", type=float, default=None, help="Fail if median cold start exceeds this.")
+    startup.add_argument("--output", default="forge_startup_benchmark.json")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    if args.command == "run":
+        results = run_suite(
+            sizes=_parse_list(args.sizes, int),
+            deadlines=_parse_list(args.deadlines, int),
+            densities=_parse_list(args.densities, float),
+            solvers=_parse_list(args.solvers, str),
+            iterations=args.iterations,
+            team_capacity=args.team_capacity,
+            target_remaining_ratio=args.target_remaining_ratio,
+            seed=args.seed,
+            include_mcp=not args.no_mcp,
+            log=lambda message: print(message, file=sys.stderr),
+        )
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"Wrote {len(results['scenarios'])} scenarios to {args.output}")
+        return 0
+
+    if args.command == "symmetry":
+        results = run_symmetry_benchmark(
+            sizes=_parse_list(args.sizes, int),
+            duplicate_ratio=args.duplicate_ratio,
+            solvers=_parse_list(args.solvers, str),
+            iterations=args.iterations,
+            deadline=args.deadline,
+            team_capacity=args.team_capacity,
+            target_remaining_ratio=args.target_remaining_ratio,
+            seed=args.seed,
+            log=lambda message: print(message, file=sys.stderr),
+        )
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        for key, scenario in results["scenarios"].items():
+            timings = ", ".join(f"{name} {values['p50_sec']:.3f}s" for name, values in scenario["stages"].items())
+            print(f"{key}: {scenario['equivalence_classes']} classes / {scenario['symmetric_risks']} risks; {timings}")
+        return 0
+
+    if args.command == "payload":
+        results = run_payload_benchmark(
+            sizes=_parse_list(args.sizes, int),
+            iterations=args.iterations,
+            top_k=args.top_k,
+            deadline=args.deadline,
+            team_capacity=args.team_capacity,
+            target_remaining_ratio=args.target_remaining_ratio,
+            seed=args.seed,
+            log=lambda message: print(message, file=sys.stderr),
+        )
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        for key, scenario in results["scenarios"].items():
+            for kind in ("summary", "dataset"):
+                for name, values in scenario[kind].items():
+                    print(
+                        f"{key} {kind}.{name}: {values['mcp_text_bytes']:,} B as MCP text "
+                        f"({values['mcp_text']['p50_sec']:.4f}s), {values['compact_bytes']:,} B compact "
+                        f"({values['compact']['p50_sec']:.4f}s)"
+                    )
+        return 0
+
+    if args.command == "startup":
+        results = run_startup_benchmark(
+            iterations=args.iterations,
+            budget_sec=args.budget_sec,
+            log=lambda message: print(message, file=sys.stderr),
+        )
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(
+            f"import {results['import']['p50_sec']:.3f}s, list_tools {results['list_tools']['p50_sec']:.3f}s "
+            f"p50 ({results['num_tools']} tools)"
+        )
+        for row in results["slowest_imports"][:5]:
+            print(f"  {row['module']:<40} {row['cumulative_sec']:.3f}s")
+        if results["heavy_modules_at_startup"]:
+            print(f"Heavy modules imported at startup: {', '.join(results['heavy_modules_at_startup'])}")
+        return 0 if results["within_budget"] else 1
+
+    with open(args.baseline, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    with open(args.current, encoding="utf-8") as fh:
+        current = json.load(fh)
+    rows = compare_results(
+        baseline,
+        current,
+        threshold=args.threshold,
+        metric=args.metric,
+        min_seconds=args.min_seconds,
+    )
+    print(_format_comparison(rows, args.metric))
+    regressions = [row for row in rows if row["regression"]]
+    print(f"\n{len(regressions)} regression(s) across {len(rows)} compared stages.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+"""Persistent SQLite history of FORGE analyses.
+
+Every stored analysis is written with its input fingerprint and request parameters, so plans survive
+server restarts and past runs can be listed, re-rendered and compared by key without re-solving.
+Summaries are stored as zlib-compressed JSON; the columns used for listing and filtering are kept
+alongside so listing never decodes a schedule.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import asdict, fields
+from typing import Any
+
+from forge_risk_engine import AnalysisSummary
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    analysis_id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    dataset_id TEXT,
+    input_fingerprint TEXT,
+    solver TEXT NOT NULL,
+    feasible INTEGER NOT NULL,
+    num_risks INTEGER NOT NULL,
+    selected_count INTEGER NOT NULL,
+    total_cost REAL,
+    achieved_score REAL,
+    deadline INTEGER NOT NULL,
+    team_capacity INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    summary BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_created ON analyses (created_at);
+CREATE INDEX IF NOT EXISTS analyses_session ON analyses (session_id, created_at);
+CREATE INDEX IF NOT EXISTS analyses_fingerprint ON analyses (input_fingerprint, created_at);
+"""
+
+_LIST_COLUMNS = (
+    "analysis_id",
+    "session_id",
+    "created_at",
+    "dataset_id",
+    "input_fingerprint",
+    "solver",
+    "feasible",
+    "num_risks",
+    "selected_count",
+    "total_cost",
+    "achieved_score",
+    "deadline",
+    "team_capacity",
+    "params",
+)
+
+_SUMMARY_FIELDS = frozenset(f.name for f in fields(AnalysisSummary))
+
+
+def encode_summary(summary: AnalysisSummary) -> bytes:
+    return zlib.compress(json.dumps(asdict(summary), separators=(",", ":")).encode("utf-8"))
+
+
+def decode_summary(payload: bytes) -> AnalysisSummary:
+    data = json.loads(zlib.decompress(payload))
+    # Rows written by a newer FORGE may carry fields this version does not know.
+    return AnalysisSummary(**{key: value for key, value in data.items() if key in _SUMMARY_FIELDS})
+
+
+class AnalysisHistory:
+    """Analyses keyed by analysis ID in a local SQLite file (``:memory:`` for a throwaway store)."""
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            path = os.path.abspath(os.path.expanduser(path))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            # WAL with synchronous=NORMAL makes each insert an append without fsync; readers never block it.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def record(
+        self,
+        *,
+        analysis_id: str,
+        session_id: str,
+        summary: AnalysisSummary,
+        dataset_id: str | None = None,
+        input_fingerprint: str | None = None,
+        params: dict[str, Any] | None = None,
+        created_at: float | None = None,
+    ) -> None:
+        row = (
+            analysis_id,
+            session_id,
+            time.time() if created_at is None else created_at,
+            dataset_id,
+            input_fingerprint,
+            summary.solver,
+            int(summary.feasible),
+            summary.num_risks,
+            summary.selected_count,
+            summary.total_cost,
+            summary.achieved_score,
+            summary.deadline,
+            summary.team_capacity,
+            json.dumps(params or {}, separators=(",", ":"), default=str),
+            encode_summary(summary),
+        )
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO analyses ({', '.join(_LIST_COLUMNS)}, summary) "
+                f"VALUES ({', '.join('?' * (len(_LIST_COLUMNS) + 1))})",
+                row,
+            )
+
+    def load(self, analysis_id: str) -> dict[str, Any] | None:
+        """Stored fields of one analysis, including the decoded ``summary``; None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis_id, session_id, created_at, dataset_id, input_fingerprint, params, summary "
+                "FROM analyses WHERE analysis_id = ?",
+                (analysis_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["params"] = json.loads(entry["params"])
+        entry["summary"] = decode_summary(entry["summary"])
+        return entry
+
+    def latest_id(self, session_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis_id FROM analyses WHERE session_id = ? ORDER BY created_at DESC LIMIT 1",
+                (session_id,),
+            ).fetchone()
+        return None if row is None else row["analysis_id"]
+
+    def list(
+        self,
+        *,
+        limit: int = 20,
+        session_id: str | None = None,
+        input_fingerprint: str | None = None,
+        solver: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Newest first, without decoding summaries."""
+        if limit <= 0:
+            raise ValueError("limit must be greater than 0.")
+        clauses: list[str] = []
+        values: list[Any] = []
+        for column, value in (("session_id", session_id), ("input_fingerprint", input_fingerprint), ("solver", solver)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_LIST_COLUMNS)} FROM analyses {where}ORDER BY created_at DESC LIMIT ?",
+                (*values, limit),
+            ).fetchall()
+        out = []
+        for row in rows:
+            entry = dict(row)
+            entry["feasible"] = bool(entry["feasible"])
+            entry["params"] = json.loads(entry["params"])
+            out.append(entry)
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -3,52 +3,446 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
+import json
 import os
-from typing import Any, Literal
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
 from forge_risk_engine import (
     AnalysisSummary,
+    CapacityProfile,
+    DatasetName,
+    ResponseFormat,
+    LeadTimeDistribution,
+    SolverName,
     analyze_risk_plan,
     benchmark_solvers,
     build_visual_report_markdown,
+    diff_summaries,
+    frame_to_columns,
+    load_risk_file,
     prepare_risk_data,
+    replan_risk_plan,
+    simulate_risk_plan,
     summary_to_dict,
 )
+from forge_history import AnalysisHistory
+from forge_metrics import METRICS
+from forge_profiling import profile_analysis
+from forge_solver_pool import SolverPool
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 TransportName = Literal["stdio", "streamable-http"]
-SolverName = Literal["cp-sat", "pulp"]
 
-LAST_ANALYSIS: AnalysisSummary | None = None
+SESSION_ID_HEADER = "mcp-session-id"
+# Stdio sessions carry no transport-issued ID. These keys end up in the persistent history, so they are
+# random per session object (and per process for calls without a request context), never memory addresses.
+_LOCAL_SESSION_ID = f"local-{uuid.uuid4().hex}"
+_SESSION_KEYS: weakref.WeakKeyDictionary[Any, str] = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class StoredAnalysis:
+    analysis_id: str
+    session_id: str
+    summary: AnalysisSummary
+    size_bytes: int
+    dataset_id: str | None = None
+    input_fingerprint: str | None = None
+    params: dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+
+class AnalysisStore:
+    """LRU store of analyses keyed by analysis ID, tracking the latest run per MCP session.
+
+    With a ``history`` every analysis is also written to SQLite, and lookups that miss memory (evicted
+    entries, runs from before a restart) are served from it.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        history: AnalysisHistory | None = None,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0.")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than 0.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, StoredAnalysis] = OrderedDict()
+        self._latest_by_session: dict[str, str] = {}
+        self._total_bytes = 0
+        self.history = history
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def put(
+        self,
+        session_id: str,
+        summary: AnalysisSummary,
+        dataset_id: str | None = None,
+        *,
+        input_fingerprint: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> StoredAnalysis:
+        entry = StoredAnalysis(
+            analysis_id=uuid.uuid4().hex,
+            session_id=session_id,
+            summary=summary,
+            size_bytes=_summary_size(summary),
+            dataset_id=dataset_id,
+            input_fingerprint=input_fingerprint,
+            params=params or {},
+        )
+        if self.history is not None:
+            self.history.record(
+                analysis_id=entry.analysis_id,
+                session_id=session_id,
+                summary=summary,
+                dataset_id=dataset_id,
+                input_fingerprint=input_fingerprint,
+                params=entry.params,
+                created_at=entry.created_at,
+            )
+        self._insert(entry)
+        self._latest_by_session[session_id] = entry.analysis_id
+        return entry
+
+    def get(self, analysis_id: str) -> StoredAnalysis | None:
+        entry = self._entries.get(analysis_id)
+        METRICS.inc("forge_cache_requests_total", cache="analysis", result="miss" if entry is None else "hit")
+        if entry is not None:
+            self._entries.move_to_end(analysis_id)
+            return entry
+        if self.history is None:
+            return None
+        stored = self.history.load(analysis_id)
+        METRICS.inc("forge_cache_requests_total", cache="history", result="miss" if stored is None else "hit")
+        if stored is None:
+            return None
+        entry = StoredAnalysis(size_bytes=_summary_size(stored["summary"]), **stored)
+        self._insert(entry)
+        return entry
+
+    def latest(self, session_id: str) -> StoredAnalysis | None:
+        analysis_id = self._latest_by_session.get(session_id)
+        if analysis_id is None and self.history is not None:
+            analysis_id = self.history.latest_id(session_id)
+        return self.get(analysis_id) if analysis_id is not None else None
+
+    def list(
+        self,
+        *,
+        limit: int = 20,
+        session_id: str | None = None,
+        input_fingerprint: str | None = None,
+        solver: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Newest first; covers the whole history when there is one, otherwise the analyses in memory."""
+        if self.history is not None:
+            return self.history.list(
+                limit=limit, session_id=session_id, input_fingerprint=input_fingerprint, solver=solver
+            )
+        if limit <= 0:
+            raise ValueError("limit must be greater than 0.")
+        entries = [
+            entry
+            for entry in self._entries.values()
+            if (session_id is None or entry.session_id == session_id)
+            and (input_fingerprint is None or entry.input_fingerprint == input_fingerprint)
+            and (solver is None or entry.summary.solver == solver)
+        ]
+        entries.sort(key=lambda entry: entry.created_at, reverse=True)
+        return [_analysis_info(entry) for entry in entries[:limit]]
+
+    def _insert(self, entry: StoredAnalysis) -> None:
+        self._entries[entry.analysis_id] = entry
+        self._total_bytes += entry.size_bytes
+        self._evict()
+
+    def _evict(self) -> None:
+        # The newest entry always survives, even if it alone exceeds the memory cap.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.size_bytes
+            if self._latest_by_session.get(entry.session_id) == entry.analysis_id:
+                del self._latest_by_session[entry.session_id]
+
+
+def _summary_size(summary: AnalysisSummary) -> int:
+    return len(json.dumps(summary_to_dict(summary), separators=(",", ":")))
+
+
+def _dataset_response(df: pd.DataFrame, response_format: ResponseFormat, top_k: int | None) -> dict[str, Any]:
+    result = {
+        "num_records": int(len(df)),
+        "total_score": float(df["Score"].sum()),
+        "total_residual_floor": float(df["Res_Score"].sum()),
+        "total_cta_if_all_remediated": float(df["CTA"].sum()),
+    }
+    if response_format == "summary":
+        return result
+    shown = df.nlargest(top_k, "Score") if top_k is not None else df
+    result["risks"] = frame_to_columns(shown) if response_format == "columnar" else shown.to_dict(orient="records")
+    return result
+
+
+def _analysis_info(entry: StoredAnalysis) -> dict[str, Any]:
+    summary = entry.summary
+    return {
+        "analysis_id": entry.analysis_id,
+        "session_id": entry.session_id,
+        "created_at": entry.created_at,
+        "dataset_id": entry.dataset_id,
+        "input_fingerprint": entry.input_fingerprint,
+        "solver": summary.solver,
+        "feasible": summary.feasible,
+        "num_risks": summary.num_risks,
+        "selected_count": summary.selected_count,
+        "total_cost": summary.total_cost,
+        "achieved_score": summary.achieved_score,
+        "deadline": summary.deadline,
+        "team_capacity": summary.team_capacity,
+        "params": entry.params,
+    }
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a prepared risk frame; equal data gives the same handle whatever its source."""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    numeric = [col for col in df.columns if col != "Predecessors"]
+    digest.update(",".join(numeric).encode())
+    digest.update(pd.util.hash_pandas_object(df[numeric], index=False).to_numpy().tobytes())
+    digest.update("|".join(",".join(map(str, preds)) for preds in df["Predecessors"]).encode())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class StoredDataset:
+    dataset_id: str
+    df: pd.DataFrame
+    size_bytes: int
+
+
+class DatasetStore:
+    """LRU store of validated risk frames keyed by content hash, so large portfolios are sent once."""
+
+    def __init__(self, *, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0.")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than 0.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, StoredDataset] = OrderedDict()
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def put(self, df: pd.DataFrame) -> StoredDataset:
+        dataset_id = dataset_fingerprint(df)
+        existing = self.get(dataset_id)
+        if existing is not None:
+            return existing
+        entry = StoredDataset(
+            dataset_id=dataset_id,
+            df=df,
+            size_bytes=int(df.memory_usage(index=True, deep=True).sum()),
+        )
+        self._entries[dataset_id] = entry
+        self._total_bytes += entry.size_bytes
+        self._evict()
+        return entry
+
+    def get(self, dataset_id: str) -> StoredDataset | None:
+        entry = self._entries.get(dataset_id)
+        METRICS.inc("forge_cache_requests_total", cache="dataset", result="miss" if entry is None else "hit")
+        if entry is not None:
+            self._entries.move_to_end(dataset_id)
+        return entry
+
+    def require(self, dataset_id: str) -> pd.DataFrame:
+        entry = self.get(dataset_id)
+        if entry is None:
+            raise ValueError(
+                f"No registered dataset found for ID `{dataset_id}`. It may have been evicted; "
+                "register it again with `forge_register_dataset`."
+            )
+        return entry.df
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.size_bytes
+
+
+def _dataset_info(entry: StoredDataset) -> dict[str, Any]:
+    df = entry.df
+    return {
+        "dataset_id": entry.dataset_id,
+        "num_records": int(len(df)),
+        "total_score": float(df["Score"].sum()),
+        "total_residual_floor": float(df["Res_Score"].sum()),
+        "total_cta_if_all_remediated": float(df["CTA"].sum()),
+    }
+
+
+class _InstrumentedFastMCP(FastMCP):
+    """FastMCP that records per-tool latency histograms."""
 
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Any:
+        t0 = time.perf_counter()
+        status = "error"
+        try:
+            result = await super().call_tool(name, arguments)
+            status = "ok"
+            return result
+        finally:
+            METRICS.observe("forge_tool_seconds", time.perf_counter() - t0, tool=name, status=status)
 
-def _store_last(summary: AnalysisSummary) -> AnalysisSummary:
-    global LAST_ANALYSIS
-    LAST_ANALYSIS = summary
-    return summary
+
+def _cache_hit_rates(snapshot: dict[str, Any]) -> dict[str, dict[str, float | None]]:
+    rates: dict[str, dict[str, float]] = {}
+    for row in snapshot["counters"].get("forge_cache_requests_total", []):
+        cache = rates.setdefault(row["labels"]["cache"], {"hit": 0.0, "miss": 0.0})
+        cache[row["labels"]["result"]] += row["value"]
+    return {
+        name: {
+            "hits": counts["hit"],
+            "misses": counts["miss"],
+            "hit_rate": counts["hit"] / (counts["hit"] + counts["miss"]) if counts["hit"] + counts["miss"] else None,
+        }
+        for name, counts in rates.items()
+    }
+
+
+def _session_id(ctx: Context | None) -> str:
+    if ctx is None:
+        return _LOCAL_SESSION_ID
+    try:
+        request_context = ctx.request_context
+    except ValueError:
+        return _LOCAL_SESSION_ID
+    request = request_context.request
+    headers = getattr(request, "headers", None)
+    if headers is not None and headers.get(SESSION_ID_HEADER):
+        return str(headers[SESSION_ID_HEADER])
+    session = request_context.session
+    key = _SESSION_KEYS.get(session)
+    if key is None:
+        key = _SESSION_KEYS[session] = f"session-{uuid.uuid4().hex}"
+    return key
+
+
+def _progress_message(event: dict[str, Any]) -> str:
+    cost = event.get("incumbent_cost")
+    parts = ["searching" if cost is None else f"incumbent ${cost:,.0f}"]
+    if event.get("bound") is not None:
+        parts.append(f"bound ${event['bound']:,.0f}")
+    if event.get("gap") is not None:
+        parts.append(f"gap {event['gap'] * 100:.1f}%")
+    return f"{event['solver']}: {', '.join(parts)} after {event['elapsed_sec']:.1f}s"
 
 
-def _run_analysis(
+def _progress_reporter(
+    ctx: Context | None,
+    total_sec: float | None,
+) -> Callable[[dict[str, Any]], Awaitable[None]] | None:
+    """Forward solver progress as MCP progress notifications (elapsed seconds) when the client sent a token."""
+    if ctx is None:
+        return None
+    try:
+        meta = ctx.request_context.meta
+    except ValueError:
+        return None
+    if meta is None or meta.progressToken is None:
+        return None
+
+    async def report(event: dict[str, Any]) -> None:
+        await ctx.report_progress(progress=event["elapsed_sec"], total=total_sec, message=_progress_message(event))
+
+    return report
+
+
+async def _run_analysis(
+    pool: SolverPool,
     *,
     risks: list[dict[str, Any]] | None = None,
+    prepared: pd.DataFrame | None = None,
     num_records: int = 15,
     solver: SolverName = "cp-sat",
     deadline: int = 20,
     team_capacity: int = 4,
     target_remaining_ratio: float = 0.5,
     target_score_max: float | None = None,
-) -> AnalysisSummary:
-    summary = analyze_risk_plan(
+    time_granularity: int = 1,
+    refine_time_limit_sec: float | None = None,
+    time_limit_sec: float | None = None,
+    mip_gap: float | None = None,
+    solver_threads: int | None = None,
+    lns_iterations: int = 1000,
+    sensitivity: bool = False,
+    timeout_sec: float | None = None,
+    progress: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    profile_options: dict[str, Any] | None = None,
+) -> tuple[AnalysisSummary, dict[str, Any] | None]:
+    """Run analyze_risk_plan in the pool, under the profiler (returning its report) when profile_options is set."""
+    fn: Callable[..., Any] = analyze_risk_plan
+    if profile_options is not None:
+        fn = profile_analysis
+    result = await pool.run(
+        fn,
+        timeout_sec=timeout_sec,
+        progress=progress,
+        **(profile_options or {}),
         risks=risks,
+        prepared=prepared,
         num_records=num_records,
         solver=solver,
         deadline=deadline,
         team_capacity=team_capacity,
         target_remaining_ratio=target_remaining_ratio,
         target_score_max=target_score_max,
+        time_granularity=time_granularity,
+        refine_time_limit_sec=refine_time_limit_sec,
+        time_limit_sec=time_limit_sec,
+        mip_gap=mip_gap,
+        solver_threads=solver_threads,
+        lns_iterations=lns_iterations,
+        sensitivity=sensitivity,
     )
-    return _store_last(summary)
+    return result if profile_options is not None else (result, None)
 
 
 def create_mcp_server(
@@ -57,8 +451,32 @@ def create_mcp_server(
     port: int,
     streamable_http_path: str,
     log_level: str,
+    solver_workers: int = 2,
+    solver_queue_depth: int = 8,
+    solver_timeout_sec: float | None = 300.0,
+    solver_threads: int | None = None,
+    analysis_store_entries: int = 256,
+    analysis_store_bytes: int = 64 * 1024 * 1024,
+    dataset_store_entries: int = 32,
+    dataset_store_bytes: int = 256 * 1024 * 1024,
+    data_dir: str | None = None,
+    metrics_path: str | None = None,
+    profile_dir: str | None = None,
+    history_db: str | None = None,
 ) -> FastMCP:
-    mcp = FastMCP(
+    # Split the machine between concurrent solves instead of letting every CBC/CP-SAT run claim all cores.
+    threads_per_solve = solver_threads or max(1, (os.cpu_count() or 1) // solver_workers)
+    history = AnalysisHistory(history_db) if history_db else None
+    store = AnalysisStore(max_entries=analysis_store_entries, max_bytes=analysis_store_bytes, history=history)
+    datasets = DatasetStore(max_entries=dataset_store_entries, max_bytes=dataset_store_bytes)
+    pool = SolverPool(
+        max_workers=solver_workers,
+        max_queue=solver_queue_depth,
+        timeout_sec=solver_timeout_sec,
+    )
+    METRICS.gauge("forge_solver_jobs_running", lambda: pool.running)
+    METRICS.gauge("forge_solver_jobs_waiting", lambda: pool.waiting)
+    mcp = _InstrumentedFastMCP(
         name="FORGE Risk Intelligence",
         instructions=(
             "FORGE server for operational, financial and cyber risk intelligence. "
@@ -70,32 +488,138 @@ def create_mcp_server(
         log_level=log_level.upper(),
     )
 
+    if metrics_path:
+        from starlette.requests import Request
+        from starlette.responses import PlainTextResponse
+
+        @mcp.custom_route(metrics_path, methods=["GET"])
+        async def prometheus_metrics(request: Request) -> PlainTextResponse:
+            return PlainTextResponse(METRICS.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+    def registered_frame(dataset_id: str | None, risks: list[dict[str, Any]] | None) -> pd.DataFrame | None:
+        if dataset_id is None:
+            return None
+        if risks is not None:
+            raise ValueError("Pass either risks or dataset_id, not both.")
+        return datasets.require(dataset_id)
+
+    async def input_frame(
+        dataset_id: str | None,
+        risks: list[dict[str, Any]] | None,
+        num_records: int,
+        timeout_sec: float | None,
+    ) -> tuple[pd.DataFrame, str]:
+        """The prepared frame an analysis runs on and its content hash, whichever way the data arrived."""
+        df = registered_frame(dataset_id, risks)
+        if df is not None:
+            return df, dataset_id
+        df = await pool.run(prepare_risk_data, timeout_sec=timeout_sec, risks=risks, num_records=num_records)
+        return df, await asyncio.to_thread(dataset_fingerprint, df)
+
+    @mcp.tool(
+        name="forge_register_dataset",
+        description=(
+            "Validate custom risk records once and keep them on the server under a content-hash dataset_id. "
+            "Pass dataset_id instead of risks to the other FORGE tools to avoid resending large portfolios; "
+            "registering identical data again returns the same dataset_id."
+        ),
+    )
+    async def forge_register_dataset(
+        risks: list[dict[str, Any]],
+        timeout_sec: float | None = None,
+    ) -> dict[str, Any]:
+        df = await pool.run(prepare_risk_data, timeout_sec=timeout_sec, risks=risks)
+        return _dataset_info(datasets.put(df))
+
+    def resolve_data_path(path: str) -> str:
+        if data_dir is None:
+            return os.path.abspath(os.path.expanduser(path))
+        root = os.path.realpath(data_dir)
+        resolved = os.path.realpath(os.path.join(root, os.path.expanduser(path)))
+        if os.path.commonpath([root, resolved]) != root:
+            raise ValueError(f"Risk files must be inside the server data directory: {root}")
+        return resolved
+
+    @mcp.tool(
+        name="forge_load_risk_file",
+        description=(
+            "Load risks from a .csv, .xlsx or .parquet file on the server (path relative to the server data "
+            "directory when one is configured), validate them and register the result like "
+            "forge_register_dataset. Returns a dataset_id to pass to the other FORGE tools, so large "
+            "portfolios never travel through the conversation."
+        ),
+    )
+    async def forge_load_risk_file(
+        path: str,
+        sheet: str | None = None,
+        timeout_sec: float | None = None,
+    ) -> dict[str, Any]:
+        resolved = resolve_data_path(path)
+        df = await pool.run(load_risk_file, timeout_sec=timeout_sec, path=resolved, sheet=sheet)
+        return {"path": resolved, **_dataset_info(datasets.put(df))}
+
     @mcp.tool(
         name="forge_get_risk_dataset",
         description=(
-            "Return FORGE sample risk records (or validated custom records), including total risk score and budget baseline."
+            "Return FORGE sample risk records (or validated custom records, or a registered dataset_id), "
+            "including total risk score and budget baseline. "
+            "Use dataset='synthetic' with a seed to generate up to 100k reproducible risks for scaling tests. "
+            "format='columnar' returns one array per field instead of per-risk objects, format='summary' only "
+            "the totals; top_k limits the risks to the highest scores."
         ),
     )
-    def forge_get_risk_dataset(
+    async def forge_get_risk_dataset(
         num_records: int = 15,
         risks: list[dict[str, Any]] | None = None,
+        dataset: DatasetName = "sample",
+        seed: int = 0,
+        dependency_density: float = 0.6,
+        capacity_profile: CapacityProfile = "balanced",
+        dataset_id: str | None = None,
+        format: ResponseFormat = "records",
+        top_k: int | None = None,
+        timeout_sec: float | None = None,
     ) -> dict[str, Any]:
-        df = prepare_risk_data(risks=risks, num_records=num_records)
-        return {
-            "num_records": int(len(df)),
-            "total_score": float(df["Score"].sum()),
-            "total_residual_floor": float(df["Res_Score"].sum()),
-            "total_cta_if_all_remediated": float(df["CTA"].sum()),
-            "risks": df.to_dict(orient="records"),
-        }
+        if top_k is not None and top_k <= 0:
+            raise ValueError("top_k must be greater than 0.")
+        df = registered_frame(dataset_id, risks)
+        if df is None:
+            # Validation and synthetic generation (up to 100k rows) must not block the event loop.
+            df = await pool.run(
+                prepare_risk_data,
+                timeout_sec=timeout_sec,
+                risks=risks,
+                num_records=num_records,
+                dataset=dataset,
+                seed=seed,
+                dependency_density=dependency_density,
+                capacity_profile=capacity_profile,
+            )
+        return await asyncio.to_thread(_dataset_response, df, format, top_k)
 
     @mcp.tool(
         name="forge_optimize_schedule",
         description=(
-            "Optimize remediation plan cost while meeting target score, deadline, capacity, and predecessor constraints."
+            "Optimize remediation plan cost while meeting target score, deadline, capacity, and predecessor constraints. "
+            "Use solver='greedy' for a fast heuristic plan on large portfolios; the optimality gap is reported. "
+            "For long horizons with solver='pulp', set time_granularity (e.g. 5 or 7 days) and optionally "
+            "refine_time_limit_sec to polish the coarse plan with CP-SAT. solver='race' runs cp-sat, pulp and "
+            "greedy in parallel and returns the first proven optimum, or the best plan found within time_limit_sec. "
+            "mip_gap accepts a relative optimality gap to stop cp-sat/pulp/highs early. For thousands of risks use "
+            "solver='lns', which improves the greedy plan with CP-SAT neighbourhood moves for up to time_limit_sec "
+            "(default 30) or lns_iterations. sensitivity=true adds LP-relaxation shadow prices (cost per point of "
+            "tighter target, and value of one more unit of capacity per day when the relaxation prices "
+            "capacity; capacity_priced says whether it did) and per-risk reduced costs. "
+            "For large plans use format='columnar' (one array per field) or format='summary' (no schedule "
+            "rows), and top_k to return only the schedule rows with the largest score reduction; the full "
+            "plan stays available through analysis_id. When the request carries a progress token, cp-sat, pulp "
+            "and lns stream progress notifications with the incumbent cost, bound, gap and elapsed seconds; set "
+            "mip_gap to stop as soon as a good-enough plan is proven. profile=true runs the same call under "
+            "cProfile and tracemalloc and adds the top profile_top_n functions by cumulative time, the top "
+            "allocation sites and peak memory (and a .prof file when the server has a profile directory)."
         ),
     )
-    def forge_optimize_schedule(
+    async def forge_optimize_schedule(
         num_records: int = 15,
         solver: SolverName = "cp-sat",
         deadline: int = 20,
@@ -103,17 +627,57 @@ def create_mcp_server(
         target_remaining_ratio: float = 0.5,
         target_score_max: float | None = None,
         risks: list[dict[str, Any]] | None = None,
+        dataset_id: str | None = None,
+        time_granularity: int = 1,
+        refine_time_limit_sec: float | None = None,
+        time_limit_sec: float | None = None,
+        mip_gap: float | None = None,
+        lns_iterations: int = 1000,
+        sensitivity: bool = False,
+        format: ResponseFormat = "records",
+        top_k: int | None = None,
+        profile: bool = False,
+        profile_top_n: int = 20,
+        timeout_sec: float | None = None,
+        ctx: Context | None = None,
     ) -> dict[str, Any]:
-        summary = _run_analysis(
-            risks=risks,
-            num_records=num_records,
-            solver=solver,
-            deadline=deadline,
-            team_capacity=team_capacity,
-            target_remaining_ratio=target_remaining_ratio,
-            target_score_max=target_score_max,
+        params = {
+            "solver": solver,
+            "deadline": deadline,
+            "team_capacity": team_capacity,
+            "target_remaining_ratio": target_remaining_ratio,
+            "target_score_max": target_score_max,
+            "time_granularity": time_granularity,
+            "refine_time_limit_sec": refine_time_limit_sec,
+            "time_limit_sec": time_limit_sec,
+            "mip_gap": mip_gap,
+            "lns_iterations": lns_iterations,
+            "sensitivity": sensitivity,
+        }
+        profile_options = None
+        if profile:
+            profile_options = {"top_n": profile_top_n, "trace_memory": True, "prof_dir": profile_dir}
+        df, fingerprint = await input_frame(dataset_id, risks, num_records, timeout_sec)
+        summary, profile_report = await _run_analysis(
+            pool,
+            prepared=df,
+            solver_threads=threads_per_solve,
+            timeout_sec=timeout_sec,
+            progress=_progress_reporter(ctx, time_limit_sec),
+            **params,
+            profile_options=profile_options,
+        )
+        entry = store.put(
+            _session_id(ctx),
+            summary,
+            dataset_id=dataset_id,
+            input_fingerprint=fingerprint,
+            params=params,
         )
-        return summary_to_dict(summary)
+        result = {"analysis_id": entry.analysis_id, **summary_to_dict(summary, response_format=format, top_k=top_k)}
+        if profile_report is not None:
+            result["profile"] = profile_report
+        return result
 
     @mcp.tool(
         name="forge_visual_report",
@@ -121,7 +685,7 @@ def create_mcp_server(
             "Generate a markdown report that includes schedule table plus D3 charts for budget timeline and remediation Gantt."
         ),
     )
-    def forge_visual_report(
+    async def forge_visual_report(
         num_records: int = 15,
         solver: SolverName = "cp-sat",
         deadline: int = 20,
@@ -129,47 +693,336 @@ def create_mcp_server(
         target_remaining_ratio: float = 0.5,
         target_score_max: float | None = None,
         risks: list[dict[str, Any]] | None = None,
+        dataset_id: str | None = None,
+        time_granularity: int = 1,
+        refine_time_limit_sec: float | None = None,
+        time_limit_sec: float | None = None,
+        mip_gap: float | None = None,
+        lns_iterations: int = 1000,
+        sensitivity: bool = False,
+        timeout_sec: float | None = None,
+        ctx: Context | None = None,
     ) -> str:
-        summary = _run_analysis(
+        params = {
+            "solver": solver,
+            "deadline": deadline,
+            "team_capacity": team_capacity,
+            "target_remaining_ratio": target_remaining_ratio,
+            "target_score_max": target_score_max,
+            "time_granularity": time_granularity,
+            "refine_time_limit_sec": refine_time_limit_sec,
+            "time_limit_sec": time_limit_sec,
+            "mip_gap": mip_gap,
+            "lns_iterations": lns_iterations,
+            "sensitivity": sensitivity,
+        }
+        df, fingerprint = await input_frame(dataset_id, risks, num_records, timeout_sec)
+        summary, _ = await _run_analysis(
+            pool,
+            prepared=df,
+            solver_threads=threads_per_solve,
+            timeout_sec=timeout_sec,
+            progress=_progress_reporter(ctx, time_limit_sec),
+            **params,
+        )
+        entry = store.put(
+            _session_id(ctx),
+            summary,
+            dataset_id=dataset_id,
+            input_fingerprint=fingerprint,
+            params=params,
+        )
+        return build_visual_report_markdown(summary, analysis_id=entry.analysis_id)
+
+    @mcp.tool(
+        name="forge_replan_schedule",
+        description=(
+            "Re-plan mid-quarter: freeze risks that are in progress or completed at their actual start days "
+            "(maps of risk ID -> start day) and re-optimize only the remaining risks from current_day on. "
+            "The previous plan (analysis_id, or this session's last run) seeds the solver and supplies "
+            "deadline, team_capacity, target and dataset_id defaults; passing target_remaining_ratio or "
+            "target_score_max replaces the inherited target (ratio defaults to 0.5 without a previous plan)."
+        ),
+    )
+    async def forge_replan_schedule(
+        current_day: int,
+        in_progress: dict[int, int] | None = None,
+        completed: dict[int, int] | None = None,
+        analysis_id: str | None = None,
+        risks: list[dict[str, Any]] | None = None,
+        dataset_id: str | None = None,
+        num_records: int = 15,
+        deadline: int | None = None,
+        team_capacity: int | None = None,
+        target_remaining_ratio: float | None = None,
+        target_score_max: float | None = None,
+        time_limit_sec: float = 10.0,
+        format: ResponseFormat = "records",
+        top_k: int | None = None,
+        timeout_sec: float | None = None,
+        ctx: Context | None = None,
+    ) -> dict[str, Any]:
+        session_id = _session_id(ctx)
+        previous = store.get(analysis_id) if analysis_id is not None else store.latest(session_id)
+        if analysis_id is not None and previous is None:
+            raise ValueError(f"No stored analysis found for ID `{analysis_id}`. It may have been evicted.")
+        base = previous.summary if previous is not None and previous.summary.feasible else None
+        if base is not None:
+            deadline = base.deadline if deadline is None else deadline
+            team_capacity = base.team_capacity if team_capacity is None else team_capacity
+            # An explicit ratio or target replaces the previous plan's target instead of being overridden by it.
+            if target_score_max is None and target_remaining_ratio is None:
+                target_score_max = base.target_score_max
+        if dataset_id is None and risks is None and previous is not None:
+            dataset_id = previous.dataset_id
+        df, fingerprint = await input_frame(dataset_id, risks, num_records, timeout_sec)
+        summary = await pool.run(
+            replan_risk_plan,
+            timeout_sec=timeout_sec,
+            current_day=current_day,
+            in_progress=in_progress,
+            completed=completed,
+            previous_schedule=base.schedule if base is not None else None,
+            prepared=df,
+            deadline=20 if deadline is None else deadline,
+            team_capacity=4 if team_capacity is None else team_capacity,
+            target_remaining_ratio=0.5 if target_remaining_ratio is None else target_remaining_ratio,
+            target_score_max=target_score_max,
+            time_limit_sec=time_limit_sec,
+            solver_threads=threads_per_solve,
+        )
+        entry = store.put(
+            session_id,
+            summary,
+            dataset_id=dataset_id,
+            input_fingerprint=fingerprint,
+            params={
+                "solver": summary.solver,
+                "current_day": current_day,
+                "in_progress": in_progress,
+                "completed": completed,
+                "previous_analysis_id": previous.analysis_id if previous is not None else None,
+                "deadline": summary.deadline,
+                "team_capacity": summary.team_capacity,
+                "target_remaining_ratio": target_remaining_ratio,
+                "target_score_max": target_score_max,
+                "time_limit_sec": time_limit_sec,
+            },
+        )
+        return {
+            "analysis_id": entry.analysis_id,
+            "previous_analysis_id": previous.analysis_id if previous is not None else None,
+            **summary_to_dict(summary, response_format=format, top_k=top_k),
+        }
+
+    @mcp.tool(
+        name="forge_simulate_schedule",
+        description=(
+            "Monte Carlo robustness check of a stored plan (analysis_id, or this session's last run): "
+            "samples uncertain lead times (triangular or lognormal, per risk ID or by default spread), "
+            "propagates delays through dependencies and returns the probability of meeting the deadline, "
+            "the completion-day distribution and per-day capacity overrun probabilities. "
+            "Uses the analysis' registered dataset_id, otherwise pass the same risks/num_records."
+        ),
+    )
+    async def forge_simulate_schedule(
+        analysis_id: str | None = None,
+        risks: list[dict[str, Any]] | None = None,
+        dataset_id: str | None = None,
+        num_records: int = 15,
+        lead_time_distributions: dict[int, dict[str, Any]] | None = None,
+        default_distribution: LeadTimeDistribution = "triangular",
+        spread: float = 0.25,
+        num_samples: int = 10_000,
+        seed: int = 0,
+        top_k: int = 10,
+        timeout_sec: float | None = None,
+        ctx: Context | None = None,
+    ) -> dict[str, Any]:
+        entry = store.get(analysis_id) if analysis_id is not None else store.latest(_session_id(ctx))
+        if entry is None:
+            raise ValueError(
+                f"No stored analysis found for ID `{analysis_id}`. It may have been evicted."
+                if analysis_id is not None
+                else "No previous analysis found. Run `forge_optimize_schedule` first."
+            )
+        if not entry.summary.feasible:
+            raise ValueError(f"Analysis `{entry.analysis_id}` has no feasible schedule to simulate.")
+        if dataset_id is None and risks is None:
+            dataset_id = entry.dataset_id
+        result = await pool.run(
+            simulate_risk_plan,
+            timeout_sec=timeout_sec,
+            schedule=entry.summary.schedule,
+            deadline=entry.summary.deadline,
+            team_capacity=entry.summary.team_capacity,
             risks=risks,
+            prepared=registered_frame(dataset_id, risks),
             num_records=num_records,
-            solver=solver,
-            deadline=deadline,
-            team_capacity=team_capacity,
-            target_remaining_ratio=target_remaining_ratio,
-            target_score_max=target_score_max,
+            lead_time_distributions=lead_time_distributions,
+            default_distribution=default_distribution,
+            spread=spread,
+            num_samples=num_samples,
+            sample_seed=seed,
+            top_k=top_k,
         )
-        return build_visual_report_markdown(summary)
+        return {"analysis_id": entry.analysis_id, **result}
 
     @mcp.tool(
         name="forge_visual_report_from_last_run",
-        description="Return the last generated FORGE visual report (including D3 charts).",
+        description=(
+            "Return the last FORGE visual report (including D3 charts) generated in this session, "
+            "or the report for a specific `analysis_id` (any past run when the server keeps a history "
+            "database); the stored plan is re-rendered without re-solving."
+        ),
     )
-    def forge_visual_report_from_last_run() -> str:
-        if LAST_ANALYSIS is None:
-            return (
-                "No previous analysis found.\n\n"
-                "Run `forge_visual_report` or `forge_optimize_schedule` first."
-            )
-        return build_visual_report_markdown(LAST_ANALYSIS)
+    def forge_visual_report_from_last_run(
+        analysis_id: str | None = None,
+        ctx: Context | None = None,
+    ) -> str:
+        if analysis_id is not None:
+            entry = store.get(analysis_id)
+            if entry is None:
+                return f"No stored analysis found for ID `{analysis_id}`. It may have been evicted; re-run the analysis."
+        else:
+            entry = store.latest(_session_id(ctx))
+            if entry is None:
+                return (
+                    "No previous analysis found.\n\n"
+                    "Run `forge_visual_report` or `forge_optimize_schedule` first."
+                )
+        return build_visual_report_markdown(entry.summary, analysis_id=entry.analysis_id)
+
+    def require_analysis(analysis_id: str) -> StoredAnalysis:
+        entry = store.get(analysis_id)
+        if entry is None:
+            raise ValueError(f"No stored analysis found for ID `{analysis_id}`. It may have been evicted.")
+        return entry
+
+    @mcp.tool(
+        name="forge_list_analyses",
+        description=(
+            "List past analyses, newest first, with their solver, cost, score, parameters and input "
+            "fingerprint (a content hash of the prepared risks, equal to the dataset_id for registered data). Covers every run since the history database "
+            "was created when the server keeps one, otherwise the analyses still in memory. Filter by "
+            "input_fingerprint to find runs over the same data, or session_only for this session's runs."
+        ),
+    )
+    def forge_list_analyses(
+        limit: int = 20,
+        input_fingerprint: str | None = None,
+        solver: SolverName | None = None,
+        session_only: bool = False,
+        ctx: Context | None = None,
+    ) -> dict[str, Any]:
+        return {
+            "persistent": store.history is not None,
+            "analyses": store.list(
+                limit=limit,
+                session_id=_session_id(ctx) if session_only else None,
+                input_fingerprint=input_fingerprint,
+                solver=solver,
+            ),
+        }
+
+    @mcp.tool(
+        name="forge_get_analysis",
+        description=(
+            "Fetch a stored analysis by analysis_id without re-solving: the full plan plus the parameters "
+            "and input fingerprint it was run with. Accepts the same format/top_k options as "
+            "forge_optimize_schedule."
+        ),
+    )
+    def forge_get_analysis(
+        analysis_id: str,
+        format: ResponseFormat = "records",
+        top_k: int | None = None,
+    ) -> dict[str, Any]:
+        entry = require_analysis(analysis_id)
+        return {**_analysis_info(entry), **summary_to_dict(entry.summary, response_format=format, top_k=top_k)}
+
+    @mcp.tool(
+        name="forge_diff_analyses",
+        description=(
+            "Compare two stored plans without re-solving: risks added or dropped, start-day shifts (largest "
+            "first), and cost, score, selected-count and completion-day deltas (after minus before). "
+            "after_analysis_id defaults to this session's last run; top_k caps each listed section."
+        ),
+    )
+    def forge_diff_analyses(
+        before_analysis_id: str,
+        after_analysis_id: str | None = None,
+        top_k: int | None = 50,
+        ctx: Context | None = None,
+    ) -> dict[str, Any]:
+        before = require_analysis(before_analysis_id)
+        if after_analysis_id is not None:
+            after = require_analysis(after_analysis_id)
+        else:
+            after = store.latest(_session_id(ctx))
+            if after is None:
+                raise ValueError("No previous analysis found. Pass after_analysis_id or run an analysis first.")
+        return {
+            "before_analysis_id": before.analysis_id,
+            "after_analysis_id": after.analysis_id,
+            "same_input": before.input_fingerprint is not None
+            and before.input_fingerprint == after.input_fingerprint,
+            **diff_summaries(before.summary, after.summary, top_k=top_k),
+        }
+
+    @mcp.tool(
+        name="forge_metrics",
+        description=(
+            "Server metrics: latency histograms per tool and per engine stage (standardize, validate, model "
+            "build, solve, readback, budget timeline, D3/markdown report), analysis/dataset cache hit rates and "
+            "in-flight solver jobs. format='prometheus' returns Prometheus text instead of JSON."
+        ),
+    )
+    def forge_metrics(format: Literal["json", "prometheus"] = "json") -> dict[str, Any] | str:
+        if format == "prometheus":
+            return METRICS.render_prometheus()
+        snapshot = METRICS.snapshot()
+        return {
+            "tools": snapshot["histograms"].get("forge_tool_seconds", []),
+            "stages": snapshot["histograms"].get("forge_stage_seconds", []),
+            "caches": _cache_hit_rates(snapshot),
+            "solver_jobs": {
+                "running": snapshot["gauges"].get("forge_solver_jobs_running", 0.0),
+                "waiting": snapshot["gauges"].get("forge_solver_jobs_waiting", 0.0),
+            },
+            "stored_analyses": len(store),
+            "history_analyses": len(history) if history is not None else None,
+            "registered_datasets": len(datasets),
+        }
 
     @mcp.tool(
         name="forge_benchmark_solvers",
-        description="Benchmark cp-sat and pulp solver runtimes for the FORGE dataset.",
+        description="Benchmark cp-sat, pulp (CBC), highs and greedy solver runtimes for the FORGE dataset.",
     )
-    def forge_benchmark_solvers(
+    async def forge_benchmark_solvers(
         iterations: int = 5,
         num_records: int = 15,
         deadline: int = 20,
         team_capacity: int = 4,
         target_remaining_ratio: float = 0.5,
+        dataset: DatasetName = "sample",
+        seed: int = 0,
+        dependency_density: float = 0.6,
+        capacity_profile: CapacityProfile = "balanced",
+        timeout_sec: float | None = None,
     ) -> dict[str, Any]:
-        return benchmark_solvers(
+        return await pool.run(
+            benchmark_solvers,
+            timeout_sec=timeout_sec,
             iterations=iterations,
             num_records=num_records,
             deadline=deadline,
             team_capacity=team_capacity,
             target_remaining_ratio=target_remaining_ratio,
+            dataset=dataset,
+            seed=seed,
+            dependency_density=dependency_density,
+            capacity_profile=capacity_profile,
         )
 
     return mcp
@@ -204,6 +1057,74 @@ def parse_args() -> argparse.Namespace:
         default=os.getenv("FORGE_MCP_LOG_LEVEL", "INFO"),
         help="Server log level.",
     )
+    parser.add_argument(
+        "--solver-workers",
+        type=int,
+        default=int(os.getenv("FORGE_MCP_SOLVER_WORKERS", "2")),
+        help="Maximum number of solver processes running concurrently.",
+    )
+    parser.add_argument(
+        "--solver-queue-depth",
+        type=int,
+        default=int(os.getenv("FORGE_MCP_SOLVER_QUEUE_DEPTH", "8")),
+        help="Maximum number of solver calls waiting for a free worker before new calls are rejected.",
+    )
+    parser.add_argument(
+        "--solver-timeout",
+        type=float,
+        default=float(os.getenv("FORGE_MCP_SOLVER_TIMEOUT", "300")),
+        help="Upper bound in seconds for a single solver call; 0 disables the limit.",
+    )
+    parser.add_argument(
+        "--solver-threads",
+        type=int,
+        default=int(os.getenv("FORGE_MCP_SOLVER_THREADS", "0")),
+        help="Threads per solver call (CBC/CP-SAT); 0 divides the CPU cores between solver workers.",
+    )
+    parser.add_argument(
+        "--analysis-store-entries",
+        type=int,
+        default=int(os.getenv("FORGE_MCP_ANALYSIS_STORE_ENTRIES", "256")),
+        help="Maximum number of analyses kept in memory across all sessions.",
+    )
+    parser.add_argument(
+        "--analysis-store-mb",
+        type=float,
+        default=float(os.getenv("FORGE_MCP_ANALYSIS_STORE_MB", "64")),
+        help="Approximate memory cap (MB) for stored analyses; least recently used entries are evicted first.",
+    )
+    parser.add_argument(
+        "--history-db",
+        default=os.getenv("FORGE_MCP_HISTORY_DB") or None,
+        help="SQLite file that keeps every analysis across restarts for listing, diffing and report lookups.",
+    )
+    parser.add_argument(
+        "--metrics-path",
+        default=os.getenv("FORGE_MCP_METRICS_PATH") or None,
+        help="Serve Prometheus metrics at this HTTP path (e.g. /metrics) on the streamable-http transport.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=os.getenv("FORGE_MCP_PROFILE_DIR") or None,
+        help="Directory where profile=true analyses also write cProfile .prof files.",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=os.getenv("FORGE_MCP_DATA_DIR") or None,
+        help="Directory forge_load_risk_file reads from; paths outside it are rejected. Unset allows any local path.",
+    )
+    parser.add_argument(
+        "--dataset-store-entries",
+        type=int,
+        default=int(os.getenv("FORGE_MCP_DATASET_STORE_ENTRIES", "32")),
+        help="Maximum number of registered datasets kept in memory.",
+    )
+    parser.add_argument(
+        "--dataset-store-mb",
+        type=float,
+        default=float(os.getenv("FORGE_MCP_DATASET_STORE_MB", "256")),
+        help="Approximate memory cap (MB) for registered datasets; least recently used entries are evicted first.",
+    )
     return parser.parse_args()
 
 
@@ -214,6 +1135,18 @@ def main() -> None:
         port=args.port,
         streamable_http_path=args.streamable_http_path,
         log_level=args.log_level,
+        solver_workers=args.solver_workers,
+        solver_queue_depth=args.solver_queue_depth,
+        solver_timeout_sec=args.solver_timeout or None,
+        solver_threads=args.solver_threads or None,
+        analysis_store_entries=args.analysis_store_entries,
+        analysis_store_bytes=int(args.analysis_store_mb * 1024 * 1024),
+        dataset_store_entries=args.dataset_store_entries,
+        dataset_store_bytes=int(args.dataset_store_mb * 1024 * 1024),
+        data_dir=args.data_dir,
+        metrics_path=args.metrics_path,
+        profile_dir=args.profile_dir,
+        history_db=args.history_db,
     )
     mcp.run(transport=args.transport)
 
@@ -0,0 +1,204 @@
+"""Lightweight in-process metrics for FORGE: timing spans, latency histograms, counters and gauges.
+
+Engine stages record into the process-local ``METRICS`` registry. Solver worker processes drain
+their registry after every job and the pool merges it into the server's, so one snapshot (or one
+Prometheus scrape) covers the whole deployment.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, TypeVar
+
+# Seconds; covers sub-millisecond frame preparation up to multi-minute solves.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+METRIC_HELP = {
+    "forge_stage_seconds": "Time spent in FORGE engine stages (data preparation, model build, solve, reporting).",
+    "forge_tool_seconds": "MCP tool call latency.",
+    "forge_cache_requests_total": "Analysis and dataset store lookups by result.",
+    "forge_solver_jobs_running": "Solver jobs currently running in worker processes.",
+    "forge_solver_jobs_waiting": "Solver jobs waiting for a free worker.",
+}
+
+Labels = tuple[tuple[str, str], ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _prometheus_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "total")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, buckets: list[int], count: int, total: float) -> None:
+        self.buckets = [a + b for a, b in zip(self.buckets, buckets)]
+        self.count += count
+        self.total += total
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (the last finite bound for the overflow bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return LATENCY_BUCKETS[min(i, len(LATENCY_BUCKETS) - 1)]
+        return LATENCY_BUCKETS[-1]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, Labels], _Histogram] = {}
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._gauges: dict[str, Callable[[], float]] = {}
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def gauge(self, name: str, fn: Callable[[], float]) -> None:
+        """Register a gauge read at snapshot time, e.g. the solver pool's running job count."""
+        with self._lock:
+            self._gauges[name] = fn
+
+    def drain(self) -> dict[str, Any]:
+        """Return and reset histograms and counters as plain data (sent from worker processes)."""
+        with self._lock:
+            histograms, self._histograms = self._histograms, {}
+            counters, self._counters = self._counters, {}
+        return {
+            "histograms": [(name, labels, h.buckets, h.count, h.total) for (name, labels), h in histograms.items()],
+            "counters": [(name, labels, value) for (name, labels), value in counters.items()],
+        }
+
+    def merge(self, delta: dict[str, Any]) -> None:
+        with self._lock:
+            for name, labels, buckets, count, total in delta["histograms"]:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = _Histogram()
+                histogram.merge(buckets, count, total)
+            for name, labels, value in delta["counters"]:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            histograms = {
+                key: (h.count, h.total, h.quantile(0.5), h.quantile(0.95)) for key, h in self._histograms.items()
+            }
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        out: dict[str, Any] = {"histograms": {}, "counters": {}, "gauges": {}}
+        for (name, labels), (count, total, p50, p95) in sorted(histograms.items()):
+            out["histograms"].setdefault(name, []).append(
+                {
+                    "labels": dict(labels),
+                    "count": count,
+                    "sum_sec": total,
+                    "avg_sec": total / count if count else None,
+                    "p50_sec": p50,
+                    "p95_sec": p95,
+                }
+            )
+        for (name, labels), value in sorted(counters.items()):
+            out["counters"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+        for name, fn in sorted(gauges.items()):
+            out["gauges"][name] = float(fn())
+        return out
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            histograms = {key: (list(h.buckets), h.count, h.total) for key, h in self._histograms.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        lines: list[str] = []
+        described: set[str] = set()
+
+        def describe(name: str, kind: str) -> None:
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), (buckets, count, total) in sorted(histograms.items()):
+            describe(name, "histogram")
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, buckets):
+                cumulative += n
+                lines.append(f"{name}_bucket{_prometheus_labels(labels + (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{_prometheus_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_prometheus_labels(labels)} {total!r}")
+            lines.append(f"{name}_count{_prometheus_labels(labels)} {count}")
+        for (name, labels), value in sorted(counters.items()):
+            describe(name, "counter")
+            lines.append(f"{name}{_prometheus_labels(labels)} {value!r}")
+        for name, fn in sorted(gauges.items()):
+            describe(name, "gauge")
+            lines.append(f"{name} {float(fn())!r}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+
+@contextmanager
+def span(stage: str, **labels: Any) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.observe("forge_stage_seconds", time.perf_counter() - t0, stage=stage, **labels)
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """Decorator recording every call of the function as a ``forge_stage_seconds`` span."""
+
+    def decorator(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
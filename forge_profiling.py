@@ -0,0 +1,132 @@
+"""On-demand cProfile and tracemalloc profiling of FORGE analyses.
+
+Profiling runs inside the solver worker that executes the analysis, so the report covers data
+preparation, model construction (PuLP constraint building in particular) and readback. Time spent
+inside CBC (a subprocess) or CP-SAT (native threads) shows up as a single solve call.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import importlib
+import os
+import pstats
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from forge_risk_engine import AnalysisSummary, analyze_risk_plan
+
+# Frames from the profiler itself and the import machinery are noise in allocation reports.
+_IGNORED_ALLOCATION_FILES = (
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    tracemalloc.__file__,
+)
+
+# The engine imports these lazily; a cold worker would otherwise profile mostly import time.
+_ENGINE_MODULES = ("numpy", "pandas", "pulp", "ortools.sat.python.cp_model")
+
+
+def _short_path(path: str) -> str:
+    marker = f"site-packages{os.sep}"
+    if marker in path:
+        return path.split(marker, 1)[1]
+    return os.path.basename(path)
+
+
+def _function_label(func: tuple[str, int, str]) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        return name
+    return f"{_short_path(filename)}:{lineno}({name})"
+
+
+def profile_call(
+    fn: Callable[..., Any],
+    /,
+    *,
+    top_n: int = 20,
+    trace_memory: bool = True,
+    prof_dir: str | None = None,
+    **kwargs: Any,
+) -> tuple[Any, dict[str, Any]]:
+    """Run ``fn(**kwargs)`` under cProfile (and tracemalloc) and return its result with a report."""
+    if top_n <= 0:
+        raise ValueError("top_n must be greater than 0.")
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    t0 = time.perf_counter()
+    try:
+        result = profiler.runcall(fn, **kwargs)
+    finally:
+        wall_sec = time.perf_counter() - t0
+        snapshot = tracemalloc.take_snapshot() if trace_memory else None
+        peak_bytes = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if started_tracing:
+            tracemalloc.stop()
+
+    stats = pstats.Stats(profiler)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    top_functions = []
+    for func in stats.fcn_list[:top_n]:
+        primitive_calls, calls, own_sec, cumulative_sec, _ = stats.stats[func]
+        top_functions.append(
+            {
+                "function": _function_label(func),
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "own_sec": own_sec,
+                "cumulative_sec": cumulative_sec,
+            }
+        )
+
+    report: dict[str, Any] = {
+        "wall_sec": wall_sec,
+        "profiled_calls": stats.total_calls,
+        "top_functions": top_functions,
+    }
+    if snapshot is not None:
+        snapshot = snapshot.filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in _IGNORED_ALLOCATION_FILES]
+        )
+        report["peak_memory_mb"] = peak_bytes / (1024 * 1024)
+        report["top_allocations"] = [
+            {
+                "site": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                "size_kb": stat.size / 1024,
+                "blocks": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:top_n]
+        ]
+    if prof_dir is not None:
+        os.makedirs(prof_dir, exist_ok=True)
+        path = os.path.join(prof_dir, f"forge-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.prof")
+        profiler.dump_stats(path)
+        report["prof_path"] = path
+    return result, report
+
+
+def profile_analysis(
+    *,
+    top_n: int = 20,
+    trace_memory: bool = True,
+    prof_dir: str | None = None,
+    **analysis_kwargs: Any,
+) -> tuple[AnalysisSummary, dict[str, Any]]:
+    """``analyze_risk_plan`` under the profiler; keyword arguments are passed through unchanged."""
+    for module_name in _ENGINE_MODULES:
+        importlib.import_module(module_name)
+    return profile_call(
+        analyze_risk_plan,
+        top_n=top_n,
+        trace_memory=trace_memory,
+        prof_dir=prof_dir,
+        **analysis_kwargs,
+    )
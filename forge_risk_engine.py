@@ -1,7 +1,7 @@
 """Core risk intelligence engine for FORGE.
 
 This module turns the notebook logic into reusable functions for:
-- Sample data generation
+- Sample and seeded synthetic data generation
 - Constraint-based remediation scheduling
 - Budget timeline calculation
 - D3 chart code generation for UI rendering
@@ -9,18 +9,69 @@ This module turns the notebook logic into reusable functions for:
 
 from __future__ import annotations
 
+import atexit
+import importlib
+import importlib.util
 import json
 import math
+import multiprocessing
+import os
+import re
+import shlex
+import shutil
+import signal
+import tempfile
+import threading
 import time
-from collections.abc import Iterable
-from dataclasses import asdict, dataclass
-from typing import Any, Literal
-
-import pandas as pd
-import pulp
-from ortools.sat.python import cp_model
-
-SolverName = Literal["cp-sat", "pulp"]
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from itertools import chain
+from multiprocessing.connection import Connection, wait
+from dataclasses import asdict, dataclass, field, replace
+from functools import cache
+from typing import TYPE_CHECKING, Any, Literal
+
+from forge_metrics import METRICS, timed
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pulp
+    from ortools.sat.python import cp_model
+
+
+class _LazyModule:
+    """Stand-in for a heavy dependency, imported on first attribute access.
+
+    The first access rebinds the module-level name to the real module, so later calls pay nothing and
+    solver stacks that are never used (CBC when only CP-SAT runs, all of them for report-only calls)
+    stay out of MCP server startup.
+    """
+
+    def __init__(self, alias: str, module_name: str) -> None:
+        self._alias = alias
+        self._module_name = module_name
+
+    def __getattr__(self, attr: str) -> Any:
+        module = importlib.import_module(self._module_name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+
+if not TYPE_CHECKING:
+    np = _LazyModule("np", "numpy")
+    pd = _LazyModule("pd", "pandas")
+    pulp = _LazyModule("pulp", "pulp")
+    cp_model = _LazyModule("cp_model", "ortools.sat.python.cp_model")
+
+SolverName = Literal["cp-sat", "pulp", "highs", "greedy", "lns", "race"]
+DatasetName = Literal["sample", "synthetic"]
+CapacityProfile = Literal["light", "balanced", "heavy"]
+LeadTimeDistribution = Literal["triangular", "lognormal"]
+# records: one dict per row; columnar: one array per column; summary: totals and stats only.
+ResponseFormat = Literal["records", "columnar", "summary"]
+# Receives {"solver", "elapsed_sec", "incumbent_cost", "bound", "gap"} whenever a solver improves.
+ProgressCallback = Callable[[dict[str, Any]], None]
 
 BASE_SAMPLE_DATA: list[dict[str, Any]] = [
     {"ID": 1, "Score": 25, "Res_Score": 5, "CTA": 5000, "LeadTime": 3, "Capacity": 2, "Predecessors": []},
@@ -54,6 +105,27 @@ COLUMN_ALIASES = {
     "predecessors": "Predecessors",
 }
 
+# Explicit dtypes for file ingestion; Predecessors stays text and is parsed in bulk by _standardize_risk_frame.
+RISK_FILE_DTYPES: dict[str, str] = {
+    "ID": "int64",
+    "Score": "float64",
+    "Res_Score": "float64",
+    "CTA": "float64",
+    "LeadTime": "int64",
+    "Capacity": "int64",
+    "Predecessors": "object",
+}
+
+SYNTHETIC_MAX_RECORDS = 100_000
+# Probability of a risk needing 1, 2 or 3 units of team capacity.
+CAPACITY_PROFILES: dict[str, tuple[float, float, float]] = {
+    "light": (0.70, 0.25, 0.05),
+    "balanced": (0.45, 0.35, 0.20),
+    "heavy": (0.20, 0.40, 0.40),
+}
+# Predecessors are drawn from this many immediately preceding risks, which keeps chains local like real workstreams.
+SYNTHETIC_DEPENDENCY_WINDOW = 50
+
 
 @dataclass
 class AnalysisSummary:
@@ -71,6 +143,14 @@ class AnalysisSummary:
     total_cost: float | None
     schedule: list[dict[str, Any]]
     budget_timeline: list[dict[str, Any]]
+    lower_bound: float | None = None
+    # "solver" (the exact solver's own dual bound), "lp" (aggregate LP relaxation) or "knapsack".
+    lower_bound_kind: str | None = None
+    optimality_gap: float | None = None
+    solver_stats: dict[str, Any] = field(default_factory=dict)
+    race_winner: str | None = None
+    solver_elapsed_sec: dict[str, float | None] = field(default_factory=dict)
+    sensitivity: dict[str, Any] | None = None
 
 
 def get_sample_data(num_records: int = 15) -> pd.DataFrame:
@@ -79,6 +159,188 @@ def get_sample_data(num_records: int = 15) -> pd.DataFrame:
     return pd.DataFrame(BASE_SAMPLE_DATA[:num_records]).copy()
 
 
+def generate_risk_data(
+    num_records: int,
+    *,
+    seed: int = 0,
+    dependency_density: float = 0.6,
+    capacity_profile: CapacityProfile = "balanced",
+    duplicate_ratio: float = 0.0,
+) -> pd.DataFrame:
+    """Generate a reproducible synthetic risk portfolio.
+
+    ``dependency_density`` is the expected number of predecessors per risk. Predecessors always
+    point to lower IDs, so the dependency graph is acyclic by construction. ``duplicate_ratio`` is the
+    share of risks that are dependency-free copies of a few templates (the same finding on many hosts).
+    """
+    if not 1 <= num_records <= SYNTHETIC_MAX_RECORDS:
+        raise ValueError(f"num_records must be between 1 and {SYNTHETIC_MAX_RECORDS} for synthetic data.")
+    if dependency_density < 0:
+        raise ValueError("dependency_density must be non-negative.")
+    if capacity_profile not in CAPACITY_PROFILES:
+        raise ValueError(f"Unsupported capacity_profile: {capacity_profile}")
+    if not 0 <= duplicate_ratio < 1:
+        raise ValueError("duplicate_ratio must be in [0, 1).")
+
+    rng = np.random.default_rng(seed)
+    n = int(num_records)
+    num_duplicates = int(round(n * duplicate_ratio))
+    n -= num_duplicates
+
+    lead_time = np.clip(np.rint(rng.lognormal(np.log(3.0), 0.5, n)), 1, 15).astype(np.int64)
+    capacity = rng.choice(np.array([1, 2, 3]), size=n, p=CAPACITY_PROFILES[capacity_profile])
+    score = np.clip(np.rint(rng.lognormal(np.log(22.0), 0.55, n)), 5, 100)
+    residual = np.minimum(np.rint(score * rng.beta(2.0, 6.0, n)), score)
+    cost = lead_time * capacity * 800.0 * rng.lognormal(0.0, 0.35, n)
+    cost = np.maximum(np.rint(cost / 50.0) * 50.0, 50.0)
+
+    # Sample predecessor edges (pred_idx < succ_idx) and drop duplicates per successor.
+    counts = np.minimum(rng.poisson(dependency_density, n), np.arange(n))
+    succ_idx = np.repeat(np.arange(n), counts)
+    window = np.minimum(succ_idx, SYNTHETIC_DEPENDENCY_WINDOW)
+    pred_idx = succ_idx - 1 - np.floor(rng.random(succ_idx.size) * window).astype(np.int64)
+    edges = np.unique(np.stack([succ_idx, pred_idx], axis=1), axis=0) if succ_idx.size else np.empty((0, 2), np.int64)
+
+    ids = np.arange(1, n + 1)
+    predecessors: list[list[int]] = [[] for _ in range(n)]
+    if edges.size:
+        boundaries = np.flatnonzero(np.diff(edges[:, 0])) + 1
+        for group in np.split(edges, boundaries):
+            predecessors[int(group[0, 0])] = (ids[group[:, 1]]).tolist()
+
+    df = pd.DataFrame(
+        {
+            "ID": ids,
+            "Score": score,
+            "Res_Score": residual,
+            "CTA": cost,
+            "LeadTime": lead_time,
+            "Capacity": capacity,
+            "Predecessors": predecessors,
+        }
+    )
+    if num_duplicates:
+        # Roughly 20 copies per template, drawn from the unique risks generated above.
+        num_templates = max(1, num_duplicates // 20)
+        templates = df.iloc[rng.integers(0, n, num_templates)]
+        copies = templates.iloc[rng.integers(0, num_templates, num_duplicates)].reset_index(drop=True)
+        copies["ID"] = np.arange(n + 1, n + num_duplicates + 1)
+        copies["Predecessors"] = [[] for _ in range(num_duplicates)]
+        df = pd.concat([df, copies], ignore_index=True)
+    return df
+
+
+# Whitespace-free "1,2", "[1,2]", '["1","2"]', optionally with a trailing comma; anything else takes the slow path.
+_PREDECESSOR_ITEM = r'(?:-?\d+|"-?\d+")'
+_PREDECESSOR_LIST = rf"(?:{_PREDECESSOR_ITEM}(?:,{_PREDECESSOR_ITEM})*,?)?"
+_PREDECESSOR_TEXT_PATTERN = rf"\[{_PREDECESSOR_LIST}\]|{_PREDECESSOR_LIST}"
+
+
+@dataclass
+class DependencyEdges:
+    """Predecessor DAG as flat edge arrays of row positions (``sources[k]`` must finish before ``targets[k]``)."""
+
+    num_nodes: int
+    sources: np.ndarray
+    targets: np.ndarray
+
+
+def _scatter_segments(flat: np.ndarray, indptr: np.ndarray, rows: np.ndarray, values: np.ndarray) -> None:
+    lengths = indptr[rows + 1] - indptr[rows]
+    starts = np.repeat(indptr[rows], lengths)
+    offsets = np.arange(values.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    flat[starts + offsets] = values
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _parse_predecessor_text(value: str) -> list[int]:
+    """Tolerant parser for strings the fast pattern rejects: a JSON list, else comma-separated integers."""
+    cleaned = value.strip()
+    try:
+        parsed = json.loads(cleaned)
+    except json.JSONDecodeError:
+        pieces = [p.strip() for p in cleaned.split(",") if p.strip()]
+        try:
+            return [int(p) for p in pieces]
+        except ValueError:
+            raise ValueError(f"Invalid predecessors value: {value}") from None
+    if not isinstance(parsed, list) or any(isinstance(v, (list, dict)) or v is None for v in parsed):
+        raise ValueError(f"Invalid predecessors value: {value}")
+    try:
+        return [int(v) for v in parsed]
+    except ValueError:
+        raise ValueError(f"Invalid predecessors value: {value}") from None
+
+
+def _parse_predecessor_column(values: pd.Series) -> tuple[np.ndarray, np.ndarray, bool]:
+    """Parse a raw ``Predecessors`` column into CSR form: row ``i`` owns ``flat[indptr[i]:indptr[i + 1]]``.
+
+    The flag is True when every value already was a list of ints, i.e. the column can be kept as is.
+    """
+    raw = values.to_numpy(dtype=object)
+    kinds = np.fromiter(map(type, raw), dtype=object, count=raw.size)
+    is_list = kinds == list
+    is_str = kinds == str
+    is_other = ~(is_list | is_str)
+    is_null = np.zeros(raw.size, dtype=bool)
+    if is_other.any():
+        is_null[is_other] = [_is_missing(v) for v in raw[is_other]]
+        is_other &= ~is_null
+    clean_lists = bool(is_list.all())
+
+    lengths = np.zeros(raw.size, dtype=np.int64)
+    parsed: list[tuple[np.ndarray, np.ndarray]] = []
+
+    if is_list.any():
+        rows = np.flatnonzero(is_list)
+        lists = raw[rows]
+        lengths[rows] = np.fromiter(map(len, lists), dtype=np.int64, count=rows.size)
+        flat_values = list(chain.from_iterable(lists))
+        items = np.asarray(flat_values)
+        if items.size and items.dtype.kind not in "iu":
+            clean_lists = False
+            items = np.array([int(v) for v in flat_values], dtype=np.int64)
+        parsed.append((rows, items.astype(np.int64, copy=False)))
+
+    if is_str.any():
+        rows = np.flatnonzero(is_str)
+        text = pd.Series(raw[rows], dtype=object).str.replace(r"\s", "", regex=True)
+        slow = (~text.str.fullmatch(_PREDECESSOR_TEXT_PATTERN).astype(bool)).to_numpy()
+        if slow.any():
+            slow_rows = rows[slow]
+            slow_lists = [_parse_predecessor_text(value) for value in raw[slow_rows]]
+            lengths[slow_rows] = [len(v) for v in slow_lists]
+            parsed.append((slow_rows, np.fromiter(chain.from_iterable(slow_lists), dtype=np.int64)))
+            rows, text = rows[~slow], text[~slow]
+        text = text.str.replace(r'[\[\]"]', "", regex=True).str.rstrip(",")
+        non_empty = (text != "").to_numpy()
+        lengths[rows] = text.str.count(",").to_numpy() + non_empty
+        joined = ",".join(text[non_empty].tolist())
+        items = np.array(joined.split(","), dtype=np.int64) if joined else np.empty(0, dtype=np.int64)
+        parsed.append((rows, items))
+
+    if is_other.any():
+        rows = np.flatnonzero(is_other)
+        other_lists: list[list[int]] = []
+        for value in raw[rows]:
+            if not isinstance(value, Iterable):
+                raise ValueError(f"Invalid predecessors value: {value}")
+            other_lists.append([int(v) for v in value])
+        lengths[rows] = [len(v) for v in other_lists]
+        parsed.append((rows, np.fromiter(chain.from_iterable(other_lists), dtype=np.int64)))
+
+    indptr = np.zeros(raw.size + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    flat = np.empty(int(indptr[-1]), dtype=np.int64)
+    for rows, items in parsed:
+        _scatter_segments(flat, indptr, rows, items)
+    return indptr, flat, clean_lists
+
+
+@timed("standardize")
 def _standardize_risk_frame(df: pd.DataFrame) -> pd.DataFrame:
     rename_map = {col: COLUMN_ALIASES.get(str(col).lower(), col) for col in df.columns}
     out = df.rename(columns=rename_map).copy()
@@ -94,50 +356,124 @@ def _standardize_risk_frame(df: pd.DataFrame) -> pd.DataFrame:
     for col in ["Score", "Res_Score", "CTA"]:
         out[col] = out[col].astype(float)
 
-    def normalize_predecessors(value: Any) -> list[int]:
-        if value is None:
-            return []
-        if isinstance(value, str):
-            cleaned = value.strip()
-            if not cleaned:
-                return []
-            try:
-                parsed = json.loads(cleaned)
-                if isinstance(parsed, list):
-                    return [int(v) for v in parsed]
-            except json.JSONDecodeError:
-                pieces = [p.strip() for p in cleaned.split(",") if p.strip()]
-                return [int(p) for p in pieces]
-            raise ValueError(f"Invalid predecessors value: {value}")
-        if isinstance(value, Iterable):
-            return [int(v) for v in value]
-        raise ValueError(f"Invalid predecessors value: {value}")
-
-    out["Predecessors"] = out["Predecessors"].apply(normalize_predecessors)
+    indptr, flat, clean_lists = _parse_predecessor_column(out["Predecessors"])
+    if not clean_lists:
+        flat_list = flat.tolist()
+        bounds = indptr.tolist()
+        out["Predecessors"] = [flat_list[bounds[i] : bounds[i + 1]] for i in range(len(out))]
     return out
 
 
+def dependency_edges(df: pd.DataFrame) -> DependencyEdges:
+    """Map ``Predecessors`` IDs to row positions, rejecting unknown IDs and self-dependencies."""
+    ids = df["ID"].to_numpy(dtype=np.int64)
+    predecessors = df["Predecessors"].tolist()
+    lengths = np.fromiter(map(len, predecessors), dtype=np.int64, count=len(predecessors))
+    pred_ids = np.fromiter(chain.from_iterable(predecessors), dtype=np.int64, count=int(lengths.sum()))
+    targets = np.repeat(np.arange(ids.size), lengths)
+
+    known = np.isin(pred_ids, ids)
+    if not known.all():
+        k = int(np.flatnonzero(~known)[0])
+        raise ValueError(f"Risk {ids[targets[k]]} references missing predecessor ID {pred_ids[k]}.")
+    self_loops = pred_ids == ids[targets]
+    if self_loops.any():
+        k = int(np.flatnonzero(self_loops)[0])
+        raise ValueError(f"Risk {ids[targets[k]]} cannot depend on itself.")
+
+    sources = pd.Index(ids).get_indexer(pred_ids).astype(np.int64)
+    return DependencyEdges(num_nodes=int(ids.size), sources=sources, targets=targets)
+
+
+def topological_order(edges: DependencyEdges, ids: np.ndarray | None = None) -> np.ndarray:
+    """Return row positions in dependency order, raising if the graph has a cycle.
+
+    When every predecessor has a lower ID than its successor (sorted exports, generated data) sorting
+    by ID is already a topological order. Otherwise Kahn's algorithm runs over CSR successor lists;
+    both paths are iterative, so long chains cannot overflow the stack.
+    """
+    n = edges.num_nodes
+    if ids is not None and bool((ids[edges.sources] < ids[edges.targets]).all()):
+        return np.argsort(ids, kind="stable")
+
+    out_degree = np.bincount(edges.sources, minlength=n)
+    succ_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(out_degree, out=succ_indptr[1:])
+    successors = edges.targets[np.argsort(edges.sources, kind="stable")].tolist()
+    bounds = succ_indptr.tolist()
+
+    remaining = np.bincount(edges.targets, minlength=n).tolist()
+    order = [i for i, degree in enumerate(remaining) if degree == 0]
+    head = 0
+    while head < len(order):
+        node = order[head]
+        head += 1
+        for succ in successors[bounds[node] : bounds[node + 1]]:
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                order.append(succ)
+
+    if len(order) != n:
+        raise ValueError("Dependency graph contains a cycle.")
+    return np.asarray(order, dtype=np.int64)
+
+
+def schedule_violations(
+    df: pd.DataFrame,
+    schedule: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    limit: int = 5,
+) -> list[str]:
+    """Check a plan against the hard constraints; returns up to ``limit`` problems, empty when valid.
+
+    Covers lead times, the [0, deadline] horizon, predecessors (selected and finished before the
+    successor starts) and the per-day team capacity.
+    """
+    ids = df["ID"].to_numpy(dtype=np.int64)
+    pos = pd.Index(ids).get_indexer(schedule["ID"].to_numpy(dtype=np.int64))
+    problems: list[str] = []
+    if (pos < 0).any():
+        problems.append(f"Unknown risk ID {int(schedule['ID'].to_numpy()[np.flatnonzero(pos < 0)[0]])} in schedule.")
+        return problems
+    n = ids.size
+    start = np.full(n, -1, dtype=np.int64)
+    end = np.full(n, -1, dtype=np.int64)
+    start[pos] = schedule["Start_Day"].to_numpy(dtype=np.int64)
+    end[pos] = schedule["End_Day"].to_numpy(dtype=np.int64)
+    selected = np.zeros(n, dtype=bool)
+    selected[pos] = True
+    duration = df["LeadTime"].to_numpy(dtype=np.int64)
+    demand = df["Capacity"].to_numpy(dtype=np.int64)
+
+    bad_window = selected & ((start < 0) | (end > deadline) | (end - start != duration))
+    for i in np.flatnonzero(bad_window)[:limit].tolist():
+        problems.append(f"Risk {ids[i]} runs days {start[i]}-{end[i]}, outside the horizon or its lead time.")
+
+    edges = dependency_edges(df)
+    active = selected[edges.targets]
+    missing = active & ~selected[edges.sources]
+    late = active & selected[edges.sources] & (end[edges.sources] > start[edges.targets])
+    for k in np.flatnonzero(missing)[:limit].tolist():
+        problems.append(f"Risk {ids[edges.targets[k]]} is scheduled without predecessor {ids[edges.sources[k]]}.")
+    for k in np.flatnonzero(late)[:limit].tolist():
+        problems.append(f"Risk {ids[edges.targets[k]]} starts before predecessor {ids[edges.sources[k]]} ends.")
+
+    if not bad_window.any():
+        usage = np.zeros(deadline + 1, dtype=np.int64)
+        np.add.at(usage, start[selected], demand[selected])
+        np.subtract.at(usage, end[selected], demand[selected])
+        over = np.flatnonzero(np.cumsum(usage)[:deadline] > max_capacity)
+        if over.size:
+            problems.append(f"Team capacity {max_capacity} exceeded on day {int(over[0])} ({over.size} days in total).")
+    return problems[:limit]
+
+
 def _ensure_acyclic_dependency_graph(df: pd.DataFrame) -> None:
-    graph = {int(row.ID): [int(v) for v in row.Predecessors] for row in df.itertuples(index=False)}
-    visiting: set[int] = set()
-    visited: set[int] = set()
-
-    def dfs(node: int) -> None:
-        if node in visited:
-            return
-        if node in visiting:
-            raise ValueError("Dependency graph contains a cycle.")
-        visiting.add(node)
-        for pred in graph.get(node, []):
-            if pred in graph:
-                dfs(pred)
-        visiting.remove(node)
-        visited.add(node)
-
-    for node in graph:
-        dfs(node)
+    topological_order(dependency_edges(df), df["ID"].to_numpy(dtype=np.int64))
 
 
+@timed("validate")
 def validate_risk_data(df: pd.DataFrame) -> None:
     if df.empty:
         raise ValueError("Risk dataset is empty.")
@@ -156,30 +492,381 @@ def validate_risk_data(df: pd.DataFrame) -> None:
         invalid = df.loc[df["Score"] < df["Res_Score"], "ID"].tolist()
         raise ValueError(f"Res_Score cannot exceed Score. Invalid IDs: {invalid}")
 
-    all_ids = set(df["ID"].astype(int).tolist())
-    for row in df.itertuples(index=False):
-        for pred in row.Predecessors:
-            if pred not in all_ids:
-                raise ValueError(f"Risk {row.ID} references missing predecessor ID {pred}.")
-            if int(pred) == int(row.ID):
-                raise ValueError(f"Risk {row.ID} cannot depend on itself.")
-
     _ensure_acyclic_dependency_graph(df)
 
 
-def prepare_risk_data(risks: list[dict[str, Any]] | None = None, num_records: int = 15) -> pd.DataFrame:
-    df = get_sample_data(num_records) if risks is None else pd.DataFrame(risks)
+def compute_time_windows(df: pd.DataFrame, deadline: int, max_capacity: int | None = None) -> pd.DataFrame:
+    """Start-time windows from one forward and one backward pass over the dependency order.
+
+    ``Earliest_Start`` is the longest predecessor chain ending before the risk and ``Latest_Start`` is
+    ``deadline - LeadTime``; together they bound the start of any selected risk. ``Latest_Start_Chain``
+    additionally leaves room for every successor chain, which only binds when those successors are
+    selected too, so it is reported but not used to shrink domains. A risk is not ``Schedulable`` if
+    its window is empty, it needs more than ``max_capacity``, or any predecessor is not schedulable.
+    """
+    ids = df["ID"].to_numpy(dtype=np.int64)
+    duration = df["LeadTime"].to_numpy(dtype=np.int64)
+    edges = dependency_edges(df)
+    order = topological_order(edges, ids).tolist()
+
+    n = ids.size
+    preds: list[list[int]] = [[] for _ in range(n)]
+    succs: list[list[int]] = [[] for _ in range(n)]
+    for src, dst in zip(edges.sources.tolist(), edges.targets.tolist()):
+        preds[dst].append(src)
+        succs[src].append(dst)
+
+    dur = duration.tolist()
+    earliest = [0] * n
+    latest_chain = [int(deadline) - d for d in dur]
+    fits = [True] * n if max_capacity is None else (df["Capacity"].to_numpy() <= max_capacity).tolist()
+    schedulable = [False] * n
+    for i in order:
+        earliest[i] = max((earliest[p] + dur[p] for p in preds[i]), default=0)
+        schedulable[i] = fits[i] and earliest[i] + dur[i] <= deadline and all(schedulable[p] for p in preds[i])
+    for i in reversed(order):
+        for succ in succs[i]:
+            latest_chain[i] = min(latest_chain[i], latest_chain[succ] - dur[i])
+
+    return pd.DataFrame(
+        {
+            "ID": ids,
+            "Earliest_Start": np.asarray(earliest, dtype=np.int64),
+            "Latest_Start": int(deadline) - duration,
+            "Latest_Start_Chain": np.asarray(latest_chain, dtype=np.int64),
+            "Schedulable": np.asarray(schedulable, dtype=bool),
+        }
+    )
+
+
+def reduce_dependency_graph(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """Return a copy of ``df`` with the transitive reduction of ``Predecessors`` and the number of edges removed.
+
+    An edge ``p -> i`` is redundant when ``p`` is already an ancestor of another predecessor of ``i``
+    (A->B, B->C, A->C drops A->C). Ancestor sets, and therefore the selection closure and the
+    precedence timing of every risk, are unchanged. Duplicate entries are removed as well.
+    """
+    ids = df["ID"].to_numpy(dtype=np.int64)
+    edges = dependency_edges(df)
+    n = ids.size
+    rank = np.empty(n, dtype=np.int64)
+    rank[topological_order(edges, ids)] = np.arange(n)
+    rank_list = rank.tolist()
+
+    preds: list[list[int]] = [[] for _ in range(n)]
+    for src, dst in zip(edges.sources.tolist(), edges.targets.tolist()):
+        preds[dst].append(src)
+
+    removed = 0
+    reduced = list(df["Predecessors"])
+    for i in range(n):
+        direct = set(preds[i])
+        removed += len(preds[i]) - len(direct)
+        if len(direct) < 2:
+            if len(direct) != len(preds[i]):
+                reduced[i] = [int(ids[p]) for p in direct]
+            continue
+        # Walk ancestors of the direct predecessors; nothing ranked below the lowest direct
+        # predecessor can lead back to one, so the search is pruned there.
+        floor = min(rank_list[p] for p in direct)
+        redundant: set[int] = set()
+        stack = [a for p in direct for a in preds[p] if rank_list[a] >= floor]
+        seen = set(stack)
+        while stack:
+            node = stack.pop()
+            if node in direct:
+                redundant.add(node)
+            for a in preds[node]:
+                if a not in seen and rank_list[a] >= floor:
+                    seen.add(a)
+                    stack.append(a)
+        if redundant or len(direct) != len(preds[i]):
+            removed += len(redundant)
+            reduced[i] = [int(ids[p]) for p in sorted(direct - redundant, key=rank_list.__getitem__)]
+
+    out = df.copy()
+    out["Predecessors"] = reduced
+    return out, removed
+
+
+def risk_equivalence_classes(df: pd.DataFrame) -> list[list[int]]:
+    """Groups (size >= 2) of interchangeable risks: identical attributes and no dependencies either way."""
+    has_preds = df["Predecessors"].map(len).to_numpy() > 0
+    is_pred = df["ID"].isin(list(chain.from_iterable(df["Predecessors"]))).to_numpy()
+    free = df.loc[~has_preds & ~is_pred, ["ID", "Score", "Res_Score", "CTA", "LeadTime", "Capacity"]]
+    groups = free.sort_values("ID").groupby(["Score", "Res_Score", "CTA", "LeadTime", "Capacity"], sort=False)["ID"]
+    return [ids for ids in groups.agg(list).tolist() if len(ids) > 1]
+
+
+def _model_input(
+    df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    stats: dict[str, Any],
+) -> tuple[pd.DataFrame, dict[int, int], list[list[int]]]:
+    """Shared solver preprocessing: drop unschedulable risks and redundant precedence edges, find symmetric risks."""
+    windows = compute_time_windows(df, deadline, max_capacity)
+    schedulable = windows["Schedulable"].to_numpy()
+    earliest_by_id = dict(zip(windows["ID"].tolist(), windows["Earliest_Start"].tolist()))
+    reduced, removed = reduce_dependency_graph(df[schedulable])
+    stats["unschedulable_ids"] = windows.loc[~schedulable, "ID"].astype(int).tolist()
+    stats["redundant_precedences_removed"] = removed
+    classes = risk_equivalence_classes(reduced)
+    stats["equivalence_classes"] = len(classes)
+    stats["symmetric_risks"] = sum(len(c) for c in classes)
+    return reduced, earliest_by_id, classes
+
+
+def prepare_risk_data(
+    risks: list[dict[str, Any]] | None = None,
+    num_records: int = 15,
+    *,
+    dataset: DatasetName = "sample",
+    seed: int = 0,
+    dependency_density: float = 0.6,
+    capacity_profile: CapacityProfile = "balanced",
+    duplicate_ratio: float = 0.0,
+) -> pd.DataFrame:
+    if risks is not None:
+        df = pd.DataFrame(risks)
+    elif dataset == "sample":
+        df = get_sample_data(num_records)
+    elif dataset == "synthetic":
+        df = generate_risk_data(
+            num_records,
+            seed=seed,
+            dependency_density=dependency_density,
+            capacity_profile=capacity_profile,
+            duplicate_ratio=duplicate_ratio,
+        )
+    else:
+        raise ValueError(f"Unsupported dataset: {dataset}")
+    df = _standardize_risk_frame(df)
+    validate_risk_data(df)
+    return df
+
+
+def _risk_file_columns(columns: Iterable[Any]) -> dict[str, str]:
+    """Map source column names to canonical names through COLUMN_ALIASES, keeping only risk fields."""
+    mapping: dict[str, str] = {}
+    for col in columns:
+        if col is None:
+            continue
+        canonical = COLUMN_ALIASES.get(str(col).strip().lower(), str(col).strip())
+        if canonical in RISK_FILE_DTYPES and canonical not in mapping.values():
+            mapping[str(col)] = canonical
+    missing = [col for col in CANONICAL_COLUMNS if col not in mapping.values()]
+    if missing:
+        raise ValueError(f"Missing required risk fields: {missing}")
+    return mapping
+
+
+def _read_risk_xlsx(path: str, sheet: str | None) -> pd.DataFrame:
+    if importlib.util.find_spec("openpyxl") is None:
+        raise ValueError("Reading .xlsx risk files requires openpyxl (pip install openpyxl).")
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet is not None and sheet not in workbook.sheetnames:
+            raise ValueError(f"Sheet {sheet!r} not found; available sheets: {workbook.sheetnames}")
+        rows = (workbook[sheet] if sheet is not None else workbook.active).iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError(f"Risk file is empty: {path}")
+        mapping = _risk_file_columns(header)
+        positions = [i for i, col in enumerate(header) if col is not None and str(col) in mapping]
+        columns: list[list[Any]] = [[] for _ in positions]
+        for row in rows:
+            values = [row[i] if i < len(row) else None for i in positions]
+            if all(v is None for v in values):
+                continue
+            for column, value in zip(columns, values):
+                column.append(value)
+    finally:
+        workbook.close()
+    return pd.DataFrame({mapping[str(header[i])]: column for i, column in zip(positions, columns)})
+
+
+def load_risk_file(path: str, *, sheet: str | None = None) -> pd.DataFrame:
+    """Load and validate risks from a local .csv, .xlsx or .parquet file.
+
+    Only the risk columns are read, with explicit dtypes; XLSX is streamed with openpyxl read-only
+    mode. ``Predecessors`` may be empty, a single ID or a comma-separated/JSON-style list of IDs.
+    """
+    if not os.path.isfile(path):
+        raise ValueError(f"Risk file not found: {path}")
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in {".csv", ".txt"}:
+        mapping = _risk_file_columns(pd.read_csv(path, nrows=0).columns)
+        df = pd.read_csv(
+            path,
+            usecols=list(mapping),
+            # Nullable ints, so an empty ID/LeadTime/Capacity cell reaches the empty-field check below.
+            dtype={src: RISK_FILE_DTYPES[dst].replace("int64", "Int64") for src, dst in mapping.items()},
+            keep_default_na=False,
+            na_values={src: [""] for src, dst in mapping.items() if dst != "Predecessors"},
+        ).rename(columns=mapping)
+    elif suffix in {".xlsx", ".xlsm"}:
+        df = _read_risk_xlsx(path, sheet)
+    elif suffix in {".parquet", ".pq"}:
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ValueError("Reading .parquet risk files requires pyarrow (pip install pyarrow).")
+        import pyarrow.parquet as pq
+
+        mapping = _risk_file_columns(pq.read_schema(path).names)
+        df = pd.read_parquet(path, columns=list(mapping)).rename(columns=mapping)
+    else:
+        raise ValueError(f"Unsupported risk file type {suffix!r}; use .csv, .xlsx or .parquet.")
+
+    if df.empty:
+        raise ValueError(f"Risk file has no rows: {path}")
+    numeric = [col for col in CANONICAL_COLUMNS if col != "Predecessors"]
+    blank = df[numeric].isna().any(axis=1).to_numpy()
+    if blank.any():
+        raise ValueError(f"Risk file row {int(np.flatnonzero(blank)[0]) + 2} has empty required fields.")
+    df = df.astype({col: RISK_FILE_DTYPES[col] for col in numeric})
+    # Spreadsheet cells holding a single predecessor come back as numbers.
+    preds = df["Predecessors"]
+    if pd.api.types.is_numeric_dtype(preds):
+        preds = preds.astype("Int64").astype("string").fillna("").astype(object)
+    elif preds.map(type).isin([int, float]).any():
+        preds = preds.map(lambda v: str(int(v)) if isinstance(v, (int, float)) and v == v else v)
+    df["Predecessors"] = preds.where(preds.notna(), "")
     df = _standardize_risk_frame(df)
     validate_risk_data(df)
     return df
 
 
+def _progress_event(solver: str, t0: float, cost: float | None, bound: float | None) -> dict[str, Any]:
+    gap = None
+    if cost is not None and bound is not None:
+        gap = max(0.0, (cost - bound) / cost) if cost else 0.0
+    return {
+        "solver": solver,
+        "elapsed_sec": time.perf_counter() - t0,
+        "incumbent_cost": cost,
+        "bound": bound,
+        "gap": gap,
+    }
+
+
+@cache
+def _cp_sat_progress_class() -> type:
+    # Defined on first use because subclassing CpSolverSolutionCallback needs ortools imported.
+    class _CpSatProgress(cp_model.CpSolverSolutionCallback):
+        """Reports every new incumbent and every bound improvement; CP-SAT may call it from worker threads."""
+
+        def __init__(self, progress: ProgressCallback, t0: float) -> None:
+            super().__init__()
+            self._progress = progress
+            self._t0 = t0
+            self._lock = threading.Lock()
+            self._cost: float | None = None
+
+        def on_solution_callback(self) -> None:
+            with self._lock:
+                self._cost = float(self.ObjectiveValue())
+                self._progress(_progress_event("cp-sat", self._t0, self._cost, float(self.BestObjectiveBound())))
+
+        def on_bound(self, bound: float) -> None:
+            with self._lock:
+                self._progress(_progress_event("cp-sat", self._t0, self._cost, float(bound)))
+
+    return _CpSatProgress
+
+
+_CBC_INCUMBENT = re.compile(r"Integer solution of (\S+) found")
+_CBC_STATUS = re.compile(r"(\S+) best solution, best possible (\S+)")
+_CBC_CONTINUOUS = re.compile(r"Continuous objective value is (\S+)")
+# CBC prints 1e+50 as the "best solution" before it has found one.
+_CBC_NO_SOLUTION = 1e49
+
+
+def _tail_cbc_log(path: str, done: threading.Event, progress: ProgressCallback, t0: float) -> None:
+    cost: float | None = None
+    bound: float | None = None
+    pending = ""
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        while True:
+            finished = done.is_set()
+            *lines, pending = (pending + fh.read()).split("\n")
+            for line in lines:
+                new_cost, new_bound = cost, bound
+                if match := _CBC_INCUMBENT.search(line):
+                    new_cost = float(match.group(1))
+                elif match := _CBC_STATUS.search(line):
+                    best = float(match.group(1))
+                    new_cost = best if best < _CBC_NO_SOLUTION else cost
+                    new_bound = float(match.group(2))
+                elif match := _CBC_CONTINUOUS.search(line):
+                    new_bound = float(match.group(1))
+                if (new_cost, new_bound) != (cost, bound):
+                    cost, bound = new_cost, new_bound
+                    progress(_progress_event("pulp", t0, cost, bound))
+            if finished:
+                break
+            done.wait(0.2)
+
+
+@cache
+def _line_buffered_cbc_path() -> str | None:
+    """CBC block-buffers its log when it is redirected to a file, so incumbents would only show up at exit.
+
+    Where coreutils ``stdbuf`` exists, return a wrapper script that starts CBC line-buffered.
+    """
+    stdbuf = shutil.which("stdbuf")
+    if os.name != "posix" or stdbuf is None:
+        return None
+    fd, path = tempfile.mkstemp(prefix="forge_cbc_", suffix=".sh")
+    with os.fdopen(fd, "w") as fh:
+        fh.write(f'#!/bin/sh\nexec {shlex.quote(stdbuf)} -oL {shlex.quote(pulp.PULP_CBC_CMD().path)} "$@"\n')
+    os.chmod(path, 0o755)
+    atexit.register(lambda: os.path.exists(path) and os.remove(path))
+    return path
+
+
+@contextmanager
+def _follow_cbc_log(progress: ProgressCallback | None) -> Iterator[str | None]:
+    """Yield a CBC logPath whose incumbent and bound lines become progress events while CBC runs."""
+    if progress is None:
+        yield None
+        return
+    fd, path = tempfile.mkstemp(prefix="forge_cbc_", suffix=".log")
+    os.close(fd)
+    done = threading.Event()
+    follower = threading.Thread(target=_tail_cbc_log, args=(path, done, progress, time.perf_counter()), daemon=True)
+    follower.start()
+    try:
+        yield path
+    finally:
+        done.set()
+        follower.join()
+        os.remove(path)
+
+
 def solve_with_cp_sat(
     df: pd.DataFrame,
     deadline: int,
     max_capacity: int,
     target_score_max: float,
+    stats: dict[str, Any] | None = None,
+    symmetry_breaking: bool = True,
+    hint: pd.DataFrame | None = None,
+    time_limit_sec: float | None = None,
+    num_workers: int | None = None,
+    relative_gap: float | None = None,
+    progress: ProgressCallback | None = None,
 ) -> pd.DataFrame | None:
+    stats = {} if stats is None else stats
+    t0 = time.perf_counter()
+    total_original = float(df["Score"].sum())
+    score_reduction_needed = max(0, math.ceil(total_original - target_score_max))
+
+    df, earliest_by_id, classes = _model_input(df, deadline, max_capacity, stats)
+    if not symmetry_breaking:
+        classes = []
+
     model = cp_model.CpModel()
     x = {int(r.ID): model.NewBoolVar(f"select_{int(r.ID)}") for r in df.itertuples(index=False)}
     risk_vars: dict[int, dict[str, Any]] = {}
@@ -187,14 +874,12 @@ def solve_with_cp_sat(
     for r in df.itertuples(index=False):
         rid = int(r.ID)
         duration = int(r.LeadTime)
-        start = model.NewIntVar(0, int(deadline), f"start_{rid}")
-        end = model.NewIntVar(0, int(deadline), f"end_{rid}")
+        earliest = int(earliest_by_id[rid])
+        start = model.NewIntVar(earliest, int(deadline) - duration, f"start_{rid}")
+        end = model.NewIntVar(earliest + duration, int(deadline), f"end_{rid}")
         interval = model.NewOptionalIntervalVar(start, duration, end, x[rid], f"interval_{rid}")
         risk_vars[rid] = {"x": x[rid], "start": start, "end": end, "interval": interval}
 
-    total_original = float(df["Score"].sum())
-    score_reduction_needed = max(0, math.ceil(total_original - target_score_max))
-
     reductions: list[Any] = []
     costs: list[Any] = []
     for r in df.itertuples(index=False):
@@ -212,17 +897,44 @@ def solve_with_cp_sat(
             model.Add(x[rid] <= x[pred])
             model.Add(risk_vars[rid]["start"] >= risk_vars[pred]["end"]).OnlyEnforceIf(x[rid])
 
+    # Interchangeable risks: select them in ID order and start them in ID order.
+    for members in classes:
+        for a, b in zip(members, members[1:]):
+            model.Add(x[a] >= x[b])
+            model.Add(risk_vars[a]["start"] <= risk_vars[b]["start"]).OnlyEnforceIf(x[b])
+
     intervals = [risk_vars[int(r.ID)]["interval"] for r in df.itertuples(index=False)]
     demands = [int(r.Capacity) for r in df.itertuples(index=False)]
     model.AddCumulative(intervals, demands, int(max_capacity))
 
     model.Minimize(sum(costs))
 
+    if hint is not None:
+        hinted_starts = dict(zip(hint["ID"].astype(int).tolist(), hint["Start_Day"].astype(int).tolist()))
+        for rid, v in risk_vars.items():
+            model.AddHint(v["x"], rid in hinted_starts)
+            if rid in hinted_starts:
+                model.AddHint(v["start"], hinted_starts[rid])
+    t1 = time.perf_counter()
+
     solver = cp_model.CpSolver()
-    status = solver.Solve(model)
+    if time_limit_sec is not None:
+        solver.parameters.max_time_in_seconds = float(time_limit_sec)
+    if num_workers is not None:
+        solver.parameters.num_workers = int(num_workers)
+    if relative_gap is not None:
+        solver.parameters.relative_gap_limit = float(relative_gap)
+    callback = None
+    if progress is not None:
+        callback = _cp_sat_progress_class()(progress, t1)
+        solver.best_bound_callback = callback.on_bound
+    status = solver.Solve(model, callback)
+    t2 = time.perf_counter()
+    stats.update(build_sec=t1 - t0, solve_sec=t2 - t1, status=solver.StatusName(status).lower())
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         return None
+    stats["lower_bound"] = float(solver.BestObjectiveBound())
 
     rows: list[dict[str, Any]] = []
     for r in df.itertuples(index=False):
@@ -242,88 +954,1344 @@ def solve_with_cp_sat(
             }
         )
 
+    stats["readback_sec"] = time.perf_counter() - t2
     return pd.DataFrame(rows)
 
 
-def solve_with_pulp(
+def _pulp_solution_status(prob: pulp.LpProblem) -> str:
+    names = {
+        pulp.LpSolutionOptimal: "optimal",
+        pulp.LpSolutionIntegerFeasible: "feasible",
+        pulp.LpSolutionInfeasible: "infeasible",
+        pulp.LpSolutionUnbounded: "unbounded",
+    }
+    return names.get(prob.sol_status, pulp.LpStatus[prob.status].lower())
+
+
+@cache
+def _timed_cbc_class() -> type:
+    # Defined on first use because subclassing PULP_CBC_CMD needs pulp imported.
+    class _TimedCbc(pulp.PULP_CBC_CMD):
+        """CBC command that records how long the MPS hand-off and the solution file parsing take."""
+
+        write_sec = 0.0
+        read_sec = 0.0
+
+        def solve_CBC(self, lp: pulp.LpProblem, use_mps: bool = True) -> int:
+            write_mps = lp.writeMPS
+
+            def timed_write_mps(*args: Any, **kwargs: Any) -> Any:
+                t0 = time.perf_counter()
+                try:
+                    return write_mps(*args, **kwargs)
+                finally:
+                    self.write_sec += time.perf_counter() - t0
+
+            lp.writeMPS = timed_write_mps
+            try:
+                return super().solve_CBC(lp, use_mps)
+            finally:
+                del lp.writeMPS
+
+        def readsol_MPS(self, *args: Any, **kwargs: Any) -> Any:
+            t0 = time.perf_counter()
+            try:
+                return super().readsol_MPS(*args, **kwargs)
+            finally:
+                self.read_sec += time.perf_counter() - t0
+
+    return _TimedCbc
+
+
+@dataclass
+class _PulpModel:
+    prob: pulp.LpProblem
+    risk_ids: list[int]
+    x: dict[int, dict[int, pulp.LpVariable]]
+    selected: dict[int, pulp.LpVariable]
+    members_by_id: dict[int, list[int]]
+    cta_by_id: dict[int, float]
+    lead_time_by_id: dict[int, int]
+    capacity_by_id: dict[int, int]
+    reduction_by_id: dict[int, float]
+    window_by_id: dict[int, range]
+
+
+def _build_pulp_model(
     df: pd.DataFrame,
     deadline: int,
     max_capacity: int,
     target_score_max: float,
-) -> pd.DataFrame | None:
-    prob = pulp.LpProblem("Risk_Budget_Optimization", pulp.LpMinimize)
-    times = list(range(deadline + 1))
-    risk_ids = [int(v) for v in df["ID"].tolist()]
+    stats: dict[str, Any],
+    symmetry_breaking: bool = True,
+    relax: bool = False,
+) -> _PulpModel:
+    current_total = float(df["Score"].sum())
+    df, earliest_by_id, classes = _model_input(df, deadline, max_capacity, stats)
+    if not symmetry_breaking:
+        classes = []
+
+    # Interchangeable risks have no dependencies, so each class is modelled as one counted item on
+    # its lowest ID: integer start/selection counts bounded by the class size.
+    members_by_id = {members[0]: members for members in classes}
+    folded = {m for members in classes for m in members[1:]}
 
-    x = pulp.LpVariable.dicts("Start", (risk_ids, times), cat="Binary")
-    selected = pulp.LpVariable.dicts("Selected", risk_ids, cat="Binary")
+    prob = pulp.LpProblem("Risk_Budget_Optimization", pulp.LpMinimize)
+    risk_ids = [int(v) for v in df["ID"].tolist() if int(v) not in folded]
+    multiplicity = {i: len(members_by_id.get(i, (i,))) for i in risk_ids}
 
     cta_by_id = {int(row.ID): float(row.CTA) for row in df.itertuples(index=False)}
     lead_time_by_id = {int(row.ID): int(row.LeadTime) for row in df.itertuples(index=False)}
     capacity_by_id = {int(row.ID): int(row.Capacity) for row in df.itertuples(index=False)}
     score_by_id = {int(row.ID): float(row.Score) for row in df.itertuples(index=False)}
     residual_by_id = {int(row.ID): float(row.Res_Score) for row in df.itertuples(index=False)}
+    reduction_by_id = {i: score_by_id[i] - residual_by_id[i] for i in score_by_id}
     predecessors_by_id = {
         int(row.ID): [int(v) for v in row.Predecessors] for row in df.itertuples(index=False)
     }
+    # Start binaries only exist inside each risk's [earliest, deadline - duration] window.
+    window_by_id = {i: range(int(earliest_by_id[i]), deadline - lead_time_by_id[i] + 1) for i in risk_ids}
+
+    def count_var(name: str, i: int) -> pulp.LpVariable:
+        if relax:
+            return pulp.LpVariable(name, lowBound=0, upBound=multiplicity[i], cat="Continuous")
+        if multiplicity[i] == 1:
+            return pulp.LpVariable(name, cat="Binary")
+        return pulp.LpVariable(name, lowBound=0, upBound=multiplicity[i], cat="Integer")
+
+    x = {i: {t: count_var(f"Start_{i}_{t}", i) for t in window_by_id[i]} for i in risk_ids}
+    selected = {i: count_var(f"Selected_{i}", i) for i in risk_ids}
+    stats["start_vars"] = sum(len(w) for w in window_by_id.values())
 
     prob += pulp.lpSum(selected[i] * cta_by_id[i] for i in risk_ids)
 
     for i in risk_ids:
-        duration = lead_time_by_id[i]
-        prob += pulp.lpSum(x[i][t] for t in times) == selected[i]
-        for t in range(deadline - duration + 1, deadline + 1):
-            prob += x[i][t] == 0
+        prob += pulp.lpSum(x[i].values()) == selected[i]
 
-    current_total = float(df["Score"].sum())
-    score_reduction = pulp.lpSum(selected[i] * (score_by_id[i] - residual_by_id[i]) for i in risk_ids)
-    prob += (current_total - score_reduction) <= float(target_score_max)
+    score_reduction = pulp.lpSum(selected[i] * reduction_by_id[i] for i in risk_ids)
+    prob += (current_total - score_reduction) <= float(target_score_max), "Score_Target"
 
-    big_m = deadline * 2
+    start_expr = {i: pulp.lpSum(t * var for t, var in x[i].items()) for i in risk_ids}
     for i in risk_ids:
         for pred in predecessors_by_id[i]:
             pred_duration = lead_time_by_id[pred]
-            start_i = pulp.lpSum(t * x[i][t] for t in times)
-            start_pred = pulp.lpSum(t * x[pred][t] for t in times)
+            # Latest possible end of the predecessor: the smallest big-M that still deactivates the
+            # constraint when risk i is not selected (its start expression is then 0).
+            big_m = window_by_id[pred].stop - 1 + pred_duration
             prob += selected[i] <= selected[pred]
-            prob += start_i >= start_pred + pred_duration - big_m * (1 - selected[i])
+            prob += start_expr[i] >= start_expr[pred] + pred_duration - big_m * (1 - selected[i])
 
-    for t in times:
+    for t in range(deadline):
         resource_usage = []
         for i in risk_ids:
-            duration = lead_time_by_id[i]
+            window = window_by_id[i]
             cap = capacity_by_id[i]
-            relevant_starts = [x[i][k] for k in range(max(0, t - duration + 1), t + 1)]
+            relevant_starts = [x[i][k] for k in range(max(window.start, t - lead_time_by_id[i] + 1), min(window.stop, t + 1))]
             if relevant_starts:
                 resource_usage.append(cap * pulp.lpSum(relevant_starts))
-        prob += pulp.lpSum(resource_usage) <= int(max_capacity)
+        if resource_usage:
+            prob += pulp.lpSum(resource_usage) <= int(max_capacity), f"Capacity_Day_{t}"
+
+    return _PulpModel(
+        prob=prob,
+        risk_ids=risk_ids,
+        x=x,
+        selected=selected,
+        members_by_id=members_by_id,
+        cta_by_id=cta_by_id,
+        lead_time_by_id=lead_time_by_id,
+        capacity_by_id=capacity_by_id,
+        reduction_by_id=reduction_by_id,
+        window_by_id=window_by_id,
+    )
+
 
-    prob.solve(pulp.PULP_CBC_CMD(msg=0))
+def solve_with_pulp(
+    df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    target_score_max: float,
+    stats: dict[str, Any] | None = None,
+    symmetry_breaking: bool = True,
+    time_granularity: int = 1,
+    threads: int | None = None,
+    time_limit_sec: float | None = None,
+    gap_rel: float | None = None,
+    progress: ProgressCallback | None = None,
+) -> pd.DataFrame | None:
+    stats = {} if stats is None else stats
+    if time_granularity < 1:
+        raise ValueError("time_granularity must be at least 1.")
+    cbc_options = {"threads": threads, "time_limit_sec": time_limit_sec, "gap_rel": gap_rel, "progress": progress}
+    if time_granularity > 1:
+        return _solve_with_pulp_coarse(
+            df, deadline, max_capacity, target_score_max, stats, symmetry_breaking, time_granularity, cbc_options
+        )
+    t0 = time.perf_counter()
+    model = _build_pulp_model(df, deadline, max_capacity, target_score_max, stats, symmetry_breaking)
+    prob, x, risk_ids = model.prob, model.x, model.risk_ids
+    t1 = time.perf_counter()
+
+    cbc_threads = threads or os.cpu_count() or 1
+    with _follow_cbc_log(progress) as log_path:
+        cbc = _timed_cbc_class()(
+            msg=False,
+            threads=cbc_threads,
+            timeLimit=time_limit_sec,
+            gapRel=gap_rel,
+            logPath=log_path,
+        )
+        if log_path is not None:
+            # PULP_CBC_CMD rejects path=, but solve_CBC launches whatever self.path points at.
+            cbc.path = _line_buffered_cbc_path() or cbc.path
+        prob.solve(cbc)
+    t2 = time.perf_counter()
+    stats.update(
+        build_sec=t1 - t0,
+        write_sec=cbc.write_sec,
+        solve_sec=t2 - t1 - cbc.write_sec - cbc.read_sec,
+        read_solution_sec=cbc.read_sec,
+        threads=cbc_threads,
+        status=_pulp_solution_status(prob),
+    )
 
-    if pulp.LpStatus[prob.status] != "Optimal":
+    # A time limit can stop CBC with an integer incumbent that is feasible but not proven optimal.
+    if prob.sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
         return None
+    if prob.sol_status == pulp.LpSolutionOptimal and not gap_rel:
+        stats["lower_bound"] = float(pulp.value(prob.objective) or 0.0)
 
     rows: list[dict[str, Any]] = []
     for i in risk_ids:
-        if pulp.value(selected[i]) != 1:
+        # Expand counted classes back to per-ID rows, assigning starts to members in ID order.
+        members = iter(model.members_by_id.get(i, [i]))
+        for t, var in x[i].items():
+            for _ in range(int(round(pulp.value(var) or 0))):
+                rid = next(members)
+                rows.append(
+                    {
+                        "ID": rid,
+                        "Start_Day": int(t),
+                        "End_Day": int(t + model.lead_time_by_id[i]),
+                        "Cost": float(model.cta_by_id[i]),
+                        "Reduction": float(model.reduction_by_id[i]),
+                        "Capacity": int(model.capacity_by_id[i]),
+                    }
+                )
+
+    stats["readback_sec"] = time.perf_counter() - t2
+    return pd.DataFrame(rows)
+
+
+def pulp_sensitivity(
+    df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    target_score_max: float,
+    stats: dict[str, Any] | None = None,
+    top_k: int = 10,
+) -> dict[str, Any] | None:
+    """Marginal values from one LP-relaxation solve of the PuLP model.
+
+    Shadow prices are reported as positive costs: ``target_shadow_price`` is the extra cost per
+    additional point of required score reduction, and a day's capacity shadow price is the saving
+    from one more unit of team capacity on that day. They are LP estimates, valid for small changes.
+    A risk's reduced cost is that of its cheapest start column (selection plus start day).
+
+    The relaxation rarely prices capacity: fractional starts can slide to any slack day in their
+    window at no cost, so a day that is full in one LP optimum is usually not binding. When no
+    capacity row has a positive dual, ``capacity_priced`` is False and ``extra_capacity_unit_value``
+    is None rather than a misleading 0. Returns None when the relaxation is infeasible.
+    """
+    stats = {} if stats is None else stats
+    t0 = time.perf_counter()
+    model = _build_pulp_model(df, deadline, max_capacity, target_score_max, {}, relax=True)
+    model.prob.solve(pulp.PULP_CBC_CMD(msg=False, mip=False))
+    stats["sensitivity_sec"] = time.perf_counter() - t0
+    if pulp.LpStatus[model.prob.status] != "Optimal":
+        return None
+
+    constraints = model.prob.constraints
+    target_price = -float(constraints["Score_Target"].pi or 0.0)
+    days: list[dict[str, Any]] = []
+    for t in range(deadline):
+        row = constraints.get(f"Capacity_Day_{t}")
+        if row is None:
             continue
-        start_day = 0
-        for t in times:
-            if pulp.value(x[i][t]) == 1:
-                start_day = t
+        days.append(
+            {
+                "day": t,
+                "shadow_price": max(0.0, -float(row.pi or 0.0)),
+                "lp_usage": float(max_capacity) - float(row.slack or 0.0),
+            }
+        )
+    bottlenecks = sorted((d for d in days if d["shadow_price"] > 1e-9), key=lambda d: (-d["shadow_price"], d["day"]))
+    bottleneck_rank = {d["day"]: rank for rank, d in enumerate(bottlenecks)}
+    capacity_priced = bool(bottlenecks)
+
+    risks: list[dict[str, Any]] = []
+    for i in model.risk_ids:
+        lp_value = float(model.selected[i].varValue or 0.0)
+        # "Selected" is only tied to the start columns by an equality row, so its own dj carries
+        # that row's dual; the risk's reduced cost is the selection column plus its cheapest start.
+        start_djs = [float(var.dj or 0.0) for var in model.x[i].values()]
+        reduced_cost = float(model.selected[i].dj or 0.0) + (min(start_djs) if start_djs else 0.0)
+        # The risk's most binding day: where an LP start would put it over the highest-priced bottleneck.
+        window = model.window_by_id[i]
+        covered = range(window.start, window.stop - 1 + model.lead_time_by_id[i])
+        ranks = [bottleneck_rank[t] for t in covered if t in bottleneck_rank]
+        for rid in model.members_by_id.get(i, [i]):
+            risks.append(
+                {
+                    "ID": rid,
+                    "reduced_cost": reduced_cost,
+                    "lp_value": lp_value / len(model.members_by_id.get(i, [i])),
+                    "bottleneck_day": bottlenecks[min(ranks)]["day"] if ranks else None,
+                }
+            )
+    risks.sort(key=lambda r: (r["bottleneck_day"] is None, bottleneck_rank.get(r["bottleneck_day"], 0), r["reduced_cost"]))
+
+    return {
+        "lp_objective": float(pulp.value(model.prob.objective) or 0.0),
+        "target_shadow_price": target_price,
+        "target_tightened_5pct_cost": target_price * 0.05 * float(target_score_max),
+        "capacity_priced": capacity_priced,
+        "extra_capacity_unit_value": sum(d["shadow_price"] for d in days) if capacity_priced else None,
+        "capacity_note": None
+        if capacity_priced
+        else "The LP relaxation leaves every capacity row unpriced (starts can shift to slack days); "
+        "re-solve with team_capacity + 1 to value an extra engineer.",
+        "bottleneck_days": bottlenecks[:top_k],
+        "capacity_shadow_prices": days,
+        "risk_reduced_costs": risks,
+    }
+
+
+def highs_available() -> bool:
+    return importlib.util.find_spec("scipy") is not None
+
+
+def solve_with_highs(
+    df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    target_score_max: float,
+    stats: dict[str, Any] | None = None,
+    symmetry_breaking: bool = True,
+    time_limit_sec: float | None = None,
+    gap_rel: float | None = None,
+) -> pd.DataFrame | None:
+    """Same time-indexed model as solve_with_pulp, assembled as sparse arrays and solved in-process by HiGHS."""
+    try:
+        from scipy.optimize import Bounds, LinearConstraint, milp
+        from scipy.sparse import csr_array
+    except ImportError as exc:
+        raise ValueError("solver='highs' requires scipy>=1.9 (pip install scipy).") from exc
+
+    stats = {} if stats is None else stats
+    t0 = time.perf_counter()
+    current_total = float(df["Score"].sum())
+
+    df, earliest_by_id, classes = _model_input(df, deadline, max_capacity, stats)
+    if not symmetry_breaking:
+        classes = []
+    members_by_id = {members[0]: members for members in classes}
+    folded = {m for members in classes for m in members[1:]}
+    df = df[~df["ID"].isin(folded)].reset_index(drop=True)
+
+    ids = df["ID"].to_numpy(dtype=np.int64)
+    duration = df["LeadTime"].to_numpy(dtype=np.int64)
+    demand = df["Capacity"].to_numpy(dtype=np.int64)
+    cost = df["CTA"].to_numpy(dtype=float)
+    reduction = (df["Score"] - df["Res_Score"]).to_numpy(dtype=float)
+    multiplicity = np.array([len(members_by_id.get(int(i), (i,))) for i in ids], dtype=float)
+    earliest = np.array([int(earliest_by_id[int(i)]) for i in ids], dtype=np.int64)
+    latest = deadline - duration
+    position = {int(rid): k for k, rid in enumerate(ids)}
+
+    # One column per (risk, start day) inside the risk's window; "selected" is the sum of its columns.
+    width = np.maximum(latest - earliest + 1, 0)
+    var_risk = np.repeat(np.arange(len(ids)), width)
+    first_var = np.concatenate(([0], np.cumsum(width)))
+    var_t = earliest[var_risk] + (np.arange(len(var_risk)) - first_var[var_risk])
+    num_vars = len(var_risk)
+    stats["start_vars"] = int(num_vars)
+
+    rows: list[np.ndarray] = []
+    cols: list[np.ndarray] = []
+    vals: list[np.ndarray] = []
+    lower: list[np.ndarray] = []
+    upper: list[np.ndarray] = []
+    next_row = 0
+
+    def add_rows(r: np.ndarray, c: np.ndarray, v: np.ndarray, lb: np.ndarray, ub: np.ndarray) -> None:
+        nonlocal next_row
+        rows.append(r + next_row)
+        cols.append(c)
+        vals.append(v.astype(float))
+        lower.append(lb.astype(float))
+        upper.append(ub.astype(float))
+        next_row += len(lb)
+
+    all_vars = np.arange(num_vars)
+    # Score target: sum of reductions over selected risks.
+    add_rows(
+        np.zeros(num_vars, dtype=np.int64),
+        all_vars,
+        reduction[var_risk],
+        np.array([current_total - float(target_score_max)]),
+        np.array([np.inf]),
+    )
+
+    succ_list: list[int] = []
+    pred_list: list[int] = []
+    for succ, preds in zip(df["ID"].tolist(), df["Predecessors"].tolist()):
+        for pred in preds:
+            succ_list.append(position[int(succ)])
+            pred_list.append(position[int(pred)])
+    if succ_list:
+        succ = np.array(succ_list)
+        pred = np.array(pred_list)
+        # Same big-M as solve_with_pulp: the predecessor's latest possible end.
+        big_m = latest[pred] + duration[pred]
+        for k in range(len(succ)):
+            s_cols = np.arange(first_var[succ[k]], first_var[succ[k] + 1])
+            p_cols = np.arange(first_var[pred[k]], first_var[pred[k] + 1])
+            c = np.concatenate((s_cols, p_cols))
+            zeros = np.zeros(len(c), dtype=np.int64)
+            # selected[succ] <= selected[pred]
+            add_rows(
+                zeros,
+                c,
+                np.concatenate((np.ones(len(s_cols)), -np.ones(len(p_cols)))),
+                np.array([-np.inf]),
+                np.array([0.0]),
+            )
+            # start[succ] >= start[pred] + duration[pred] - M * (1 - selected[succ])
+            add_rows(
+                zeros,
+                c,
+                np.concatenate((var_t[s_cols] - big_m[k], -var_t[p_cols])),
+                np.array([float(duration[pred[k]] - big_m[k])]),
+                np.array([np.inf]),
+            )
+
+    # Capacity: column (i, t) occupies days t .. t + duration_i - 1.
+    var_duration = duration[var_risk]
+    cover_var = np.repeat(all_vars, var_duration)
+    seg_start = np.concatenate(([0], np.cumsum(var_duration)))[:-1]
+    cover_day = var_t[cover_var] + (np.arange(len(cover_var)) - np.repeat(seg_start, var_duration))
+    add_rows(
+        cover_day,
+        cover_var,
+        demand[var_risk][cover_var],
+        np.full(deadline, -np.inf),
+        np.full(deadline, float(max_capacity)),
+    )
+    # Each risk (or counted class) is started at most `multiplicity` times.
+    add_rows(var_risk, all_vars, np.ones(num_vars), np.full(len(ids), -np.inf), multiplicity)
+
+    matrix = csr_array(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(next_row, num_vars)
+    )
+    constraint = LinearConstraint(matrix, np.concatenate(lower), np.concatenate(upper))
+    options: dict[str, Any] = {"disp": False}
+    if time_limit_sec is not None:
+        options["time_limit"] = float(time_limit_sec)
+    if gap_rel is not None:
+        options["mip_rel_gap"] = float(gap_rel)
+    t1 = time.perf_counter()
+
+    result = milp(
+        cost[var_risk],
+        constraints=constraint,
+        integrality=np.ones(num_vars),
+        bounds=Bounds(np.zeros(num_vars), multiplicity[var_risk]),
+        options=options,
+    )
+    t2 = time.perf_counter()
+    status = {0: "optimal", 1: "time_limit", 2: "infeasible", 3: "unbounded"}.get(result.status, "error")
+    if status == "time_limit" and result.x is not None:
+        status = "feasible"
+    stats.update(build_sec=t1 - t0, solve_sec=t2 - t1, status=status)
+
+    if result.x is None:
+        return None
+    if getattr(result, "mip_dual_bound", None) is not None and np.isfinite(result.mip_dual_bound):
+        stats["lower_bound"] = float(result.mip_dual_bound)
+
+    counts = np.rint(result.x).astype(np.int64)
+    schedule_rows: list[dict[str, Any]] = []
+    members = {int(rid): iter(members_by_id.get(int(rid), [int(rid)])) for rid in ids}
+    for v in np.flatnonzero(counts):
+        k = var_risk[v]
+        for _ in range(counts[v]):
+            schedule_rows.append(
+                {
+                    "ID": next(members[int(ids[k])]),
+                    "Start_Day": int(var_t[v]),
+                    "End_Day": int(var_t[v] + duration[k]),
+                    "Cost": float(cost[k]),
+                    "Reduction": float(reduction[k]),
+                    "Capacity": int(demand[k]),
+                }
+            )
+    stats["readback_sec"] = time.perf_counter() - t2
+    return pd.DataFrame(schedule_rows)
+
+
+def _solve_with_pulp_coarse(
+    df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    target_score_max: float,
+    stats: dict[str, Any],
+    symmetry_breaking: bool,
+    granularity: int,
+    cbc_options: dict[str, Any],
+) -> pd.DataFrame | None:
+    # Solve on buckets of `granularity` days with durations rounded up; every coarse schedule maps to a
+    # feasible schedule in days, but the coarse optimum is only an upper bound on the true optimum.
+    coarse_df = df.copy()
+    coarse_df["LeadTime"] = -(-coarse_df["LeadTime"].astype(int) // granularity)
+    coarse = solve_with_pulp(
+        coarse_df, deadline // granularity, max_capacity, target_score_max, stats, symmetry_breaking, **cbc_options
+    )
+    stats["time_granularity"] = granularity
+    stats.pop("lower_bound", None)
+    if coarse is None or coarse.empty:
+        return coarse
+    lead_time_by_id = dict(zip(df["ID"].astype(int).tolist(), df["LeadTime"].astype(int).tolist()))
+    coarse["Start_Day"] = coarse["Start_Day"] * granularity
+    coarse["End_Day"] = coarse["Start_Day"] + coarse["ID"].map(lead_time_by_id)
+    stats["coarse_cost"] = float(coarse["Cost"].sum())
+    return coarse
+
+
+def refine_schedule(
+    df: pd.DataFrame,
+    schedule_df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    target_score_max: float,
+    stats: dict[str, Any] | None = None,
+    time_limit_sec: float = 5.0,
+) -> pd.DataFrame:
+    """Short CP-SAT pass in day units, warm-started from `schedule_df`; keeps the input if nothing better is found."""
+    stats = {} if stats is None else stats
+    refine_stats: dict[str, Any] = {}
+    refined = solve_with_cp_sat(
+        df,
+        deadline,
+        max_capacity,
+        target_score_max,
+        refine_stats,
+        hint=schedule_df,
+        time_limit_sec=time_limit_sec,
+    )
+    before = float(schedule_df["Cost"].sum())
+    stats["refine_sec"] = refine_stats.get("build_sec", 0.0) + refine_stats.get("solve_sec", 0.0)
+    stats["refine_status"] = refine_stats["status"]
+    if refined is None or float(refined["Cost"].sum()) > before:
+        stats["refined_cost"] = before
+        stats["refine_cost_delta"] = 0.0
+        return schedule_df
+    stats["refined_cost"] = float(refined["Cost"].sum())
+    stats["refine_cost_delta"] = stats["refined_cost"] - before
+    stats["lower_bound"] = refine_stats["lower_bound"]
+    return refined
+
+
+class _CapacityProfile:
+    """Per-day capacity usage over ``[0, deadline)`` with earliest-fit placement of intervals."""
+
+    def __init__(self, deadline: int, max_capacity: int) -> None:
+        self.deadline = int(deadline)
+        self.max_capacity = int(max_capacity)
+        self.usage = np.zeros(self.deadline, dtype=np.int64)
+
+    def earliest_fit(self, earliest: int, duration: int, demand: int) -> int | None:
+        latest = self.deadline - duration
+        if earliest > latest or demand > self.max_capacity:
+            return None
+        blocked = (self.usage[earliest:] + demand > self.max_capacity).astype(np.int64)
+        blocked_prefix = np.concatenate(([0], np.cumsum(blocked)))
+        window_blocked = blocked_prefix[duration:] - blocked_prefix[:-duration]
+        hits = np.flatnonzero(window_blocked == 0)
+        return int(earliest + hits[0]) if hits.size else None
+
+    def add(self, start: int, duration: int, demand: int) -> None:
+        self.usage[start : start + duration] += demand
+
+    def remove(self, start: int, duration: int, demand: int) -> None:
+        self.usage[start : start + duration] -= demand
+
+
+def knapsack_lower_bound(df: pd.DataFrame, deadline: int, max_capacity: int, target_score_max: float) -> float | None:
+    """Lower bound on the optimal cost from the fractional score-covering knapsack.
+
+    Scheduling and precedence constraints are relaxed, except that risks which cannot fit the
+    deadline or the team capacity on their own are excluded. The fractional knapsack has a closed
+    form (fill by cost per unit of reduction), so no LP solver is needed. Returns None when even
+    the relaxation cannot reach the target.
+    """
+    reduction = (df["Score"] - df["Res_Score"]).to_numpy(dtype=float)
+    cost = df["CTA"].to_numpy(dtype=float)
+    fits = (df["LeadTime"].to_numpy() <= deadline) & (df["Capacity"].to_numpy() <= max_capacity)
+    needed = float(df["Score"].sum()) - float(target_score_max)
+    if needed <= 0:
+        return 0.0
+
+    useful = fits & (reduction > 0)
+    reduction, cost = reduction[useful], cost[useful]
+    if reduction.sum() < needed - 1e-9:
+        return None
+    order = np.argsort(cost / reduction, kind="stable")
+    cumulative = np.cumsum(reduction[order])
+    k = int(np.searchsorted(cumulative, needed - 1e-9))
+    full_cost = float(cost[order[:k]].sum())
+    covered = float(cumulative[k - 1]) if k else 0.0
+    return float(full_cost + cost[order[k]] * (needed - covered) / reduction[order[k]])
+
+
+def lp_lower_bound(
+    df: pd.DataFrame, deadline: int, max_capacity: int, target_score_max: float
+) -> tuple[float | None, str]:
+    """Lower bound on the optimal cost and the relaxation it came from (``"lp"`` or ``"knapsack"``).
+
+    The LP keeps one fractional selection per schedulable risk, the predecessor closure
+    (``x[succ] <= x[pred]``) and energy rows: work that cannot start before day ``s`` must fit in
+    ``max_capacity * (deadline - s)``. It is solved in-process by HiGHS, one column per risk rather
+    than per start day, so it stays cheap on large portfolios. Without scipy this falls back to
+    knapsack_lower_bound. The bound is None when the relaxation cannot reach the target.
+    """
+    if not highs_available():
+        return knapsack_lower_bound(df, deadline, max_capacity, target_score_max), "knapsack"
+    from scipy.optimize import linprog
+    from scipy.sparse import csr_array, vstack
+
+    needed = float(df["Score"].sum()) - float(target_score_max)
+    if needed <= 0:
+        return 0.0, "lp"
+    windows = compute_time_windows(df, deadline, max_capacity)
+    schedulable = windows["Schedulable"].to_numpy(dtype=bool)
+    reduction = (df["Score"] - df["Res_Score"]).to_numpy(dtype=float)
+    cost = df["CTA"].to_numpy(dtype=float)
+    energy = (df["LeadTime"] * df["Capacity"]).to_numpy(dtype=float)
+    earliest = windows["Earliest_Start"].to_numpy(dtype=np.int64)
+    n = len(df)
+
+    edges = dependency_edges(df)
+    rows = np.arange(edges.sources.size)
+    closure = csr_array(
+        (
+            np.concatenate((np.ones(rows.size), -np.ones(rows.size))),
+            (np.concatenate((rows, rows)), np.concatenate((edges.targets, edges.sources))),
+        ),
+        shape=(rows.size, n),
+    )
+    # One energy row per distinct earliest start: every risk starting no earlier runs inside [s, deadline).
+    starts = np.unique(earliest[schedulable])
+    energy_rows = np.where(earliest[None, :] >= starts[:, None], energy[None, :], 0.0)
+    a_ub = vstack([csr_array(-reduction[None, :]), closure, csr_array(energy_rows)], format="csr")
+    b_ub = np.concatenate(([-needed], np.zeros(rows.size), float(max_capacity) * (deadline - starts)))
+    bounds = np.column_stack((np.zeros(n), schedulable.astype(float)))
+
+    result = linprog(cost, A_ub=a_ub, b_ub=b_ub, bounds=bounds, method="highs")
+    if result.status == 2:
+        return None, "lp"
+    if result.status != 0:
+        return knapsack_lower_bound(df, deadline, max_capacity, target_score_max), "knapsack"
+    return float(result.fun), "lp"
+
+
+def solve_with_greedy(
+    df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    target_score_max: float,
+    stats: dict[str, Any] | None = None,
+    local_search_passes: int = 3,
+) -> pd.DataFrame | None:
+    stats = {} if stats is None else stats
+    t0 = time.perf_counter()
+
+    ids = df["ID"].to_numpy(dtype=np.int64)
+    n = ids.size
+    reduction = (df["Score"] - df["Res_Score"]).to_numpy(dtype=float)
+    cost = df["CTA"].to_numpy(dtype=float)
+    duration = df["LeadTime"].to_numpy(dtype=np.int64)
+    demand = df["Capacity"].to_numpy(dtype=np.int64)
+    needed = float(df["Score"].sum()) - float(target_score_max) - 1e-9
+
+    edges = dependency_edges(df)
+    topo_rank = np.empty(n, dtype=np.int64)
+    topo_rank[topological_order(edges, ids)] = np.arange(n)
+    preds: list[list[int]] = [[] for _ in range(n)]
+    succs: list[list[int]] = [[] for _ in range(n)]
+    for src, dst in zip(edges.sources.tolist(), edges.targets.tolist()):
+        preds[dst].append(src)
+        succs[src].append(dst)
+
+    profile = _CapacityProfile(deadline, max_capacity)
+    start = np.full(n, -1, dtype=np.int64)
+    selected = np.zeros(n, dtype=bool)
+    achieved = 0.0
+
+    def earliest_start(i: int) -> int:
+        return max((int(start[p] + duration[p]) for p in preds[i]), default=0)
+
+    def place(i: int, earliest: int | None = None) -> bool:
+        nonlocal achieved
+        slot = profile.earliest_fit(earliest_start(i) if earliest is None else earliest, int(duration[i]), int(demand[i]))
+        if slot is None:
+            return False
+        profile.add(slot, int(duration[i]), int(demand[i]))
+        start[i] = slot
+        selected[i] = True
+        achieved += reduction[i]
+        return True
+
+    def unplace(i: int) -> None:
+        nonlocal achieved
+        profile.remove(int(start[i]), int(duration[i]), int(demand[i]))
+        start[i] = -1
+        selected[i] = False
+        achieved -= reduction[i]
+
+    def try_select_with_ancestors(i: int) -> bool:
+        missing: list[int] = []
+        stack, seen = [i], {i}
+        while stack:
+            node = stack.pop()
+            missing.append(node)
+            for p in preds[node]:
+                if not selected[p] and p not in seen:
+                    seen.add(p)
+                    stack.append(p)
+        missing.sort(key=lambda node: topo_rank[node])
+        placed: list[int] = []
+        for node in missing:
+            if not place(node):
+                for done in reversed(placed):
+                    unplace(done)
+                return False
+            placed.append(node)
+        return True
+
+    # Construction: highest reduction per unit of cost first, pulling in unselected predecessors.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(cost > 0, reduction / cost, np.inf)
+    energy_ratio = reduction / (duration * demand)
+    for order_key in (ratio, energy_ratio):
+        # On tight capacity the cheapest picks can crowd the horizon; retry by reduction per capacity-day.
+        for i in np.flatnonzero(selected).tolist():
+            unplace(i)
+        for i in np.lexsort((cost, -order_key)).tolist():
+            if achieved >= needed:
                 break
-        rows.append(
+            if not selected[i] and reduction[i] > 0:
+                try_select_with_ancestors(i)
+        if achieved >= needed:
+            break
+
+    t1 = time.perf_counter()
+    if achieved < needed:
+        # A heuristic miss is not a proof: only an infeasible relaxation makes the instance infeasible.
+        lower_bound, lower_bound_kind = lp_lower_bound(df, deadline, max_capacity, target_score_max)
+        stats.update(
+            build_sec=t1 - t0,
+            solve_sec=0.0,
+            readback_sec=0.0,
+            status="infeasible" if lower_bound is None else "unknown",
+        )
+        if lower_bound is not None:
+            stats.update(lower_bound=lower_bound, lower_bound_kind=lower_bound_kind)
+        return None
+
+    def is_leaf(i: int) -> bool:
+        return not any(selected[s] for s in succs[i])
+
+    def drop_pass() -> bool:
+        improved = False
+        for i in np.argsort(-cost, kind="stable").tolist():
+            if selected[i] and is_leaf(i) and achieved - reduction[i] >= needed:
+                unplace(i)
+                improved = True
+        return improved
+
+    def swap_pass(max_scanned: int = 200) -> bool:
+        improved = False
+        # Unselected risks whose predecessors are all selected can be added without pulling in others.
+        pool = [
+            j
+            for j in np.argsort(cost, kind="stable").tolist()
+            if not selected[j] and reduction[j] > 0 and all(selected[p] for p in preds[j])
+        ]
+        for i in np.argsort(-cost, kind="stable").tolist():
+            if not selected[i] or not is_leaf(i):
+                continue
+            old_start = int(start[i])
+            unplace(i)
+            deficit = needed - achieved
+            swapped = False
+            for j in pool[:max_scanned]:
+                if cost[j] >= cost[i]:
+                    break
+                # Earlier swaps in this pass may have removed one of j's predecessors (i included).
+                if selected[j] or reduction[j] < deficit or not all(selected[p] for p in preds[j]):
+                    continue
+                if place(j):
+                    swapped = True
+                    break
+            if swapped:
+                improved = True
+            else:
+                place(i, earliest=old_start)
+        return improved
+
+    def to_schedule(start: np.ndarray, selected: np.ndarray) -> pd.DataFrame:
+        chosen = np.flatnonzero(selected)
+        return pd.DataFrame(
             {
-                "ID": i,
-                "Start_Day": int(start_day),
-                "End_Day": int(start_day + lead_time_by_id[i]),
-                "Cost": float(cta_by_id[i]),
-                "Reduction": float(score_by_id[i] - residual_by_id[i]),
-                "Capacity": int(capacity_by_id[i]),
+                "ID": ids[chosen].astype(int),
+                "Start_Day": start[chosen].astype(int),
+                "End_Day": (start[chosen] + duration[chosen]).astype(int),
+                "Cost": cost[chosen],
+                "Reduction": reduction[chosen],
+                "Capacity": demand[chosen].astype(int),
             }
         )
 
-    return pd.DataFrame(rows)
+    # Local search: drop redundant leaves, then swap expensive leaves for cheaper schedulable risks.
+    constructed = (start.copy(), selected.copy())
+    passes = 0
+    drop_pass()
+    while passes < local_search_passes:
+        passes += 1
+        if not (swap_pass() | drop_pass()):
+            break
+
+    t2 = time.perf_counter()
+    schedule = to_schedule(start, selected)
+    problems = schedule_violations(df, schedule, deadline, max_capacity)
+    if problems:
+        # The construction phase is valid by design; never report a local-search result that is not.
+        stats["local_search_rejected"] = problems
+        schedule = to_schedule(*constructed)
+        problems = schedule_violations(df, schedule, deadline, max_capacity)
+        if problems:
+            raise RuntimeError(f"Greedy produced an invalid schedule: {problems[0]}")
+    stats.update(
+        build_sec=t1 - t0,
+        solve_sec=t2 - t1,
+        readback_sec=time.perf_counter() - t2,
+        status="feasible",
+        local_search_passes=passes,
+    )
+    stats["lower_bound"], stats["lower_bound_kind"] = lp_lower_bound(df, deadline, max_capacity, target_score_max)
+    return schedule
+
+
+_REDUCTION_SCALE = 100
+
+
+def _solve_cp_sat_subproblem(
+    free: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    usage: np.ndarray,
+    reduction_needed: int,
+    *,
+    min_start: dict[int, int] | None = None,
+    max_end: dict[int, int] | None = None,
+    required: set[int] | None = None,
+    forbidden: set[int] | None = None,
+    hint: dict[int, int] | None = None,
+    time_limit_sec: float | None = None,
+    num_workers: int | None = None,
+) -> tuple[str, dict[int, int] | None]:
+    """Re-optimize the ``free`` risks around a fixed remainder of the plan.
+
+    The fixed part is summarized by its per-day capacity ``usage``, the scaled reduction the free
+    risks still have to deliver, and per-risk bounds coming from fixed predecessors (``min_start``,
+    ``forbidden``) and fixed successors (``max_end``, ``required``). Returns the CP-SAT status and
+    the start day of every selected free risk.
+    """
+    min_start = min_start or {}
+    max_end = max_end or {}
+    required = required or set()
+    forbidden = forbidden or set()
+    model = cp_model.CpModel()
+    free_ids = set(free["ID"].astype(int).tolist())
+    x: dict[int, Any] = {}
+    start: dict[int, Any] = {}
+    end: dict[int, Any] = {}
+    intervals: list[Any] = []
+    demands: list[int] = []
+    reductions: list[Any] = []
+    costs: list[Any] = []
+
+    for r in free.itertuples(index=False):
+        rid = int(r.ID)
+        duration = int(r.LeadTime)
+        lo = int(min_start.get(rid, 0))
+        hi = int(min(deadline, max_end.get(rid, deadline))) - duration
+        x[rid] = model.NewBoolVar(f"select_{rid}")
+        if rid in forbidden or lo > hi:
+            model.Add(x[rid] == 0)
+            lo, hi = 0, max(0, deadline - duration)
+        if rid in required:
+            model.Add(x[rid] == 1)
+        start[rid] = model.NewIntVar(lo, hi, f"start_{rid}")
+        end[rid] = model.NewIntVar(lo + duration, hi + duration, f"end_{rid}")
+        intervals.append(model.NewOptionalIntervalVar(start[rid], duration, end[rid], x[rid], f"interval_{rid}"))
+        demands.append(int(r.Capacity))
+        reductions.append(x[rid] * int(round((float(r.Score) - float(r.Res_Score)) * _REDUCTION_SCALE)))
+        costs.append(x[rid] * int(round(float(r.CTA))))
+
+    for r in free.itertuples(index=False):
+        rid = int(r.ID)
+        for pred in r.Predecessors:
+            pred = int(pred)
+            if pred in free_ids:
+                model.Add(x[rid] <= x[pred])
+                model.Add(start[rid] >= end[pred]).OnlyEnforceIf(x[rid])
+
+    # Capacity held by the fixed part of the plan, as constant intervals over runs of equal usage.
+    changes = np.flatnonzero(np.diff(usage, prepend=0, append=0))
+    for a, b in zip(changes[:-1].tolist(), changes[1:].tolist()):
+        if usage[a] > 0:
+            intervals.append(model.NewIntervalVar(a, b - a, b, f"fixed_{a}"))
+            demands.append(int(usage[a]))
+    model.AddCumulative(intervals, demands, int(max_capacity))
+    model.Add(sum(reductions) >= int(reduction_needed))
+    model.Minimize(sum(costs))
+
+    if hint:
+        for rid in x:
+            model.AddHint(x[rid], rid in hint)
+            if rid in hint:
+                model.AddHint(start[rid], hint[rid])
+
+    solver = cp_model.CpSolver()
+    if time_limit_sec is not None:
+        solver.parameters.max_time_in_seconds = float(time_limit_sec)
+    if num_workers is not None:
+        solver.parameters.num_workers = int(num_workers)
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return solver.StatusName(status).lower(), None
+    starts = {rid: int(solver.Value(start[rid])) for rid in x if solver.Value(x[rid])}
+    return solver.StatusName(status).lower(), starts
+
+
+LNS_NEIGHBORHOODS: tuple[str, ...] = ("time_window", "dependency_subtree", "random")
+
+
+def solve_with_lns(
+    df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    target_score_max: float,
+    stats: dict[str, Any] | None = None,
+    time_limit_sec: float = 30.0,
+    max_iterations: int = 1000,
+    neighborhood_size: int = 60,
+    subproblem_time_limit_sec: float = 1.0,
+    seed: int = 0,
+    progress: Callable[[dict[str, Any]], None] | None = None,
+) -> pd.DataFrame | None:
+    """Large Neighborhood Search: start from the greedy plan, then repeatedly free a neighbourhood
+    (a time window, a dependency subtree or a random subset) and re-optimize it with CP-SAT."""
+    stats = {} if stats is None else stats
+    if neighborhood_size <= 0:
+        raise ValueError("neighborhood_size must be greater than 0.")
+    t0 = time.perf_counter()
+    greedy_stats: dict[str, Any] = {}
+    initial = solve_with_greedy(df, deadline, max_capacity, target_score_max, greedy_stats)
+    if initial is None and greedy_stats["status"] != "infeasible":
+        # Greedy can miss a plan on tight instances; let CP-SAT find a starting plan within the time budget.
+        start_stats: dict[str, Any] = {}
+        initial = solve_with_cp_sat(
+            df, deadline, max_capacity, target_score_max, start_stats, time_limit_sec=time_limit_sec
+        )
+        stats["initial_solver"] = "cp-sat"
+        if initial is None:
+            greedy_stats["status"] = start_stats["status"]
+    if initial is None:
+        stats.update(
+            build_sec=time.perf_counter() - t0, solve_sec=0.0, readback_sec=0.0, status=greedy_stats["status"]
+        )
+        return None
+    problems = schedule_violations(df, initial, deadline, max_capacity)
+    if problems:
+        # Neighbourhood moves keep the rest of the plan fixed, so they can never repair a broken start.
+        raise RuntimeError(f"LNS starting plan is invalid: {problems[0]}")
+
+    model_df, earliest_by_id, _ = _model_input(df, deadline, max_capacity, stats)
+    model_df = model_df.set_index(model_df["ID"].astype(int), drop=False)
+    ids = model_df.index.to_numpy(dtype=np.int64)
+    duration = model_df["LeadTime"].astype(int).to_dict()
+    demand = model_df["Capacity"].astype(int).to_dict()
+    cost = model_df["CTA"].astype(float).to_dict()
+    reduction = (model_df["Score"] - model_df["Res_Score"]).astype(float).to_dict()
+    scaled = {rid: int(round(value * _REDUCTION_SCALE)) for rid, value in reduction.items()}
+    preds = {int(rid): [int(p) for p in ps] for rid, ps in zip(model_df["ID"], model_df["Predecessors"])}
+    succs: dict[int, list[int]] = {int(rid): [] for rid in ids}
+    for rid, ps in preds.items():
+        for p in ps:
+            succs[p].append(rid)
+    needed = float(df["Score"].sum()) - float(target_score_max) - 1e-9
+    needed_scaled = math.ceil(needed * _REDUCTION_SCALE - 1e-6)
+
+    current = dict(zip(initial["ID"].astype(int).tolist(), initial["Start_Day"].astype(int).tolist()))
+    usage = np.zeros(deadline, dtype=np.int64)
+    for rid, day in current.items():
+        usage[day : day + duration[rid]] += demand[rid]
+    current_cost = sum(cost[rid] for rid in current)
+    current_reduction = sum(reduction[rid] for rid in current)
+    current_scaled = sum(scaled[rid] for rid in current)
+    initial_cost = current_cost
+    lower_bound = greedy_stats.get("lower_bound")
+    rng = np.random.default_rng(seed)
+    history: list[dict[str, Any]] = [{"iteration": 0, "elapsed_sec": time.perf_counter() - t0, "cost": current_cost}]
+    counts = {name: {"tried": 0, "improved": 0} for name in LNS_NEIGHBORHOODS}
+    t1 = time.perf_counter()
+
+    def pick_time_window() -> list[int]:
+        width = max(1, deadline // 8)
+        lo = int(rng.integers(0, max(1, deadline - width + 1)))
+        inside = [rid for rid, day in current.items() if lo <= day < lo + width]
+        outside = ids[rng.integers(0, len(ids), size=neighborhood_size)].tolist()
+        outside = [rid for rid in outside if rid not in current and earliest_by_id[rid] < lo + width]
+        return list(dict.fromkeys(inside[:neighborhood_size] + outside))[:neighborhood_size]
+
+    def pick_dependency_subtree() -> list[int]:
+        root = int(ids[rng.integers(0, len(ids))])
+        chosen, queue = {root}, [root]
+        while queue and len(chosen) < neighborhood_size:
+            node = queue.pop(0)
+            for other in preds[node] + succs[node]:
+                if other not in chosen:
+                    chosen.add(other)
+                    queue.append(other)
+        if len(chosen) < neighborhood_size:
+            chosen.update(ids[rng.integers(0, len(ids), size=neighborhood_size - len(chosen))].tolist())
+        return list(chosen)[:neighborhood_size]
+
+    def pick_random() -> list[int]:
+        size = min(neighborhood_size, len(ids))
+        selected_part = rng.permutation(np.fromiter(current, dtype=np.int64))[: size // 2].tolist()
+        return list(dict.fromkeys(selected_part + rng.choice(ids, size=size, replace=False).tolist()))[:size]
+
+    pickers = {
+        "time_window": pick_time_window,
+        "dependency_subtree": pick_dependency_subtree,
+        "random": pick_random,
+    }
+
+    iteration = 0
+    while iteration < max_iterations and time.perf_counter() - t0 < time_limit_sec:
+        if lower_bound is not None and current_cost <= lower_bound + 1e-6:
+            break
+        iteration += 1
+        kind = LNS_NEIGHBORHOODS[(iteration - 1) % len(LNS_NEIGHBORHOODS)]
+        counts[kind]["tried"] += 1
+        free_ids = pickers[kind]()
+        free_set = set(free_ids)
+
+        free_current = {rid: current[rid] for rid in free_ids if rid in current}
+        base_usage = usage.copy()
+        for rid, day in free_current.items():
+            base_usage[day : day + duration[rid]] -= demand[rid]
+        fixed_reduction = current_scaled - sum(scaled[rid] for rid in free_current)
+        min_start = {rid: int(earliest_by_id[rid]) for rid in free_ids}
+        max_end: dict[int, int] = {}
+        required: set[int] = set()
+        forbidden: set[int] = set()
+        for rid in free_ids:
+            for p in preds[rid]:
+                if p in free_set:
+                    continue
+                if p in current:
+                    min_start[rid] = max(min_start[rid], current[p] + duration[p])
+                else:
+                    forbidden.add(rid)
+            for succ in succs[rid]:
+                if succ not in free_set and succ in current:
+                    required.add(rid)
+                    max_end[rid] = min(max_end.get(rid, deadline), current[succ])
+        # Never ask for more than the current plan delivers, so the incumbent stays feasible after rounding.
+        reduction_needed = min(needed_scaled - fixed_reduction, sum(scaled[rid] for rid in free_current))
+
+        remaining = time_limit_sec - (time.perf_counter() - t0)
+        _, starts = _solve_cp_sat_subproblem(
+            model_df.loc[free_ids],
+            deadline,
+            max_capacity,
+            base_usage,
+            reduction_needed,
+            min_start=min_start,
+            max_end=max_end,
+            required=required,
+            forbidden=forbidden,
+            hint=free_current,
+            time_limit_sec=max(0.05, min(subproblem_time_limit_sec, remaining)),
+            num_workers=1,
+        )
+        if starts is None:
+            continue
+        new_cost = current_cost - sum(cost[rid] for rid in free_current) + sum(cost[rid] for rid in starts)
+        new_reduction = (
+            current_reduction - sum(reduction[rid] for rid in free_current) + sum(reduction[rid] for rid in starts)
+        )
+        if new_cost >= current_cost - 1e-9 or new_reduction < needed:
+            continue
+
+        for rid in free_current:
+            del current[rid]
+        current.update(starts)
+        usage = base_usage
+        for rid, day in starts.items():
+            usage[day : day + duration[rid]] += demand[rid]
+        current_cost = new_cost
+        current_reduction = new_reduction
+        current_scaled = fixed_reduction + sum(scaled[rid] for rid in starts)
+        counts[kind]["improved"] += 1
+        point = {"iteration": iteration, "elapsed_sec": time.perf_counter() - t0, "cost": current_cost}
+        history.append(point)
+        if progress is not None:
+            progress({**point, "initial_cost": initial_cost, "lower_bound": lower_bound})
+
+    t2 = time.perf_counter()
+    chosen = sorted(current)
+    schedule = pd.DataFrame(
+        {
+            "ID": chosen,
+            "Start_Day": [current[rid] for rid in chosen],
+            "End_Day": [current[rid] + duration[rid] for rid in chosen],
+            "Cost": [cost[rid] for rid in chosen],
+            "Reduction": [reduction[rid] for rid in chosen],
+            "Capacity": [demand[rid] for rid in chosen],
+        }
+    )
+    problems = schedule_violations(df, schedule, deadline, max_capacity)
+    if problems:
+        # Only a modelling bug in a subproblem can get here; the validated starting plan is still safe to return.
+        stats["lns_rejected"] = problems
+        schedule, current_cost = initial, initial_cost
+    stats.update(
+        build_sec=t1 - t0,
+        solve_sec=t2 - t1,
+        readback_sec=time.perf_counter() - t2,
+        status="optimal" if lower_bound is not None and current_cost <= lower_bound + 1e-6 else "feasible",
+        lns={
+            "iterations": iteration,
+            "initial_cost": initial_cost,
+            "final_cost": current_cost,
+            "neighborhoods": counts,
+            "history": history,
+        },
+    )
+    if lower_bound is not None:
+        stats["lower_bound"] = lower_bound
+        stats["lower_bound_kind"] = greedy_stats.get("lower_bound_kind")
+    return schedule
+
+
+RACE_SOLVERS: tuple[str, ...] = ("cp-sat", "pulp", "greedy")
+# Exact racers build their model before their solver clock starts: give the solver only this share of
+# the race limit, and wait up to RACE_GRACE_SHARE of it (at least a second) past the limit for their
+# incumbents before killing them.
+RACE_EXACT_TIME_SHARE = 0.8
+RACE_GRACE_SHARE = 0.25
+
+
+def _race_entry(
+    conn: Connection,
+    name: str,
+    df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    target_score_max: float,
+    time_limit_sec: float | None,
+    threads: int | None,
+    gap_rel: float | None,
+) -> None:
+    # Own process group, so the coordinator's kill also reaches CBC subprocesses.
+    if hasattr(os, "setsid"):
+        os.setsid()
+    stats: dict[str, Any] = {}
+    t0 = time.perf_counter()
+    solve_limit = None if time_limit_sec is None else time_limit_sec * RACE_EXACT_TIME_SHARE
+    try:
+        if name == "cp-sat":
+            schedule = solve_with_cp_sat(
+                df,
+                deadline,
+                max_capacity,
+                target_score_max,
+                stats,
+                time_limit_sec=solve_limit,
+                num_workers=threads,
+                relative_gap=gap_rel,
+            )
+        elif name == "pulp":
+            schedule = solve_with_pulp(
+                df,
+                deadline,
+                max_capacity,
+                target_score_max,
+                stats,
+                threads=threads,
+                time_limit_sec=solve_limit,
+                gap_rel=gap_rel,
+            )
+        else:
+            schedule = solve_with_greedy(df, deadline, max_capacity, target_score_max, stats)
+    except Exception as exc:  # noqa: BLE001 - reported to the race coordinator
+        schedule = None
+        stats["status"] = "error"
+        stats["error"] = f"{type(exc).__name__}: {exc}"
+    conn.send((schedule, stats, time.perf_counter() - t0))
+    conn.close()
+
+
+def _exit_on_sigterm(signum: int, frame: Any) -> None:
+    raise SystemExit(128 + signum)
+
+
+def _kill_racer(process: multiprocessing.process.BaseProcess) -> None:
+    # SIGKILL: a racer blocked inside CP-SAT or CBC would not run a Python SIGTERM handler promptly.
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            process.kill()
+    else:
+        process.kill()
+    process.join()
+
+
+def _race_result_is_final(name: str, schedule: pd.DataFrame | None, stats: dict[str, Any]) -> bool:
+    if name == "greedy":
+        lower_bound = stats.get("lower_bound")
+        return schedule is not None and lower_bound is not None and float(schedule["Cost"].sum()) <= lower_bound + 1e-6
+    return stats.get("status") in ("optimal", "infeasible")
+
+
+def solve_race(
+    df: pd.DataFrame,
+    deadline: int,
+    max_capacity: int,
+    target_score_max: float,
+    stats: dict[str, Any] | None = None,
+    time_limit_sec: float | None = None,
+    solvers: Iterable[str] = RACE_SOLVERS,
+    threads: int | None = None,
+    gap_rel: float | None = None,
+) -> pd.DataFrame | None:
+    """Run solvers in parallel processes; the first proven result wins, otherwise the cheapest one at the time limit.
+
+    ``threads`` is the budget for the whole race (default: all cores), split between the exact
+    racers so CP-SAT and CBC do not each claim every core; greedy is single-threaded.
+    """
+    stats = {} if stats is None else stats
+    solvers = list(dict.fromkeys(solvers))
+    unknown = [name for name in solvers if name not in RACE_SOLVERS]
+    if unknown or not solvers:
+        raise ValueError(f"Unsupported race solvers: {unknown or solvers}")
+    budget = threads or os.cpu_count() or 1
+    threads_by_solver = {"cp-sat": budget, "pulp": budget, "greedy": None}
+    if "cp-sat" in solvers and "pulp" in solvers:
+        threads_by_solver["cp-sat"] = max(1, budget // 2)
+        threads_by_solver["pulp"] = max(1, budget - threads_by_solver["cp-sat"])
+
+    # Forking skips re-importing pandas/ortools in every racer; the coordinator is single-threaded here.
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    t0 = time.perf_counter()
+    pending: dict[Connection, tuple[str, multiprocessing.process.BaseProcess]] = {}
+    for name in solvers:
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=_race_entry,
+            args=(
+                child_conn,
+                name,
+                df,
+                deadline,
+                max_capacity,
+                target_score_max,
+                time_limit_sec,
+                threads_by_solver[name],
+                gap_rel,
+            ),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        pending[parent_conn] = (name, process)
+
+    results: dict[str, tuple[pd.DataFrame | None, dict[str, Any], float]] = {}
+    winner: str | None = None
+    # If the coordinator is terminated (e.g. a pool timeout), unwind through `finally` so racers are not orphaned.
+    previous_handler = None
+    if threading.current_thread() is threading.main_thread():
+        previous_handler = signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    grace_sec = None if time_limit_sec is None else max(1.0, time_limit_sec * RACE_GRACE_SHARE)
+    try:
+        while pending and winner is None:
+            remaining = None
+            if time_limit_sec is not None:
+                remaining = t0 + time_limit_sec - time.perf_counter()
+                if remaining <= 0 and any(name != "greedy" for name, _ in pending.values()):
+                    # Past the limit: exact racers are finishing their (shortened) solve; collect their incumbents.
+                    remaining += grace_sec
+                remaining = max(0.0, remaining)
+            ready = wait(list(pending), remaining)
+            if not ready:
+                break
+            for conn in ready:
+                name, process = pending.pop(conn)
+                try:
+                    results[name] = conn.recv()
+                except EOFError:
+                    results[name] = (None, {"status": "crashed"}, time.perf_counter() - t0)
+                conn.close()
+                process.join()
+                if winner is None and _race_result_is_final(name, *results[name][:2]):
+                    winner = name
+    finally:
+        killed = [name for name, _ in pending.values()]
+        for conn, (_, process) in pending.items():
+            _kill_racer(process)
+            conn.close()
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+    if winner is None:
+        incumbents = [(float(r[0]["Cost"].sum()), name) for name, r in results.items() if r[0] is not None]
+        winner = min(incumbents)[1] if incumbents else None
+
+    lower_bounds = [
+        (r[1]["lower_bound"], r[1].get("lower_bound_kind")) for r in results.values() if r[1].get("lower_bound") is not None
+    ]
+    stats["race"] = {
+        "winner": winner,
+        "elapsed_sec": {name: (results[name][2] if name in results else None) for name in solvers},
+        "killed": killed,
+        "wall_sec": time.perf_counter() - t0,
+    }
+    if winner is None:
+        stats["status"] = "timeout" if killed else "infeasible"
+        return None
+    schedule, winner_stats, _ = results[winner]
+    stats.update({k: v for k, v in winner_stats.items() if k not in ("lower_bound", "lower_bound_kind")})
+    if lower_bounds:
+        stats["lower_bound"], stats["lower_bound_kind"] = max(lower_bounds, key=lambda b: b[0])
+    return schedule
 
 
 def _to_primitive_records(df: pd.DataFrame) -> list[dict[str, Any]]:
@@ -341,6 +2309,7 @@ def _to_primitive_records(df: pd.DataFrame) -> list[dict[str, Any]]:
     return records
 
 
+@timed("budget_timeline")
 def budget_timeline(schedule_df: pd.DataFrame) -> pd.DataFrame:
     if schedule_df.empty:
         return pd.DataFrame(columns=["Start_Day", "Cost"])
@@ -348,34 +2317,17 @@ def budget_timeline(schedule_df: pd.DataFrame) -> pd.DataFrame:
     return timeline.reset_index(drop=True)
 
 
-def analyze_risk_plan(
-    *,
-    risks: list[dict[str, Any]] | None = None,
-    num_records: int = 15,
-    solver: SolverName = "cp-sat",
-    deadline: int = 20,
-    team_capacity: int = 4,
-    target_remaining_ratio: float = 0.5,
-    target_score_max: float | None = None,
+def _build_summary(
+    solver: SolverName,
+    df: pd.DataFrame,
+    schedule_df: pd.DataFrame | None,
+    deadline: int,
+    team_capacity: int,
+    target_max: float,
+    solver_stats: dict[str, Any],
 ) -> AnalysisSummary:
-    if deadline <= 0:
-        raise ValueError("deadline must be greater than 0.")
-    if team_capacity <= 0:
-        raise ValueError("team_capacity must be greater than 0.")
-    if target_score_max is None and not (0 <= target_remaining_ratio <= 1):
-        raise ValueError("target_remaining_ratio must be between 0 and 1.")
-
-    df = prepare_risk_data(risks=risks, num_records=num_records)
     total_original = float(df["Score"].sum())
-    target_max = float(target_score_max) if target_score_max is not None else total_original * target_remaining_ratio
-
-    if solver == "cp-sat":
-        schedule_df = solve_with_cp_sat(df, deadline, team_capacity, target_max)
-    elif solver == "pulp":
-        schedule_df = solve_with_pulp(df, deadline, team_capacity, target_max)
-    else:
-        raise ValueError(f"Unsupported solver: {solver}")
-
+    race = solver_stats.get("race", {})
     if schedule_df is None:
         return AnalysisSummary(
             solver=solver,
@@ -392,6 +2344,9 @@ def analyze_risk_plan(
             total_cost=None,
             schedule=[],
             budget_timeline=[],
+            solver_stats=solver_stats,
+            race_winner=race.get("winner"),
+            solver_elapsed_sec=race.get("elapsed_sec", {}),
         )
 
     schedule_df = schedule_df.sort_values(["Start_Day", "ID"]).reset_index(drop=True)
@@ -400,6 +2355,12 @@ def analyze_risk_plan(
     achieved_score = total_original - total_reduction
     reduction_pct = (total_reduction / total_original * 100.0) if total_original else 0.0
     total_cost = float(schedule_df["Cost"].sum())
+    lower_bound = solver_stats.pop("lower_bound", None)
+    lower_bound_kind = solver_stats.pop("lower_bound_kind", None) or "solver"
+    gap = None
+    if lower_bound is not None:
+        lower_bound = min(float(lower_bound), total_cost)
+        gap = (total_cost - lower_bound) / total_cost if total_cost else 0.0
 
     return AnalysisSummary(
         solver=solver,
@@ -416,9 +2377,513 @@ def analyze_risk_plan(
         total_cost=total_cost,
         schedule=_to_primitive_records(schedule_df),
         budget_timeline=_to_primitive_records(budget_df),
+        lower_bound=lower_bound,
+        lower_bound_kind=lower_bound_kind if lower_bound is not None else None,
+        optimality_gap=gap,
+        solver_stats=solver_stats,
+        race_winner=race.get("winner"),
+        solver_elapsed_sec=race.get("elapsed_sec", {}),
+    )
+
+
+def _lns_progress(progress: ProgressCallback) -> Callable[[dict[str, Any]], None]:
+    t0 = time.perf_counter()
+    return lambda point: progress(_progress_event("lns", t0, point["cost"], point["lower_bound"]))
+
+
+def analyze_risk_plan(
+    *,
+    risks: list[dict[str, Any]] | None = None,
+    prepared: pd.DataFrame | None = None,
+    num_records: int = 15,
+    solver: SolverName = "cp-sat",
+    deadline: int = 20,
+    team_capacity: int = 4,
+    target_remaining_ratio: float = 0.5,
+    target_score_max: float | None = None,
+    dataset: DatasetName = "sample",
+    seed: int = 0,
+    dependency_density: float = 0.6,
+    capacity_profile: CapacityProfile = "balanced",
+    time_granularity: int = 1,
+    refine_time_limit_sec: float | None = None,
+    time_limit_sec: float | None = None,
+    mip_gap: float | None = None,
+    solver_threads: int | None = None,
+    lns_iterations: int = 1000,
+    sensitivity: bool = False,
+    progress: ProgressCallback | None = None,
+) -> AnalysisSummary:
+    if deadline <= 0:
+        raise ValueError("deadline must be greater than 0.")
+    if team_capacity <= 0:
+        raise ValueError("team_capacity must be greater than 0.")
+    if target_score_max is None and not (0 <= target_remaining_ratio <= 1):
+        raise ValueError("target_remaining_ratio must be between 0 and 1.")
+    if time_granularity != 1 and solver != "pulp":
+        raise ValueError("time_granularity is only supported by the pulp solver.")
+    if refine_time_limit_sec is not None and refine_time_limit_sec <= 0:
+        raise ValueError("refine_time_limit_sec must be greater than 0.")
+    if time_limit_sec is not None and time_limit_sec <= 0:
+        raise ValueError("time_limit_sec must be greater than 0.")
+    if mip_gap is not None and not (0 <= mip_gap < 1):
+        raise ValueError("mip_gap must be in [0, 1).")
+    if solver_threads is not None and solver_threads <= 0:
+        raise ValueError("solver_threads must be greater than 0.")
+    if lns_iterations <= 0:
+        raise ValueError("lns_iterations must be greater than 0.")
+
+    if prepared is not None:
+        df = prepared
+    else:
+        df = prepare_risk_data(
+            risks=risks,
+            num_records=num_records,
+            dataset=dataset,
+            seed=seed,
+            dependency_density=dependency_density,
+            capacity_profile=capacity_profile,
+        )
+    total_original = float(df["Score"].sum())
+    target_max = float(target_score_max) if target_score_max is not None else total_original * target_remaining_ratio
+
+    solver_stats: dict[str, Any] = {}
+    if solver == "cp-sat":
+        schedule_df = solve_with_cp_sat(
+            df,
+            deadline,
+            team_capacity,
+            target_max,
+            solver_stats,
+            time_limit_sec=time_limit_sec,
+            num_workers=solver_threads,
+            relative_gap=mip_gap,
+            progress=progress,
+        )
+    elif solver == "pulp":
+        schedule_df = solve_with_pulp(
+            df,
+            deadline,
+            team_capacity,
+            target_max,
+            solver_stats,
+            time_granularity=time_granularity,
+            threads=solver_threads,
+            time_limit_sec=time_limit_sec,
+            gap_rel=mip_gap,
+            progress=progress,
+        )
+    elif solver == "highs":
+        schedule_df = solve_with_highs(
+            df, deadline, team_capacity, target_max, solver_stats, time_limit_sec=time_limit_sec, gap_rel=mip_gap
+        )
+    elif solver == "greedy":
+        schedule_df = solve_with_greedy(df, deadline, team_capacity, target_max, solver_stats)
+    elif solver == "lns":
+        schedule_df = solve_with_lns(
+            df,
+            deadline,
+            team_capacity,
+            target_max,
+            solver_stats,
+            time_limit_sec=time_limit_sec or 30.0,
+            max_iterations=lns_iterations,
+            progress=_lns_progress(progress) if progress is not None else None,
+        )
+    elif solver == "race":
+        schedule_df = solve_race(
+            df,
+            deadline,
+            team_capacity,
+            target_max,
+            solver_stats,
+            time_limit_sec=time_limit_sec,
+            threads=solver_threads,
+            gap_rel=mip_gap,
+        )
+    else:
+        raise ValueError(f"Unsupported solver: {solver}")
+
+    if schedule_df is not None and refine_time_limit_sec is not None and not schedule_df.empty:
+        schedule_df = refine_schedule(
+            df, schedule_df, deadline, team_capacity, target_max, solver_stats, refine_time_limit_sec
+        )
+    for stage in ("build", "solve", "readback", "refine"):
+        if isinstance(solver_stats.get(f"{stage}_sec"), float):
+            METRICS.observe("forge_stage_seconds", solver_stats[f"{stage}_sec"], stage=stage, solver=solver)
+
+    summary = _build_summary(solver, df, schedule_df, deadline, team_capacity, target_max, solver_stats)
+    if sensitivity:
+        summary.sensitivity = pulp_sensitivity(df, deadline, team_capacity, target_max, solver_stats)
+    return summary
+
+
+def replan_risk_plan(
+    *,
+    current_day: int,
+    in_progress: dict[int, int] | None = None,
+    completed: dict[int, int] | None = None,
+    previous_schedule: list[dict[str, Any]] | None = None,
+    risks: list[dict[str, Any]] | None = None,
+    prepared: pd.DataFrame | None = None,
+    num_records: int = 15,
+    deadline: int = 20,
+    team_capacity: int = 4,
+    target_remaining_ratio: float = 0.5,
+    target_score_max: float | None = None,
+    dataset: DatasetName = "sample",
+    seed: int = 0,
+    dependency_density: float = 0.6,
+    capacity_profile: CapacityProfile = "balanced",
+    time_limit_sec: float | None = 10.0,
+    solver_threads: int | None = None,
+) -> AnalysisSummary:
+    """Re-plan from ``current_day`` with started/completed risks frozen at their actual start days.
+
+    Only the remaining risks are decided, with starts no earlier than ``current_day``. The previous
+    plan, when given, seeds CP-SAT with hints. The result has the same schema as analyze_risk_plan
+    and includes the frozen risks, so totals cover the whole quarter.
+    """
+    in_progress = {int(k): int(v) for k, v in (in_progress or {}).items()}
+    completed = {int(k): int(v) for k, v in (completed or {}).items()}
+    if not 0 <= current_day < deadline:
+        raise ValueError("current_day must be in [0, deadline).")
+    if team_capacity <= 0:
+        raise ValueError("team_capacity must be greater than 0.")
+    if target_score_max is None and not (0 <= target_remaining_ratio <= 1):
+        raise ValueError("target_remaining_ratio must be between 0 and 1.")
+    if time_limit_sec is not None and time_limit_sec <= 0:
+        raise ValueError("time_limit_sec must be greater than 0.")
+    overlap = sorted(set(in_progress) & set(completed))
+    if overlap:
+        raise ValueError(f"Risks cannot be both in progress and completed: {overlap}")
+    future = sorted(rid for rid, day in {**in_progress, **completed}.items() if day > current_day)
+    if future:
+        raise ValueError(f"Started or completed risks cannot start after current_day: {future}")
+
+    t0 = time.perf_counter()
+    if prepared is not None:
+        df = prepared
+    else:
+        df = prepare_risk_data(
+            risks=risks,
+            num_records=num_records,
+            dataset=dataset,
+            seed=seed,
+            dependency_density=dependency_density,
+            capacity_profile=capacity_profile,
+        )
+    total_original = float(df["Score"].sum())
+    target_max = float(target_score_max) if target_score_max is not None else total_original * target_remaining_ratio
+
+    frozen = {**completed, **in_progress}
+    indexed = df.set_index(df["ID"].astype(int), drop=False)
+    unknown = sorted(set(frozen) - set(indexed.index))
+    if unknown:
+        raise ValueError(f"Unknown risk IDs in in_progress/completed: {unknown}")
+    duration = indexed["LeadTime"].astype(int).to_dict()
+    demand = indexed["Capacity"].astype(int).to_dict()
+    preds = {int(rid): [int(p) for p in ps] for rid, ps in zip(indexed["ID"], indexed["Predecessors"])}
+    for rid in frozen:
+        missing = [p for p in preds[rid] if p not in frozen]
+        if missing:
+            raise ValueError(f"Risk {rid} was started before its predecessors {missing}.")
+
+    # Remaining capacity: in-progress work still occupies the team from current_day on.
+    usage = np.zeros(deadline, dtype=np.int64)
+    for rid, day in in_progress.items():
+        usage[max(day, current_day) : min(day + duration[rid], deadline)] += demand[rid]
+
+    earliest = compute_time_windows(df, deadline)
+    earliest_by_id = dict(zip(earliest["ID"].astype(int).tolist(), earliest["Earliest_Start"].astype(int).tolist()))
+    free = indexed.drop(index=list(frozen))
+    min_start: dict[int, int] = {}
+    for rid in free.index.tolist():
+        bound = max(current_day, earliest_by_id[rid])
+        for p in preds[rid]:
+            if p in frozen:
+                bound = max(bound, frozen[p] + duration[p])
+        min_start[rid] = bound
+
+    reduction = (indexed["Score"] - indexed["Res_Score"]).astype(float)
+    frozen_reduction = float(reduction.loc[list(frozen)].sum()) if frozen else 0.0
+    needed = total_original - target_max - frozen_reduction
+    reduction_needed = max(0, math.ceil(needed * _REDUCTION_SCALE - 1e-6))
+    hint = None
+    if previous_schedule:
+        hint = {
+            int(row["ID"]): max(int(row["Start_Day"]), min_start[int(row["ID"])])
+            for row in previous_schedule
+            if int(row["ID"]) in min_start
+        }
+    t1 = time.perf_counter()
+
+    status, starts = _solve_cp_sat_subproblem(
+        free,
+        deadline,
+        team_capacity,
+        usage,
+        reduction_needed,
+        min_start=min_start,
+        hint=hint,
+        time_limit_sec=time_limit_sec,
+        num_workers=solver_threads,
+    )
+    t2 = time.perf_counter()
+    solver_stats: dict[str, Any] = {
+        "build_sec": t1 - t0,
+        "solve_sec": t2 - t1,
+        "status": status,
+        "replan": {
+            "current_day": current_day,
+            "in_progress": sorted(in_progress),
+            "completed": sorted(completed),
+            "free_risks": len(free),
+            "hinted": len(hint or {}),
+        },
+    }
+    schedule_df = None
+    if starts is not None:
+        plan = {**frozen, **starts}
+        chosen = sorted(plan)
+        schedule_df = pd.DataFrame(
+            {
+                "ID": chosen,
+                "Start_Day": [plan[rid] for rid in chosen],
+                "End_Day": [plan[rid] + duration[rid] for rid in chosen],
+                "Cost": indexed.loc[chosen, "CTA"].astype(float).tolist(),
+                "Reduction": reduction.loc[chosen].tolist(),
+                "Capacity": [demand[rid] for rid in chosen],
+            }
+        )
+    solver_stats["readback_sec"] = time.perf_counter() - t2
+    return _build_summary("cp-sat", df, schedule_df, deadline, team_capacity, target_max, solver_stats)
+
+
+def _sample_lead_times(
+    rng: np.random.Generator,
+    lead_time: np.ndarray,
+    ids: np.ndarray,
+    num_samples: int,
+    distributions: dict[int, dict[str, Any]],
+    default_distribution: LeadTimeDistribution,
+    spread: float,
+) -> np.ndarray:
+    """Whole-day duration samples of shape (num_samples, risks), at least one day each."""
+    n = ids.size
+    base = lead_time.astype(float)
+    kind = np.array([distributions.get(int(i), {}).get("kind", default_distribution) for i in ids])
+    unknown = sorted(set(kind.tolist()) - {"triangular", "lognormal"})
+    if unknown:
+        raise ValueError(f"Unsupported lead time distributions: {unknown}")
+
+    def param(name: str, default: np.ndarray) -> np.ndarray:
+        return np.array(
+            [float(distributions.get(int(i), {}).get(name, d)) for i, d in zip(ids.tolist(), default.tolist())]
+        )
+
+    # Defaults are right-skewed around the planned LeadTime: work overruns more often than it finishes early.
+    low = param("low", base * (1.0 - spread))
+    mode = param("mode", base)
+    high = param("high", base * (1.0 + 2.0 * spread))
+    median = param("median", base)
+    sigma = param("sigma", np.full(n, spread))
+    if ((low > mode) | (mode > high)).any():
+        raise ValueError("Triangular distributions need low <= mode <= high.")
+
+    u = rng.random((num_samples, n))
+    width = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        split = np.where(width > 0, (mode - low) / width, 0.0)
+    left = low + np.sqrt(u * width * (mode - low))
+    right = high - np.sqrt((1.0 - u) * width * (high - mode))
+    samples = np.where(u < split, left, right)
+    lognormal = kind == "lognormal"
+    if lognormal.any():
+        normal = rng.standard_normal((num_samples, int(lognormal.sum())))
+        samples[:, lognormal] = median[lognormal] * np.exp(sigma[lognormal] * normal)
+    return np.maximum(np.ceil(samples - 1e-9), 1).astype(np.int32)
+
+
+@timed("simulate")
+def simulate_schedule(
+    schedule: list[dict[str, Any]] | pd.DataFrame,
+    risks: pd.DataFrame,
+    deadline: int,
+    team_capacity: int,
+    *,
+    lead_time_distributions: dict[int, dict[str, Any]] | None = None,
+    default_distribution: LeadTimeDistribution = "triangular",
+    spread: float = 0.25,
+    num_samples: int = 10_000,
+    seed: int = 0,
+    top_k: int = 10,
+) -> dict[str, Any]:
+    """Monte Carlo robustness of a fixed schedule under uncertain lead times.
+
+    Every sample keeps the planned start days but a risk cannot start before its scheduled
+    predecessors finish, so delays propagate through the dependency DAG. Work is vectorized over
+    samples: the Python loops run over DAG levels and risks, never over samples.
+    ``lead_time_distributions`` maps a risk ID to ``{"kind": "triangular", "low", "mode", "high"}``
+    or ``{"kind": "lognormal", "median", "sigma"}``; missing risks use ``default_distribution``
+    scaled by ``spread``.
+    """
+    if num_samples <= 0:
+        raise ValueError("num_samples must be greater than 0.")
+    if spread < 0:
+        raise ValueError("spread must be non-negative.")
+    t0 = time.perf_counter()
+    plan = pd.DataFrame(schedule)
+    if plan.empty:
+        raise ValueError("schedule is empty; there is nothing to simulate.")
+    plan = plan.sort_values("ID").reset_index(drop=True)
+    ids = plan["ID"].to_numpy(dtype=np.int64)
+    indexed = risks.set_index(risks["ID"].astype(int), drop=False)
+    missing = sorted(set(ids.tolist()) - set(indexed.index))
+    if missing:
+        raise ValueError(f"Scheduled risks missing from the risk data: {missing}")
+    lead_time = indexed.loc[ids, "LeadTime"].to_numpy(dtype=np.int64)
+    demand = plan["Capacity"].to_numpy(dtype=np.int32)
+    planned_start = plan["Start_Day"].to_numpy(dtype=np.int32)
+    rng = np.random.default_rng(seed)
+    duration = _sample_lead_times(
+        rng, lead_time, ids, num_samples, lead_time_distributions or {}, default_distribution, spread
+    )
+
+    # Precedence edges between scheduled risks, grouped by DAG level of the successor.
+    position = {int(rid): k for k, rid in enumerate(ids.tolist())}
+    src_list: list[int] = []
+    dst_list: list[int] = []
+    for rid, preds in zip(ids.tolist(), indexed.loc[ids, "Predecessors"].tolist()):
+        for p in preds:
+            if int(p) in position:
+                src_list.append(position[int(p)])
+                dst_list.append(position[rid])
+    src = np.array(src_list, dtype=np.int64)
+    dst = np.array(dst_list, dtype=np.int64)
+    level = np.zeros(ids.size, dtype=np.int64)
+    for _ in range(ids.size):
+        if not src.size:
+            break
+        candidate = level.copy()
+        np.maximum.at(candidate, dst, level[src] + 1)
+        if np.array_equal(candidate, level):
+            break
+        level = candidate
+
+    start = np.broadcast_to(planned_start, duration.shape).copy()
+    end = start + duration
+    for depth in range(1, int(level.max(initial=0)) + 1):
+        on_level = level[dst] == depth
+        order = np.argsort(dst[on_level], kind="stable")
+        level_src = src[on_level][order]
+        level_dst = dst[on_level][order]
+        targets, first = np.unique(level_dst, return_index=True)
+        ready = np.maximum.reduceat(end[:, level_src], first, axis=1)
+        start[:, targets] = np.maximum(start[:, targets], ready)
+        end[:, targets] = start[:, targets] + duration[:, targets]
+
+    completion = end.max(axis=1)
+    horizon = int(max(deadline, int(completion.max()))) + 1
+    usage = np.zeros((num_samples, horizon + 1), dtype=np.int32)
+    rows = np.arange(num_samples)
+    for k in range(ids.size):
+        usage[rows, start[:, k]] += demand[k]
+        usage[rows, end[:, k]] -= demand[k]
+    usage = np.cumsum(usage[:, :horizon], axis=1)
+    overrun = (usage > team_capacity).mean(axis=0)
+
+    days, counts = np.unique(completion, return_counts=True)
+    delay = (end - (planned_start + lead_time)).mean(axis=0)
+    late = (end > deadline).mean(axis=0)
+    worst = np.argsort(-delay, kind="stable")[:top_k]
+    percentiles = {f"p{q}": float(np.percentile(completion, q)) for q in (50, 80, 90, 95, 99)}
+
+    return {
+        "num_samples": num_samples,
+        "num_risks": int(ids.size),
+        "deadline": deadline,
+        "team_capacity": team_capacity,
+        "planned_completion_day": int((planned_start + lead_time).max()),
+        "probability_on_time": float((completion <= deadline).mean()),
+        "completion_day": {"mean": float(completion.mean()), **percentiles},
+        "completion_day_distribution": [
+            {"day": int(d), "probability": float(c) / num_samples} for d, c in zip(days, counts)
+        ],
+        "capacity_overrun_probability": [
+            {"day": int(t), "probability": float(p)} for t, p in enumerate(overrun) if p > 0
+        ],
+        "max_capacity_overrun_probability": float(overrun.max(initial=0.0)),
+        "most_delayed_risks": [
+            {"ID": int(ids[k]), "mean_delay_days": float(delay[k]), "probability_late": float(late[k])}
+            for k in worst
+        ],
+        "elapsed_sec": time.perf_counter() - t0,
+    }
+
+
+def simulate_risk_plan(
+    *,
+    schedule: list[dict[str, Any]],
+    deadline: int,
+    team_capacity: int,
+    risks: list[dict[str, Any]] | None = None,
+    prepared: pd.DataFrame | None = None,
+    num_records: int = 15,
+    dataset: DatasetName = "sample",
+    seed: int = 0,
+    dependency_density: float = 0.6,
+    capacity_profile: CapacityProfile = "balanced",
+    lead_time_distributions: dict[int, dict[str, Any]] | None = None,
+    default_distribution: LeadTimeDistribution = "triangular",
+    spread: float = 0.25,
+    num_samples: int = 10_000,
+    sample_seed: int = 0,
+    top_k: int = 10,
+) -> dict[str, Any]:
+    if prepared is not None:
+        df = prepared
+    else:
+        df = prepare_risk_data(
+            risks=risks,
+            num_records=num_records,
+            dataset=dataset,
+            seed=seed,
+            dependency_density=dependency_density,
+            capacity_profile=capacity_profile,
+        )
+    return simulate_schedule(
+        schedule,
+        df,
+        deadline,
+        team_capacity,
+        lead_time_distributions={int(k): v for k, v in (lead_time_distributions or {}).items()},
+        default_distribution=default_distribution,
+        spread=spread,
+        num_samples=num_samples,
+        seed=sample_seed,
+        top_k=top_k,
     )
 
 
+def summarize_durations(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+
+    def percentile(q: float) -> float:
+        rank = q * (len(ordered) - 1)
+        low = math.floor(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    return {
+        "min_sec": ordered[0],
+        "max_sec": ordered[-1],
+        "avg_sec": sum(ordered) / len(ordered),
+        "p50_sec": percentile(0.50),
+        "p95_sec": percentile(0.95),
+    }
+
+
 def benchmark_solvers(
     *,
     iterations: int = 5,
@@ -426,15 +2891,31 @@ def benchmark_solvers(
     deadline: int = 20,
     team_capacity: int = 4,
     target_remaining_ratio: float = 0.5,
+    dataset: DatasetName = "sample",
+    seed: int = 0,
+    dependency_density: float = 0.6,
+    capacity_profile: CapacityProfile = "balanced",
 ) -> dict[str, Any]:
     if iterations <= 0:
         raise ValueError("iterations must be greater than 0.")
 
-    df = prepare_risk_data(num_records=num_records)
+    df = prepare_risk_data(
+        num_records=num_records,
+        dataset=dataset,
+        seed=seed,
+        dependency_density=dependency_density,
+        capacity_profile=capacity_profile,
+    )
     target_max = float(df["Score"].sum()) * target_remaining_ratio
 
-    solvers: dict[SolverName, Any] = {"cp-sat": solve_with_cp_sat, "pulp": solve_with_pulp}
-    durations: dict[str, list[float]] = {"cp-sat": [], "pulp": []}
+    solvers: dict[SolverName, Any] = {
+        "cp-sat": solve_with_cp_sat,
+        "pulp": solve_with_pulp,
+        "greedy": solve_with_greedy,
+    }
+    if highs_available():
+        solvers["highs"] = solve_with_highs
+    durations: dict[str, list[float]] = {name: [] for name in solvers}
 
     for _ in range(iterations):
         for name, fn in solvers.items():
@@ -442,16 +2923,13 @@ def benchmark_solvers(
             fn(df, deadline, team_capacity, target_max)
             durations[name].append(time.perf_counter() - t0)
 
-    summary: dict[str, Any] = {"iterations": iterations, "results": {}}
+    summary: dict[str, Any] = {"iterations": iterations, "num_records": int(len(df)), "results": {}}
     for name, values in durations.items():
-        summary["results"][name] = {
-            "min_sec": min(values),
-            "max_sec": max(values),
-            "avg_sec": sum(values) / len(values),
-        }
+        summary["results"][name] = summarize_durations(values)
     return summary
 
 
+@timed("budget_d3")
 def build_budget_d3_code(budget_rows: list[dict[str, Any]], title: str = "Budget Timeline") -> str:
     data = [{"day": int(row["Start_Day"]), "cost": float(row["Cost"])} for row in budget_rows]
     json_blob = json.dumps(data, separators=(",", ":"))
@@ -539,6 +3017,7 @@ if (!data.length) {{
 """
 
 
+@timed("gantt_d3")
 def build_gantt_d3_code(schedule_rows: list[dict[str, Any]], title: str = "Remediation Gantt Chart") -> str:
     data = [
         {
@@ -658,7 +3137,8 @@ def _markdown_schedule_table(schedule_rows: list[dict[str, Any]]) -> str:
     return "\n".join(lines)
 
 
-def build_visual_report_markdown(summary: AnalysisSummary) -> str:
+@timed("report_markdown")
+def build_visual_report_markdown(summary: AnalysisSummary, analysis_id: str | None = None) -> str:
     if not summary.feasible:
         return (
             "No feasible schedule found for the current constraints.\n\n"
@@ -670,16 +3150,54 @@ def build_visual_report_markdown(summary: AnalysisSummary) -> str:
 
     budget_code = build_budget_d3_code(summary.budget_timeline)
     gantt_code = build_gantt_d3_code(summary.schedule)
+    id_line = f"- Analysis ID: `{analysis_id}`\n" if analysis_id else ""
+    gap_line = ""
+    if summary.optimality_gap is not None and summary.lower_bound is not None:
+        bound_label = {"lp": "LP relaxation", "knapsack": "knapsack relaxation"}.get(summary.lower_bound_kind or "", "solver")
+        gap_line = (
+            f"- Optimality Gap: `{summary.optimality_gap * 100:.1f}%` "
+            f"({bound_label} lower bound `${summary.lower_bound:,.0f}`)\n"
+        )
+    race_note = f" (winner `{summary.race_winner}`)" if summary.race_winner else ""
+    stats = summary.solver_stats
+    if "coarse_cost" in stats:
+        gap_line += f"- Time Granularity: `{stats['time_granularity']}` days (coarse cost `${stats['coarse_cost']:,.0f}`"
+        if "refined_cost" in stats:
+            gap_line += f", refined `${stats['refined_cost']:,.0f}`, delta `${stats['refine_cost_delta']:,.0f}`"
+        gap_line += ")\n"
+
+    sensitivity_section = ""
+    if summary.sensitivity is not None:
+        sens = summary.sensitivity
+        day_lines = "\n".join(
+            f"| {d['day']} | {d['shadow_price']:,.0f} | {d['lp_usage']:.1f} |" for d in sens["bottleneck_days"]
+        )
+        if sens["capacity_priced"]:
+            capacity_lines = (
+                f"- Estimated saving from one more unit of team capacity: `${sens['extra_capacity_unit_value']:,.0f}`\n\n"
+                "| Bottleneck Day | Shadow Price ($) | LP Usage |\n|---:|---:|---:|\n" + day_lines + "\n\n"
+            )
+        else:
+            capacity_lines = f"- Team capacity: _{sens['capacity_note']}_\n\n"
+        sensitivity_section = (
+            "### Sensitivity (LP relaxation)\n"
+            f"- Cost per extra point of score reduction: `${sens['target_shadow_price']:,.0f}`\n"
+            f"- Estimated cost of a 5% tighter target: `${sens['target_tightened_5pct_cost']:,.0f}`\n"
+            + capacity_lines
+        )
 
     return (
         "## FORGE Risk Intelligence Report\n\n"
-        f"- Solver: `{summary.solver}`\n"
+        f"{id_line}"
+        f"- Solver: `{summary.solver}`{race_note}\n"
         f"- Selected Risks: `{summary.selected_count}` / `{summary.num_risks}`\n"
         f"- Total Cost: `${summary.total_cost:,.0f}`\n"
+        f"{gap_line}"
         f"- Achieved Score: `{summary.achieved_score:.1f}` (target max `{summary.target_score_max:.1f}`)\n"
         f"- Risk Reduction: `{summary.achieved_reduction:.1f}` (`{summary.achieved_reduction_pct:.1f}%`)\n\n"
         "### Schedule Table\n"
         f"{_markdown_schedule_table(summary.schedule)}\n\n"
+        f"{sensitivity_section}"
         "### Budget Timeline Graph\n"
         "```d3\n"
         f"{budget_code}"
@@ -691,5 +3209,88 @@ def build_visual_report_markdown(summary: AnalysisSummary) -> str:
     )
 
 
-def summary_to_dict(summary: AnalysisSummary) -> dict[str, Any]:
-    return asdict(summary)
+def records_to_columns(records: list[dict[str, Any]]) -> dict[str, list[Any]]:
+    """Turn row dicts into one list per column, so key names are not repeated for every row."""
+    if not records:
+        return {}
+    return {key: [row.get(key) for row in records] for key in records[0]}
+
+
+def frame_to_columns(df: pd.DataFrame) -> dict[str, list[Any]]:
+    return {str(col): df[col].tolist() for col in df.columns}
+
+
+def summary_to_dict(
+    summary: AnalysisSummary,
+    response_format: ResponseFormat = "records",
+    top_k: int | None = None,
+) -> dict[str, Any]:
+    """Serialize a summary; ``top_k`` keeps only the schedule rows with the largest score reduction."""
+    if response_format not in ("records", "columnar", "summary"):
+        raise ValueError(f"Unsupported response format: {response_format}")
+    if top_k is not None and top_k <= 0:
+        raise ValueError("top_k must be greater than 0.")
+    if response_format == "records" and top_k is None:
+        return asdict(summary)
+
+    schedule = summary.schedule
+    if top_k is not None:
+        schedule = sorted(schedule, key=lambda row: (-row["Reduction"], row["ID"]))[:top_k]
+    out = asdict(replace(summary, schedule=[], budget_timeline=[]))
+    if response_format == "summary":
+        del out["schedule"], out["budget_timeline"]
+        return out
+    if response_format == "columnar":
+        out["schedule"] = records_to_columns(schedule)
+        out["budget_timeline"] = records_to_columns(summary.budget_timeline)
+    else:
+        out["schedule"] = schedule
+        out["budget_timeline"] = summary.budget_timeline
+    if top_k is not None:
+        out["schedule_rows_total"] = len(summary.schedule)
+    return out
+
+
+def _optional_delta(before: float | None, after: float | None) -> float | None:
+    return None if before is None or after is None else after - before
+
+
+def diff_summaries(before: AnalysisSummary, after: AnalysisSummary, top_k: int | None = None) -> dict[str, Any]:
+    """Compare two plans: risks added or dropped, start-day shifts and cost/score deltas.
+
+    ``top_k`` caps each listed section (shifts are ordered by the largest move first); the
+    ``*_count`` fields always cover the full plans.
+    """
+    if top_k is not None and top_k <= 0:
+        raise ValueError("top_k must be greater than 0.")
+    before_rows = {int(row["ID"]): row for row in before.schedule}
+    after_rows = {int(row["ID"]): row for row in after.schedule}
+    added = [after_rows[rid] for rid in sorted(after_rows.keys() - before_rows.keys())]
+    dropped = [before_rows[rid] for rid in sorted(before_rows.keys() - after_rows.keys())]
+    shifted = [
+        {
+            "ID": rid,
+            "before_start": int(before_rows[rid]["Start_Day"]),
+            "after_start": int(after_rows[rid]["Start_Day"]),
+            "shift_days": int(after_rows[rid]["Start_Day"]) - int(before_rows[rid]["Start_Day"]),
+        }
+        for rid in sorted(before_rows.keys() & after_rows.keys())
+        if before_rows[rid]["Start_Day"] != after_rows[rid]["Start_Day"]
+    ]
+    shifted.sort(key=lambda row: (-abs(row["shift_days"]), row["ID"]))
+    before_end = max((int(row["End_Day"]) for row in before.schedule), default=None)
+    after_end = max((int(row["End_Day"]) for row in after.schedule), default=None)
+    return {
+        "cost_delta": _optional_delta(before.total_cost, after.total_cost),
+        "achieved_score_delta": _optional_delta(before.achieved_score, after.achieved_score),
+        "selected_count_delta": after.selected_count - before.selected_count,
+        "completion_day_delta": _optional_delta(before_end, after_end),
+        "feasible": {"before": before.feasible, "after": after.feasible},
+        "added_count": len(added),
+        "dropped_count": len(dropped),
+        "shifted_count": len(shifted),
+        "unchanged_count": len(before_rows.keys() & after_rows.keys()) - len(shifted),
+        "added": added[:top_k],
+        "dropped": dropped[:top_k],
+        "shifted": shifted[:top_k],
+    }
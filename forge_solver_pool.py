@@ -0,0 +1,272 @@
+"""Bounded worker pool for running FORGE solver calls off the MCP event loop.
+
+Jobs run in long-lived worker processes. A timed-out or cancelled solve kills
+its worker (a fresh one is started on demand) instead of waiting for CP-SAT or
+CBC to return. Each worker leads its own process group and uses a private temp
+directory, so the kill also stops the CBC subprocesses it started and removes
+their model and solution files. Concurrency is capped by ``max_workers`` and callers beyond
+``max_queue`` waiting jobs are rejected instead of piling up behind long solves.
+
+Jobs started with a ``progress`` coroutine get a ``progress=`` callable injected;
+its events travel back over the worker pipe ahead of the result, as do the stage
+metrics the job recorded in the worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import traceback
+from collections.abc import Awaitable, Callable
+from multiprocessing.connection import Connection
+from typing import Any
+
+from forge_metrics import METRICS
+
+
+class SolverQueueFullError(RuntimeError):
+    pass
+
+
+class SolverTimeoutError(TimeoutError):
+    pass
+
+
+# Solvers can report many bound updates per second; forward at most this often.
+PROGRESS_MIN_INTERVAL_SEC = 0.5
+
+
+class _ProgressSender:
+    """Forwards progress events to the parent; solver callbacks may fire from several threads."""
+
+    def __init__(self, conn: Connection) -> None:
+        self._conn = conn
+        self._lock = threading.Lock()
+        self._last_sent = float("-inf")
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_sent < PROGRESS_MIN_INTERVAL_SEC:
+                return
+            self._last_sent = now
+            self._conn.send(("progress", event))
+
+
+def _exit_on_sigterm(signum: int, frame: Any) -> None:
+    # Unwind the running job so its cleanup (e.g. solver="race" killing its racers) gets to run.
+    raise SystemExit(128 + signum)
+
+
+def _worker_loop(conn: Connection, tmp_dir: str) -> None:
+    if hasattr(os, "setsid"):
+        os.setsid()
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    # PuLP writes its .mps/.sol files here; the parent removes the directory if it has to kill us.
+    os.environ["TMPDIR"] = tmp_dir
+    tempfile.tempdir = tmp_dir
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        fn, kwargs, with_progress = job
+        if with_progress:
+            kwargs = {**kwargs, "progress": _ProgressSender(conn)}
+        try:
+            result = fn(**kwargs)
+        except Exception as exc:  # noqa: BLE001 - forwarded to the parent process
+            conn.send(("metrics", METRICS.drain()))
+            try:
+                conn.send(("error", exc))
+            except Exception:
+                conn.send(("error", RuntimeError(traceback.format_exc())))
+        else:
+            conn.send(("metrics", METRICS.drain()))
+            conn.send(("result", result))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx: multiprocessing.context.BaseContext) -> None:
+        self.conn, child_conn = ctx.Pipe(duplex=True)
+        self.tmp_dir = tempfile.mkdtemp(prefix="forge-solver-")
+        # Not daemonic so jobs such as solver="race" can start their own processes; SolverPool.close() reaps it.
+        self.process = ctx.Process(target=_worker_loop, args=(child_conn, self.tmp_dir), daemon=False)
+        self.process.start()
+        child_conn.close()
+
+    def roundtrip(
+        self,
+        fn: Callable[..., Any],
+        kwargs: dict[str, Any],
+        on_progress: Callable[[dict[str, Any]], None] | None = None,
+    ) -> tuple[str, Any]:
+        self.conn.send((fn, kwargs, on_progress is not None))
+        while True:
+            kind, payload = self.conn.recv()
+            if kind == "metrics":
+                METRICS.merge(payload)
+            elif kind != "progress":
+                return kind, payload
+            elif on_progress is not None:
+                on_progress(payload)
+
+    def _signal_group(self, sig: int) -> None:
+        # The worker called setsid(), so its PID is also the ID of the group holding its CBC children.
+        if not hasattr(os, "killpg"):
+            if sig == signal.SIGTERM:
+                self.process.terminate()
+            else:
+                self.process.kill()
+            return
+        try:
+            os.killpg(self.process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self._signal_group(signal.SIGTERM)
+        self.process.join(5)
+        if self.process.is_alive():
+            self._signal_group(signal.SIGKILL)
+            self.process.join()
+        elif hasattr(os, "killpg"):
+            # Children that outlived the worker (CBC ignoring SIGTERM mid-write) would otherwise be orphaned.
+            self._signal_group(signal.SIGKILL)
+        self.conn.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class SolverPool:
+    def __init__(
+        self,
+        *,
+        max_workers: int = 2,
+        max_queue: int = 8,
+        timeout_sec: float | None = 300.0,
+    ) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0.")
+        if max_queue < 0:
+            raise ValueError("max_queue must be non-negative.")
+        if timeout_sec is not None and timeout_sec <= 0:
+            raise ValueError("timeout_sec must be greater than 0.")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_sec = timeout_sec
+        # Workers are long-lived, so "spawn" keeps them independent of the server's threads on every platform.
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots = asyncio.Semaphore(max_workers)
+        self._idle: list[_Worker] = []
+        self._busy: set[_Worker] = set()
+        self._waiting = 0
+        self._running = 0
+        atexit.register(self.close)
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def _effective_timeout(self, timeout_sec: float | None) -> float | None:
+        if timeout_sec is None:
+            return self.timeout_sec
+        if timeout_sec <= 0:
+            raise ValueError("timeout_sec must be greater than 0.")
+        if self.timeout_sec is None:
+            return timeout_sec
+        return min(timeout_sec, self.timeout_sec)
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        /,
+        *,
+        timeout_sec: float | None = None,
+        progress: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        timeout = self._effective_timeout(timeout_sec)
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            raise SolverQueueFullError(
+                f"FORGE solver queue is full ({self._running} running, {self._waiting} waiting). Retry later."
+            )
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        try:
+            return await self._run_on_worker(fn, kwargs, timeout, progress)
+        finally:
+            self._running -= 1
+            self._slots.release()
+
+    async def _run_on_worker(
+        self,
+        fn: Callable[..., Any],
+        kwargs: dict[str, Any],
+        timeout: float | None,
+        progress: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    ) -> Any:
+        on_progress = None
+        if progress is not None:
+            loop = asyncio.get_running_loop()
+
+            def on_progress(event: dict[str, Any]) -> None:
+                # Fire and forget: a slow or failed notification must not hold up the solve.
+                asyncio.run_coroutine_threadsafe(progress(event), loop)
+
+        worker = self._idle.pop() if self._idle else _Worker(self._ctx)
+        self._busy.add(worker)
+        reusable = False
+        try:
+            kind, payload = await asyncio.wait_for(
+                asyncio.to_thread(worker.roundtrip, fn, kwargs, on_progress), timeout
+            )
+            reusable = True
+        except asyncio.TimeoutError as exc:
+            raise SolverTimeoutError(f"FORGE solver call exceeded {timeout:g} seconds and was cancelled.") from exc
+        except (EOFError, OSError) as exc:
+            raise RuntimeError(
+                f"FORGE solver worker exited unexpectedly (exit code {worker.process.exitcode})."
+            ) from exc
+        finally:
+            # Timeouts and client-side cancellation (CancelledError) leave the worker mid-solve: kill it.
+            self._busy.discard(worker)
+            if reusable:
+                self._idle.append(worker)
+            else:
+                await asyncio.to_thread(worker.kill)
+
+        if kind == "error":
+            raise payload
+        return payload
+
+    def close(self) -> None:
+        while self._idle:
+            worker = self._idle.pop()
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.kill()
+        while self._busy:
+            self._busy.pop().kill()
@@ -0,0 +1,97 @@
+"""Greedy and LNS plans on seeded synthetic portfolios, checked against the exact solvers."""
+
+import pytest
+
+pytest.importorskip("ortools")
+pytest.importorskip("pulp")
+
+from forge_risk_engine import (  # noqa: E402
+    knapsack_lower_bound,
+    prepare_risk_data,
+    schedule_violations,
+    solve_with_cp_sat,
+    solve_with_greedy,
+    solve_with_lns,
+    solve_with_pulp,
+)
+
+DEADLINE = 20
+CAPACITY = 4
+TARGET_REMAINING_RATIO = 0.6
+
+INSTANCES = [
+    pytest.param((num_records, density, seed), id=f"n={num_records}-density={density}-seed={seed}")
+    for num_records in (12, 20)
+    for density in (0.6, 1.5)
+    for seed in range(4)
+]
+
+
+@pytest.fixture(params=INSTANCES)
+def instance(request):
+    num_records, density, seed = request.param
+    df = prepare_risk_data(dataset="synthetic", num_records=num_records, seed=seed, dependency_density=density)
+    return df, TARGET_REMAINING_RATIO * float(df["Score"].sum())
+
+
+@pytest.fixture
+def optimum(instance):
+    df, target = instance
+    cp_sat = solve_with_cp_sat(df, DEADLINE, CAPACITY, target)
+    pulp = solve_with_pulp(df, DEADLINE, CAPACITY, target)
+    if cp_sat is None:
+        assert pulp is None
+        pytest.skip("instance is infeasible")
+    assert float(pulp["Cost"].sum()) == pytest.approx(float(cp_sat["Cost"].sum()))
+    return float(cp_sat["Cost"].sum())
+
+
+def assert_valid_plan(df, schedule, target):
+    assert schedule_violations(df, schedule, DEADLINE, CAPACITY) == []
+    reduction = float(schedule["Reduction"].sum())
+    assert float(df["Score"].sum()) - reduction <= target + 1e-6
+
+
+def test_greedy_plan_is_valid_and_bounded(instance, optimum):
+    df, target = instance
+    stats = {}
+    schedule = solve_with_greedy(df, DEADLINE, CAPACITY, target, stats)
+
+    assert schedule is not None
+    assert_valid_plan(df, schedule, target)
+    cost = float(schedule["Cost"].sum())
+    assert cost >= optimum - 1e-6
+    assert stats["lower_bound"] <= optimum + 1e-6
+    assert stats["lower_bound"] <= cost + 1e-6
+
+
+def test_lns_matches_exact_optimum(instance, optimum):
+    df, target = instance
+    stats = {}
+    schedule = solve_with_lns(df, DEADLINE, CAPACITY, target, stats, time_limit_sec=5.0, max_iterations=50)
+
+    assert schedule is not None
+    assert_valid_plan(df, schedule, target)
+    assert float(schedule["Cost"].sum()) == pytest.approx(optimum)
+    assert stats["lower_bound"] <= optimum + 1e-6
+
+
+def test_knapsack_bound_is_below_optimum(instance, optimum):
+    df, target = instance
+    assert knapsack_lower_bound(df, DEADLINE, CAPACITY, target) <= optimum + 1e-6
+
+
+def test_lns_recovers_when_greedy_misses_a_plan():
+    # Tight, dependency-heavy instance where list scheduling runs out of capacity before the target.
+    df = prepare_risk_data(dataset="synthetic", num_records=30, seed=2, dependency_density=1.5)
+    target = TARGET_REMAINING_RATIO * float(df["Score"].sum())
+    greedy_stats = {}
+    assert solve_with_greedy(df, DEADLINE, CAPACITY, target, greedy_stats) is None
+    assert greedy_stats["status"] == "unknown"
+
+    stats = {}
+    schedule = solve_with_lns(df, DEADLINE, CAPACITY, target, stats, time_limit_sec=5.0, max_iterations=50)
+    assert schedule is not None
+    assert_valid_plan(df, schedule, target)
+    optimum = float(solve_with_cp_sat(df, DEADLINE, CAPACITY, target)["Cost"].sum())
+    assert float(schedule["Cost"].sum()) == pytest.approx(optimum)